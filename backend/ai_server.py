@@ -9,6 +9,7 @@ from typing import Optional, List
 import time
 import uuid
 import asyncio
+import functools
 import os
 from datetime import datetime
 import io
@@ -41,6 +42,8 @@ except ImportError:
 from dotenv import load_dotenv
 load_dotenv()
 
+from shared.cache import SearchCache
+
 # Get API keys
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "")
 HUGGINGFACE_TOKEN = os.getenv("HUGGINGFACE_TOKEN", "")
@@ -122,6 +125,12 @@ if TAVILY_AVAILABLE and TAVILY_API_KEY and TAVILY_API_KEY != "your_tavily_api_ke
     except Exception as e:
         print(f"⚠️ Tavily initialization failed: {e}")
 
+# Cache Tavily results per query; concurrent identical queries share one call
+tavily_cache = SearchCache(
+    ttl_seconds=int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "900")),
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "2048")),
+)
+
 # Initialize Hugging Face models for fake news detection
 fake_news_detector = None
 if TRANSFORMERS_AVAILABLE:
@@ -212,7 +221,11 @@ async def check_with_tavily(text: str) -> dict:
     
     try:
         # Search for related information
-        search_result = tavily_client.search(query=text, max_results=3)
+        search_result = await tavily_cache.search(
+            functools.partial(asyncio.to_thread, tavily_client.search),
+            text,
+            max_results=3,
+        )
         
         sources = []
         for result in search_result.get('results', []):
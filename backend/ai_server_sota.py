@@ -5,6 +5,11 @@ Uses custom PyTorch models from HuggingFace with timm
 
 import os
 import json
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
 
 # Set environment variables BEFORE any imports to avoid TensorFlow/Keras conflicts
 os.environ['USE_TF'] = '0'
@@ -16,14 +21,44 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from starlette.responses import JSONResponse, Response
+from typing import List, Optional, Tuple
 import uuid as uuid_module
 import traceback
 from urllib.parse import urlparse
 
+from shared.cache import ClaimCache, SearchCache, VerdictCache, content_digest, create_redis_backend
+from shared.cache.claim_cache import CONSPIRACY_KEYWORDS, CURRENT_EVENT_KEYWORDS
+from shared.clients import GeminiClient, TavilySearchClient, blob_part
+from shared.config import settings
+from shared.inference import InferenceExecutor, MicroBatcher, ModelRegistry
+from shared.media import (
+    AudioDecodeError,
+    FfmpegStreamDecoder,
+    MediaInput,
+    PcmStreamDecoder,
+    RollingWindowScores,
+    StreamWindower,
+    VideoContext,
+    aggregate_window_scores,
+    audio_mime_type,
+    decode_audio,
+    demux_audio,
+    probe_video,
+    sample_frame_indices,
+    sliding_windows,
+    speech_windows,
+    window_speech_ratios,
+)
+from shared.media.stream import PCM_DTYPES
+from shared.monitoring.metrics import TEXT_PIPELINE_EXITS, TEXT_STAGE_DURATION, VOICE_WINDOWS
+from shared.reputation import DomainReputationIndex
+from shared.text.indicators import SOURCE_TEXT_MATCHER
+
 app = FastAPI(title="AI-Powered Deepfake Detection API")
 
 # CORS middleware
@@ -43,324 +78,183 @@ print("\n" + "="*60)
 print("🚀 LOADING SOTA DEEPFAKE DETECTION MODELS")
 print("="*60 + "\n")
 
-# Import AI dependencies
-import torch
-import torch.nn as nn
-from huggingface_hub import hf_hub_download
+# torch/timm/torchvision/transformers are imported by sota_models with the first model load
 from PIL import Image
-import cv2
 import numpy as np
-import librosa
-import soundfile as sf
 from io import BytesIO
-import tempfile
-
-try:
-    import timm
-    print("✅ timm library imported")
-except ImportError:
-    print("❌ timm not found. Installing...")
-    os.system("pip install timm")
-    import timm
 
-# Use torchvision transforms instead of albumentations to avoid scipy issues
-from torchvision import transforms
-print("✅ torchvision transforms imported")
-
-# Delay transformers import to avoid scipy conflicts
-fake_news_detector = None
-print("\n📚 Text Fake News Detector will be loaded on first use...")
-
-# Tavily API for fact-checking
+# Tavily API for fact-checking (async client, per-call timeout)
 print("\n🌐 Initializing Tavily API...")
-try:
-    from tavily import TavilyClient
-    tavily_api_key = os.getenv("TAVILY_API_KEY")
-    if tavily_api_key:
-        tavily = TavilyClient(api_key=tavily_api_key)
-        print("✅ Tavily API: READY")
-    else:
-        tavily = None
-        print("⚠️ Tavily API: No API key found")
-except Exception as e:
+tavily_api_key = os.getenv("TAVILY_API_KEY")
+if tavily_api_key:
+    tavily = TavilySearchClient(
+        api_key=tavily_api_key,
+        base_url=settings.tavily_base_url,
+        timeout_seconds=settings.tavily_timeout_seconds,
+        max_connections=settings.external_max_connections,
+        max_concurrency=settings.tavily_max_concurrency,
+    )
+    print("✅ Tavily API: READY")
+else:
     tavily = None
-    print(f"❌ Tavily API: FAILED - {str(e)}")
+    print("⚠️ Tavily API: No API key found")
 
-# Gemini 2.0 Flash for backup verification
+# Gemini 2.0 Flash for backup verification (async client, per-call timeout)
 print("\n🧠 Initializing Gemini 2.0 Flash (Backup Verification)...")
-try:
-    import google.generativeai as genai
-    gemini_api_key = os.getenv("GEMINI_API_KEY")
-    if gemini_api_key:
-        genai.configure(api_key=gemini_api_key)
-        gemini_model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        print("✅ Gemini 2.0 Flash: READY (Backup Verification)")
-    else:
-        gemini_model = None
-        print("⚠️ Gemini 2.0 Flash: No API key found")
-except Exception as e:
+gemini_api_key = os.getenv("GEMINI_API_KEY")
+if gemini_api_key:
+    gemini_model = GeminiClient(
+        api_key=gemini_api_key,
+        model=settings.sota_gemini_model,
+        base_url=settings.gemini_base_url,
+        timeout_seconds=settings.gemini_timeout_seconds,
+        max_connections=settings.external_max_connections,
+        max_concurrency=settings.gemini_max_concurrency,
+    )
+    print("✅ Gemini 2.0 Flash: READY (Backup Verification)")
+else:
     gemini_model = None
-    print(f"❌ Gemini 2.0 Flash: FAILED - {str(e)}")
+    print("⚠️ Gemini 2.0 Flash: No API key found")
 
 
 # ============================================
-# Custom Model Architecture for Image Detection
+# Model Registry (single-flight loading, warmup, memory budget)
 # ============================================
 
-class DeepfakeImageDetector(nn.Module):
-    """Custom EfficientNetV2-S model for deepfake image detection"""
-    def __init__(self, model_name='tf_efficientnetv2_s', pretrained=False):
-        super().__init__()
-        self.backbone = timm.create_model(model_name, pretrained=pretrained, num_classes=0)
-        num_features = self.backbone.num_features
-        # Match the actual checkpoint structure with more layers
-        self.classifier = nn.Sequential(
-            nn.Linear(num_features, 1024),
-            nn.BatchNorm1d(1024),
-            nn.ReLU(),
-            nn.Dropout(0.3),
-            nn.Linear(1024, 512),
-            nn.BatchNorm1d(512),
-            nn.ReLU(),
-            nn.Dropout(0.3),
-            nn.Linear(512, 256),
-            nn.BatchNorm1d(256),
-            nn.ReLU(),
-            nn.Dropout(0.3),
-            nn.Linear(256, 1)
-        )
-    
-    def forward(self, x):
-        features = self.backbone(x)
-        return self.classifier(features)
-
-
-class DeepfakeVideoDetector(nn.Module):
-    """Custom Xception model for deepfake video detection"""
-    def __init__(self, model_name='xception', pretrained=False):
-        super().__init__()
-        # Try to use xception from timm, fallback to efficientnet
-        try:
-            self.backbone = timm.create_model(model_name, pretrained=pretrained, num_classes=0)
-        except:
-            print(f"⚠️ {model_name} not found, using efficientnetv2_m")
-            self.backbone = timm.create_model('tf_efficientnetv2_m', pretrained=pretrained, num_classes=0)
-        
-        num_features = self.backbone.num_features
-        self.classifier = nn.Sequential(
-            nn.Dropout(0.4),
-            nn.Linear(num_features, 512),
-            nn.ReLU(),
-            nn.Dropout(0.3),
-            nn.Linear(512, 1)
-        )
-    
-    def forward(self, x):
-        features = self.backbone(x)
-        return self.classifier(features)
-
-
-# ============================================
-# Load Image Deepfake Detector (EfficientNetV2-S)
-# ============================================
+# Blocking work (torch, decoding, Tavily/Gemini SDK calls) runs here, never on the event loop
+inference_executor = InferenceExecutor(
+    model_workers=settings.inference_model_workers,
+    io_workers=settings.inference_io_workers,
+    intra_op_threads=settings.torch_intra_op_threads,
+    modality_limits=settings.inference_concurrency,
+)
 
-print("\n🖼️ Loading Image Deepfake Detector (EfficientNetV2-S)...")
-image_detector_model = None
-image_transform = None
 
-try:
-    # Download model files from HuggingFace
-    model_path = hf_hub_download(
-        repo_id="Arko007/deepfake-image-detector",
-        filename="pytorch_model.bin",
-        token=os.getenv("HUGGINGFACE_TOKEN")
-    )
-    config_path = hf_hub_download(
-        repo_id="Arko007/deepfake-image-detector",
-        filename="config.json",
-        token=os.getenv("HUGGINGFACE_TOKEN")
-    )
-    
-    # Load config
-    with open(config_path, 'r') as f:
-        config = json.load(f)
-    
-    # Create model
-    image_detector_model = DeepfakeImageDetector(
-        model_name=config.get('model_name', 'tf_efficientnetv2_s'),
-        pretrained=False
-    )
-    
-    # Load checkpoint (use strict=False to handle architecture differences)
-    checkpoint = torch.load(model_path, map_location='cpu')
-    image_detector_model.load_state_dict(checkpoint, strict=False)
-    image_detector_model.eval()
-    
-    # Create transform (380x380 as per model card)
-    image_size = config.get('image_size', 380)
-    image_transform = transforms.Compose([
-        transforms.Resize((image_size, image_size)),
-        transforms.ToTensor(),
-        transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
-    ])
-    
-    print(f"✅ Image Detector: LOADED (EfficientNetV2-S, 89.5MB, AUC 0.9986)")
-    print(f"   - Input size: {image_size}x{image_size}")
-    print(f"   - Backbone: {config.get('model_name', 'tf_efficientnetv2_s')}")
-    
-except Exception as e:
-    print(f"❌ Image Detector: FAILED")
-    print(f"   Error: {str(e)}")
-    print(f"   Traceback: {traceback.format_exc()}")
+@lru_cache(maxsize=None)
+def load_sota_models():
+    """Import the model definitions (torch, timm, torchvision) and apply the torch thread budget"""
+    import sota_models
+    inference_executor.configure_torch()
+    return sota_models
 
 
-# ============================================
-# Load Video Deepfake Detector (Xception/EfficientNetV2-M)
-# ============================================
+def sota_models_call(function_name: str, *bound_args):
+    """Deferred call into sota_models, so its heavy imports happen with the first model load"""
+    def call(*args):
+        return getattr(load_sota_models(), function_name)(*bound_args, *args)
+    return call
 
-print("\n🎥 Loading Video Deepfake Detector (DFD-SOTA)...")
-video_detector_model = None
-video_transform = None
 
-try:
-    # Download model files from HuggingFace
-    model_path = hf_hub_download(
-        repo_id="Arko007/deepfake-detector-dfd-sota",
-        filename="pytorch_model.bin",
-        token=os.getenv("HUGGINGFACE_TOKEN")
-    )
-    config_path = hf_hub_download(
-        repo_id="Arko007/deepfake-detector-dfd-sota",
-        filename="config.json",
-        token=os.getenv("HUGGINGFACE_TOKEN")
-    )
-    
-    # Load config
-    with open(config_path, 'r') as f:
-        config = json.load(f)
-    
-    # Create model
-    video_detector_model = DeepfakeVideoDetector(
-        model_name=config.get('model_name', 'xception'),
-        pretrained=False
+def detector_version(kind: str, backend: str = "torch", quantization: str = "none") -> str:
+    """
+    Verdict-cache version of a detector. ONNX Runtime and int8 models score
+    slightly differently, so their verdicts are tagged and never mix with fp32 torch ones.
+    """
+    version = settings.model_versions[kind]
+    if backend != "torch":
+        version += f"+{backend}"
+    if quantization != "none":
+        version += f"+int8-{quantization}"
+    return version
+
+
+# Until a model has loaded its tag is the configured backend/quantization; once it has,
+# the ones actually applied (static int8 falls back to dynamic for the transformer
+# models, ONNX-served detectors are never quantized). Shared with the verdict caches.
+model_versions = {
+    kind: detector_version(
+        kind,
+        settings.model_backends.get(kind, "torch"),
+        "none" if settings.model_backends.get(kind, "torch") == "onnx" else settings.model_quantization.get(kind, "none"),
     )
-    
-    # Load checkpoint (handle nested structure)
-    checkpoint = torch.load(model_path, map_location='cpu')
-    
-    # Check if checkpoint has nested structure
-    if 'model_state_dict' in checkpoint:
-        state_dict = checkpoint['model_state_dict']
-    else:
-        state_dict = checkpoint
-    
-    video_detector_model.load_state_dict(state_dict, strict=False)
-    video_detector_model.eval()
-    
-    # Create transform
-    video_size = config.get('image_size', 299)
-    video_transform = transforms.Compose([
-        transforms.Resize((video_size, video_size)),
-        transforms.ToTensor(),
-        transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
-    ])
-    
-    print(f"✅ Video Detector: LOADED (Xception/EfficientNetV2-M, 1.28GB, SOTA)")
-    print(f"   - Input size: {video_size}x{video_size}")
-    print(f"   - Backbone: {config.get('model_name', 'xception')}")
-    
-except Exception as e:
-    print(f"❌ Video Detector: FAILED")
-    print(f"   Error: {str(e)}")
-    print(f"   Traceback: {traceback.format_exc()}")
+    for kind in settings.model_versions
+}
+
+
+def load_detector(kind: str):
+    """Load `kind` and tag cached verdicts with the backend and quantization it actually runs with"""
+    detector = load_sota_models().load_detector(kind)
+    if kind in model_versions:
+        version = detector_version(kind, detector.backend, detector.quantization)
+        if version != model_versions[kind]:
+            print(f"🏷️ {kind.title()} verdicts cached as {version} (was {model_versions[kind]})")
+        model_versions[kind] = version
+    return detector
+
+
+model_registry = ModelRegistry(memory_budget_mb=settings.model_memory_budget_mb, warmup=settings.model_warmup)
+model_registry.register("image", partial(load_detector, "image"), sota_models_call("warmup_frame_detector"))
+model_registry.register("video", partial(load_detector, "video"), sota_models_call("warmup_frame_detector"))
+model_registry.register("voice", partial(load_detector, "voice"), sota_models_call("warmup_voice_detector"))
+model_registry.register("text", partial(load_detector, "text"), sota_models_call("warmup_text_detector"))
+
+
+def preload_models() -> None:
+    """Load the MODEL_PRELOAD models in parallel; blocks until each has loaded or failed"""
+    names = list(settings.model_preload)
+    if not names:
+        return
+    with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="model-load") as pool:
+        for future in [pool.submit(model_registry.get, name) for name in names]:
+            try:
+                future.result()
+            except Exception:
+                pass  # logged by the registry; endpoints report the model as unavailable
 
 
-# ============================================
-# Load Voice Deepfake Detector (SOTA)
-# ============================================
-
-class DeepfakeVoiceDetector(nn.Module):
+def require_model(name: str, label: str) -> None:
     """
-    SOTA Voice Deepfake Detector with Wav2Vec2 + BiGRU + Multi-Head Attention
-    Architecture from koyelog/deepfake-voice-detector-sota
+    Fail fast with 503 unless `name` can serve this request now.
+    A preloaded model that failed stays unavailable. In background mode a model
+    that is loading, or not loaded yet, is (re)started in the background and the
+    caller gets Retry-After; in eager mode the request loads it on demand.
     """
-    def __init__(self):
-        super().__init__()
-        from transformers import Wav2Vec2Model
-        
-        # Wav2Vec2 feature extractor (frozen CNN layers)
-        self.wav2vec2 = Wav2Vec2Model.from_pretrained("facebook/wav2vec2-base")
-        
-        # Freeze CNN feature extractor
-        for param in self.wav2vec2.feature_extractor.parameters():
-            param.requires_grad = False
-        
-        # BiGRU: 2 layers, 256 hidden units per direction (512 total)
-        self.bigru = nn.GRU(
-            input_size=768,  # wav2vec2 output dimension
-            hidden_size=256,
-            num_layers=2,
-            batch_first=True,
-            bidirectional=True,
-            dropout=0.3
-        )
-        
-        # Multi-Head Attention: 8 heads, 512-dimensional embeddings
-        self.attention = nn.MultiheadAttention(
-            embed_dim=512,
-            num_heads=8,
-            dropout=0.2,
-            batch_first=True
-        )
-        
-        # Classification head
-        self.classifier = nn.Sequential(
-            nn.Linear(512, 512),
-            nn.ReLU(),
-            nn.BatchNorm1d(512),
-            nn.Dropout(0.4),
-            nn.Linear(512, 128),
-            nn.ReLU(),
-            nn.BatchNorm1d(128),
-            nn.Dropout(0.3),
-            nn.Linear(128, 1)
+    state = model_registry.state(name)
+    if state == "ready":
+        return
+    if state == "failed" and name in settings.model_preload:
+        raise HTTPException(status_code=503, detail=f"{label} model not available")
+    if settings.model_background_loading:
+        model_registry.load_in_background(name)
+        raise HTTPException(
+            status_code=503,
+            detail=f"{label} model is loading, retry shortly",
+            headers={"Retry-After": str(settings.model_retry_after_seconds)},
         )
-    
-    def forward(self, input_values):
-        # Extract features with Wav2Vec2
-        wav2vec_outputs = self.wav2vec2(input_values).last_hidden_state
-        
-        # BiGRU temporal modeling
-        gru_output, _ = self.bigru(wav2vec_outputs)
-        
-        # Multi-head attention (self-attention)
-        attn_output, _ = self.attention(gru_output, gru_output, gru_output)
-        
-        # Global average pooling over time dimension
-        pooled = torch.mean(attn_output, dim=1)
-        
-        # Classification
-        logits = self.classifier(pooled)
-        return logits
 
-voice_detector_model = None
-voice_feature_extractor = None
-print("\n🎤 Voice Deepfake Detector will be loaded on first use...")
+
+if settings.model_background_loading:
+    print("⏳ Models load in background threads once the server is up (see /api/v1/ready)")
+else:
+    preload_models()
 
 
 # ============================================
 # Startup Summary
 # ============================================
 
+def model_summary(name: str) -> str:
+    state = model_registry.state(name)
+    if state == "ready":
+        return "✅ Loaded"
+    if state == "failed":
+        return "❌ Not loaded"
+    if settings.model_background_loading and name in settings.model_preload:
+        return "⏳ Loading in background"
+    return "⏳ Lazy-loaded (loads on first use)"
+
+
 print("\n" + "="*60)
 print("📊 MODEL LOADING SUMMARY")
 print("="*60)
-print(f"✅ Text Detector (RoBERTa): ⏳ Lazy-loaded (loads on first use)")
+print(f"✅ Text Detector (RoBERTa): {model_summary('text')}")
 print(f"✅ Tavily Fact-Check API: {'✅ Ready' if tavily else '❌ Not ready'}")
 print(f"🧠 Gemini 2.0 Flash Backup: {'✅ Ready' if gemini_model else '❌ Not ready'}")
-print(f"🖼️ Image Detector (EfficientNetV2-S): {'✅ Loaded' if image_detector_model else '❌ Not loaded'}")
-print(f"🎥 Video Detector (DFD-SOTA): {'✅ Loaded' if video_detector_model else '❌ Not loaded'}")
-print(f"🎤 Voice Detector (SOTA): ⏳ Lazy-loaded (Wav2Vec2+BiGRU+Attention, 98.5M params)")
+print(f"🖼️ Image Detector (EfficientNetV2-S): {model_summary('image')}")
+print(f"🎥 Video Detector (DFD-SOTA): {model_summary('video')}")
+print(f"🎤 Voice Detector (SOTA): {model_summary('voice')}")
+if settings.model_memory_budget_mb:
+    print(f"🧮 Model memory budget: {settings.model_memory_budget_mb} MB (idle models evicted LRU)")
 print("="*60 + "\n")
 
 
@@ -383,90 +277,41 @@ class CheckResponse(BaseModel):
 # Helper Functions
 # ============================================
 
-def load_text_detector():
-    """Lazy load text detector to avoid scipy conflicts at startup"""
-    global fake_news_detector
-    if fake_news_detector is None:
-        try:
-            print("\n📚 Loading Text Fake News Detector (RoBERTa)...")
-            from transformers import pipeline
-            fake_news_detector = pipeline(
-                "text-classification",
-                model="hamzab/roberta-fake-news-classification",
-                tokenizer="hamzab/roberta-fake-news-classification",
-                framework="pt"
-            )
-            print("✅ Text Detector (RoBERTa): LOADED (500MB, 85-90% accuracy)")
-        except Exception as e:
-            print(f"❌ Text Detector: FAILED - {str(e)}")
-            raise
-    return fake_news_detector
-
-def load_voice_detector():
-    """Lazy load SOTA voice detector to avoid scipy conflicts at startup"""
-    global voice_detector_model, voice_feature_extractor
-    if voice_detector_model is None:
-        try:
-            print("\n🎤 Loading SOTA Voice Deepfake Detector...")
-            from transformers import Wav2Vec2FeatureExtractor
-            
-            # Download model checkpoint from HuggingFace
-            model_path = hf_hub_download(
-                repo_id="koyelog/deepfake-voice-detector-sota",
-                filename="pytorch_model.pth",
-                token=os.getenv("HUGGINGFACE_TOKEN")
-            )
-            
-            # Initialize model
-            voice_detector_model = DeepfakeVoiceDetector()
-            
-            # Load checkpoint
-            checkpoint = torch.load(model_path, map_location='cpu')
-            
-            # Handle different checkpoint formats
-            if isinstance(checkpoint, dict):
-                if 'model_state_dict' in checkpoint:
-                    state_dict = checkpoint['model_state_dict']
-                elif 'state_dict' in checkpoint:
-                    state_dict = checkpoint['state_dict']
-                else:
-                    state_dict = checkpoint
-            else:
-                state_dict = checkpoint
-            
-            voice_detector_model.load_state_dict(state_dict, strict=False)
-            voice_detector_model.eval()
-            
-            # Initialize feature extractor
-            voice_feature_extractor = Wav2Vec2FeatureExtractor.from_pretrained("facebook/wav2vec2-base")
-            
-            print("✅ Voice Detector: LOADED (SOTA - Wav2Vec2 + BiGRU + Attention, 98.5M params)")
-            print("   - Architecture: Wav2Vec2 + BiGRU(2 layers) + 8-head Attention")
-            print("   - Performance: 95-97% accuracy on validation")
-            print("   - Input: 4-second clips at 16 kHz")
-            
-        except Exception as e:
-            print(f"❌ Voice Detector: FAILED - {str(e)}")
-            print(f"   Traceback: {traceback.format_exc()}")
-            raise
-    return voice_detector_model, voice_feature_extractor
+def upload_suffix(file: UploadFile, default: str) -> str:
+    """File extension of an upload (helps FFmpeg/audioread probe the container)"""
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    return suffix or default
+
+def preprocess_image(image_bytes: bytes) -> "torch.Tensor":
+    """Decode image bytes into a normalized (3, H, W) tensor for the image detector"""
+    image = Image.open(BytesIO(image_bytes)).convert('RGB')
+    return model_registry.get("image").preprocess(image)
+
+
+def score_image_batch(image_tensors: List["torch.Tensor"]) -> List[float]:
+    """Run one batched forward pass and return P(fake) per image"""
+    with model_registry.use("image") as detector:
+        return load_sota_models().predict_fake_probs(detector.model, image_tensors)
+
+
+# Coalesces concurrent /check-image calls (e.g. extension auto-scan) into one forward pass
+image_batcher = MicroBatcher(
+    "image",
+    score_image_batch,
+    max_batch_size=settings.image_batch_max_size,
+    max_wait_ms=settings.image_batch_max_wait_ms,
+    executor=inference_executor,  # model pool + INFERENCE_CONCURRENCY limit
+)
+
 
 def analyze_image_with_sota(image_bytes: bytes) -> dict:
     """Analyze image using SOTA EfficientNetV2-S model"""
-    if not image_detector_model or not image_transform:
-        raise Exception("Image detector model not loaded")
-    
-    # Load image
-    image = Image.open(BytesIO(image_bytes)).convert('RGB')
-    
-    # Apply transform
-    image_tensor = image_transform(image).unsqueeze(0)
-    
-    # Run inference
-    with torch.no_grad():
-        logit = image_detector_model(image_tensor)
-        prob_fake = torch.sigmoid(logit).item()
-    
+    prob_fake = score_image_batch([preprocess_image(image_bytes)])[0]
+    return interpret_image_score(prob_fake)
+
+
+def interpret_image_score(prob_fake: float) -> dict:
+    """Turn the image detector's P(fake) into the verdict/analysis payload"""
     # Adjusted threshold - require 65% confidence to mark as FAKE
     # This reduces false positives for natural images
     FAKE_THRESHOLD = 0.65
@@ -516,112 +361,264 @@ def analyze_image_with_sota(image_bytes: bytes) -> dict:
     }
 
 
-def analyze_video_with_sota(video_bytes: bytes) -> dict:
-    """Analyze video using SOTA DFD model with frame extraction"""
-    if not video_detector_model or not video_transform:
-        raise Exception("Video detector model not loaded")
+def score_frame_batch(frame_tensors: List["torch.Tensor"], chunk_size: int) -> List[float]:
+    """Score sampled frames in batched forward passes of at most chunk_size frames"""
+    with model_registry.use("video") as detector:
+        return load_sota_models().predict_fake_probs(detector.model, frame_tensors, max(1, chunk_size))
+
+
+def resolve_video_frame_count(requested: Optional[int]) -> int:
+    """Frames to sample for a request: explicit request value or deployment default, capped"""
+    frames = requested or settings.video_sample_frames
+    return max(1, min(frames, settings.video_max_sample_frames))
+
+
+def gemini_frame_indices(total_frames: int) -> List[int]:
+    """Frames the Gemini verifier looks at: beginning, middle, end"""
+    if total_frames <= 0:
+        return []
+    return [0, total_frames // 2, total_frames - 1]
+
+
+def decode_video_context(media: MediaInput, num_frames: Optional[int] = None) -> Tuple[VideoContext, List[int]]:
+    """
+    Decode everything this request will need from the upload in one pass.
+    Returns the shared context and the frame indices the SOTA scorer should use.
+    """
+    metadata = probe_video(media)
+    if metadata.frame_count == 0:
+        raise Exception("Could not read video frames")
     
-    # Save video temporarily
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
-        tmp_file.write(video_bytes)
-        video_path = tmp_file.name
+    scorer_indices = sample_frame_indices(metadata.frame_count, resolve_video_frame_count(num_frames))
+    planned = list(scorer_indices)
+    target_size = model_registry.get("video").input_size if settings.video_decode_downscale else None
+    if gemini_model:
+        planned += gemini_frame_indices(metadata.frame_count)
+        if target_size:
+            # Keep enough resolution for Gemini; the scorer's transform resizes anyway
+            target_size = max(target_size, settings.gemini_frame_size)
     
-    try:
-        # Extract frames
-        cap = cv2.VideoCapture(video_path)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        if total_frames == 0:
-            raise Exception("Could not read video frames")
-        
-        # Sample 10 frames evenly
-        frame_indices = np.linspace(0, total_frames - 1, min(10, total_frames), dtype=int)
-        
-        frame_results = []
-        fake_count = 0
-        real_count = 0
-        total_prob = 0
-        
-        for frame_idx in frame_indices:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-            ret, frame = cap.read()
-            
-            if not ret:
-                continue
-            
-            # Convert BGR to RGB and to PIL Image
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_pil = Image.fromarray(frame_rgb)
-            
-            # Apply transform
-            frame_tensor = video_transform(frame_pil).unsqueeze(0)
-            
-            # Run inference
-            with torch.no_grad():
-                logit = video_detector_model(frame_tensor)
-                prob_fake = torch.sigmoid(logit).item()
-            
-            is_fake = prob_fake > 0.5
-            if is_fake:
-                fake_count += 1
-            else:
-                real_count += 1
-            
-            total_prob += prob_fake
-            
-            frame_results.append({
-                "frame": int(frame_idx),
-                "probability_fake": prob_fake,
-                "verdict": "FAKE" if is_fake else "REAL"
-            })
-        
-        cap.release()
-        
-        # Overall verdict by majority voting
-        avg_prob = total_prob / len(frame_results)
-        is_fake_overall = fake_count > real_count
-        confidence = fake_count / len(frame_results) if is_fake_overall else real_count / len(frame_results)
-        
-        # Generate analysis
-        if is_fake_overall:
-            analysis = f"⚠️ DEEPFAKE VIDEO DETECTED ({confidence*100:.1f}%)\n\n"
-            analysis += f"The SOTA DFD detector analyzed {len(frame_results)} frames:\n"
-            analysis += f"• {fake_count} frames flagged as FAKE\n"
-            analysis += f"• {real_count} frames flagged as REAL\n"
-            analysis += f"• Average deepfake probability: {avg_prob*100:.1f}%\n\n"
-            analysis += "This video shows signs of manipulation across multiple frames."
+    context = VideoContext.load(media, metadata, planned, target_size=target_size)
+    return context, scorer_indices
+
+
+def analyze_video_with_sota(context: VideoContext, frame_indices: List[int]) -> dict:
+    """Analyze video using SOTA DFD model on frames from the request's decoded context"""
+    video_transform = model_registry.get("video").preprocess
+    frames = context.frames(frame_indices)
+    decoded_indices = [idx for idx, _ in frames]
+    frame_tensors = [video_transform(Image.fromarray(frame)) for _, frame in frames]
+    
+    if not frame_tensors:
+        raise Exception("Could not decode any video frames")
+    
+    # Run inference on all sampled frames at once (chunked to cap memory)
+    frame_probs = score_frame_batch(frame_tensors, settings.video_batch_chunk_size)
+    
+    frame_results = []
+    fake_count = 0
+    real_count = 0
+    total_prob = 0
+    
+    for frame_idx, prob_fake in zip(decoded_indices, frame_probs):
+        is_fake = prob_fake > 0.5
+        if is_fake:
+            fake_count += 1
         else:
-            analysis = f"✅ LIKELY AUTHENTIC VIDEO ({confidence*100:.1f}%)\n\n"
-            analysis += f"The SOTA DFD detector analyzed {len(frame_results)} frames:\n"
-            analysis += f"• {real_count} frames flagged as REAL\n"
-            analysis += f"• {fake_count} frames flagged as FAKE\n"
-            analysis += f"• Average deepfake probability: {avg_prob*100:.1f}%\n\n"
-            analysis += "This video appears to be authentic."
+            real_count += 1
         
-        return {
-            "is_fake": is_fake_overall,
-            "confidence": confidence,
-            "analysis": analysis,
-            "verdict": "FAKE" if is_fake_overall else "REAL",
-            "model_details": {
-                "model_name": "Arko007/deepfake-detector-dfd-sota",
-                "frames_analyzed": len(frame_results),
-                "fake_frames": fake_count,
-                "real_frames": real_count,
-                "frame_results": frame_results[:5]  # First 5 frames
-            }
+        total_prob += prob_fake
+        
+        frame_results.append({
+            "frame": int(frame_idx),
+            "probability_fake": prob_fake,
+            "verdict": "FAKE" if is_fake else "REAL"
+        })
+    
+    # Overall verdict by majority voting
+    avg_prob = total_prob / len(frame_results)
+    is_fake_overall = fake_count > real_count
+    confidence = fake_count / len(frame_results) if is_fake_overall else real_count / len(frame_results)
+    
+    # Generate analysis
+    if is_fake_overall:
+        analysis = f"⚠️ DEEPFAKE VIDEO DETECTED ({confidence*100:.1f}%)\n\n"
+        analysis += f"The SOTA DFD detector analyzed {len(frame_results)} frames:\n"
+        analysis += f"• {fake_count} frames flagged as FAKE\n"
+        analysis += f"• {real_count} frames flagged as REAL\n"
+        analysis += f"• Average deepfake probability: {avg_prob*100:.1f}%\n\n"
+        analysis += "This video shows signs of manipulation across multiple frames."
+    else:
+        analysis = f"✅ LIKELY AUTHENTIC VIDEO ({confidence*100:.1f}%)\n\n"
+        analysis += f"The SOTA DFD detector analyzed {len(frame_results)} frames:\n"
+        analysis += f"• {real_count} frames flagged as REAL\n"
+        analysis += f"• {fake_count} frames flagged as FAKE\n"
+        analysis += f"• Average deepfake probability: {avg_prob*100:.1f}%\n\n"
+        analysis += "This video appears to be authentic."
+    
+    return {
+        "is_fake": is_fake_overall,
+        "confidence": confidence,
+        "analysis": analysis,
+        "verdict": "FAKE" if is_fake_overall else "REAL",
+        "model_details": {
+            "model_name": "Arko007/deepfake-detector-dfd-sota",
+            "frames_analyzed": len(frame_results),
+            "fake_frames": fake_count,
+            "real_frames": real_count,
+            "frame_results": frame_results[:5],  # First 5 frames
+            "video": context.metadata.as_dict()
         }
+    }
+
+
+def load_waveform(media: MediaInput, sr: int = 16000) -> np.ndarray:
+    """Decode an audio upload to mono float32 at `sr` (in memory; ffmpeg for M4A/AAC)"""
+    return decode_audio(media, target_sr=sr, ffmpeg=settings.ffmpeg_binary or None)
+
+
+def score_voice_windows(windows: List[np.ndarray]) -> List[float]:
+    """P(fake) per 4-second 16 kHz window, in forward passes of VOICE_WINDOW_BATCH_SIZE"""
+    # Voice detector is loaded on first use and held against eviction while it runs
+    with model_registry.use("voice") as detector:
+        return load_sota_models().predict_voice_fake_probs(
+            detector, windows, sampling_rate=16000, batch_size=settings.voice_window_batch_size
+        )
+
+
+# Coalesces the windows of concurrent /stream-voice connections into shared forward passes
+voice_batcher = MicroBatcher(
+    "voice",
+    score_voice_windows,
+    max_batch_size=settings.voice_stream_batch_max_size,
+    max_wait_ms=settings.voice_stream_batch_max_wait_ms,
+    executor=inference_executor,  # model pool + INFERENCE_CONCURRENCY limit
+)
+
+
+def analyze_voice_with_sota(media: MediaInput) -> dict:
+    """Score an audio upload with the SOTA voice detector"""
+    return analyze_voice_waveform(load_waveform(media, sr=16000))
+
+
+def analyze_voice_waveform(waveform: np.ndarray, min_speech_seconds: float = 0.0) -> Optional[dict]:
+    """
+    Score a 16 kHz mono waveform with the SOTA voice detector (4-second windows).
+    With VOICE_SLIDING_WINDOWS the whole clip is cut into overlapping windows
+    (at most VOICE_MAX_WINDOWS, scored in batches); otherwise only the first 4 seconds.
+    With VOICE_VAD, windows with (almost) no speech are dropped before the model runs,
+    and None is returned without running it if the clip has less than
+    `min_speech_seconds` of speech.
+    """
+    sr = 16000
+    window = 4 * sr  # Model expects 4-second clips (64,000 samples at 16 kHz)
+    if settings.voice_sliding_windows:
+        hop = max(1, int(window * (1 - settings.voice_window_overlap)))
+        starts, windows = sliding_windows(waveform, window, hop, settings.voice_max_windows)
+    else:
+        starts, windows = sliding_windows(waveform[:window], window, window)  # zero-padded if shorter
+    windows_total = len(starts)
+    speech_seconds = None
+    if settings.voice_vad:
+        ratios, speech_seconds = window_speech_ratios(
+            waveform, starts, window, sr, energy_floor_db=settings.voice_vad_energy_floor_db
+        )
+        if speech_seconds < min_speech_seconds:
+            return None
+        keep = speech_windows(ratios, settings.voice_vad_min_speech_ratio)
+        starts = [start for start, kept in zip(starts, keep) if kept]
+        windows = windows[keep]
     
-    finally:
-        # Cleanup
-        os.unlink(video_path)
+    probs = score_voice_windows(windows)
+    
+    VOICE_WINDOWS.labels(outcome="scored").inc(len(probs))
+    VOICE_WINDOWS.labels(outcome="skipped").inc(windows_total - len(probs))
+    clip_end = max(len(waveform), 1)
+    timeline = [
+        {
+            "start_seconds": round(start / sr, 2),
+            "end_seconds": round(min(start + window, clip_end) / sr, 2),
+            "probability_fake": round(prob, 4),
+        }
+        for start, prob in zip(starts, probs)
+    ]
+    return {
+        "probability_fake": aggregate_window_scores(probs, settings.voice_aggregate_top_windows),
+        "duration_seconds": len(waveform) / sr,
+        "windows_analyzed": len(probs),
+        "windows_skipped": windows_total - len(probs),
+        "speech_seconds": None if speech_seconds is None else round(speech_seconds, 2),
+        "timeline": timeline,
+    }
+
+
+def analyze_video_audio(media: MediaInput) -> dict:
+    """
+    Voice-detector result for a video upload's audio track. A video without
+    one, or (with VOICE_VAD) with less than VIDEO_AUDIO_MIN_SPEECH_SECONDS of
+    speech (music, ambience), is not scored; "status" says which.
+    """
+    sr = 16000
+    waveform = demux_audio(media, target_sr=sr, ffmpeg=settings.ffmpeg_binary)
+    if waveform is None:
+        return {"status": "no_audio"}
+    result = analyze_voice_waveform(waveform, settings.video_audio_min_speech_seconds)
+    if result is None:
+        return {"status": "no_speech", "duration_seconds": round(len(waveform) / sr, 2)}
+    return {"status": "analyzed", **result}
+
+
+def combine_video_and_audio(result: dict, audio: dict) -> dict:
+    """
+    Multimodal verdict: the video is FAKE if its frames or its voice track are.
+    Either can be manipulated on its own (a face swap over the original audio,
+    a cloned voice over real footage), so a REAL frame verdict doesn't clear
+    the audio and vice versa.
+    """
+    details = result["model_details"]
+    details["audio"] = audio
+    if audio["status"] != "analyzed":
+        reason = {"no_audio": "no audio track", "no_speech": "no speech detected"}.get(audio["status"], "not analyzed")
+        result["analysis"] += f"\n\n🎤 Audio track: {reason}"
+        return result
+    
+    prob_fake = audio["probability_fake"]
+    audio_fake = prob_fake >= 0.5
+    audio_confidence = prob_fake if audio_fake else 1.0 - prob_fake
+    details["modalities"] = {
+        "visual": {"verdict": result["verdict"], "confidence": result["confidence"]},
+        "audio": {"verdict": "FAKE" if audio_fake else "REAL", "confidence": audio_confidence},
+    }
+    audio_summary = (
+        f"🎤 Audio track: {'FAKE' if audio_fake else 'REAL'} voice ({audio_confidence:.1%}, "
+        f"{audio['windows_analyzed']} x 4-second window(s))"
+    )
+    if audio_fake and not result["is_fake"]:
+        result["analysis"] = (
+            f"⚠️ CLONED VOICE DETECTED IN AUDIO TRACK ({audio_confidence*100:.1f}%)\n\n"
+            f"{audio_summary}\n\nFrames:\n{result['analysis']}"
+        )
+        result.update(is_fake=True, verdict="FAKE", confidence=audio_confidence)
+        return result
+    if audio_fake:
+        result["confidence"] = max(result["confidence"], audio_confidence)
+    elif not result["is_fake"]:
+        result["confidence"] = min(result["confidence"], audio_confidence)  # both REAL: the weaker one
+    result["analysis"] += f"\n\n{audio_summary}"
+    return result
+
+
+def run_text_detector(text: str) -> dict:
+    """Run the RoBERTa fake news classifier on one claim"""
+    with model_registry.use("text") as detector:
+        return detector.model(text)[0]
 
 
 # ============================================
 # Gemini Backup Verification Functions
 # ============================================
 
-def verify_with_gemini_text(text: str, model_prediction: bool, model_confidence: float, tavily_sources: str = "") -> dict:
+async def verify_with_gemini_text(text: str, model_prediction: bool, model_confidence: float, tavily_sources: str = "") -> dict:
     """Use Gemini to intelligently verify text with context awareness"""
     if not gemini_model:
         return {"override": False, "gemini_verdict": None, "should_check": False}
@@ -647,8 +644,8 @@ Provide your analysis in JSON format:
 
 Be extremely precise about current facts vs historical facts."""
         
-        response = gemini_model.generate_content(prompt)
-        response_text = response.text.strip().replace('```json', '').replace('```', '')
+        response_text = await gemini_model.generate(prompt)
+        response_text = response_text.strip().replace('```json', '').replace('```', '')
         gemini_result = json.loads(response_text)
         
         print(f"\n🧠 Gemini Analysis:")
@@ -672,14 +669,15 @@ Be extremely precise about current facts vs historical facts."""
         return {"override": False, "gemini_verdict": None, "should_check": False}
 
 
-def verify_with_gemini_image(image_bytes: bytes, model_prediction: bool, model_confidence: float) -> dict:
+async def verify_with_gemini_image(image_bytes: bytes, model_prediction: bool, model_confidence: float) -> dict:
     """Use Gemini to verify image analysis - only if predicted as FAKE"""
     if not gemini_model or not model_prediction:  # Only check if model says it's FAKE
         return {"override": False, "gemini_verdict": None}
     
     try:
-        # Upload image to Gemini
-        image = Image.open(BytesIO(image_bytes))
+        # Send the original upload inline
+        image_format = Image.open(BytesIO(image_bytes)).format
+        image_part = blob_part(image_bytes, Image.MIME.get(image_format, "image/jpeg"))
         
         prompt = """Analyze if this image is a DEEPFAKE or REAL. Look for:
 - AI-generated artifacts
@@ -694,8 +692,8 @@ Respond in JSON format:
     "reasoning": "brief explanation"
 }"""
         
-        response = gemini_model.generate_content([prompt, image])
-        gemini_result = json.loads(response.text.strip().replace('```json', '').replace('```', ''))
+        response_text = await gemini_model.generate([prompt, image_part])
+        gemini_result = json.loads(response_text.strip().replace('```json', '').replace('```', ''))
         
         # If Gemini disagrees with model (model says FAKE, Gemini says REAL)
         if not gemini_result["is_fake"] and model_prediction:
@@ -715,34 +713,15 @@ Respond in JSON format:
         return {"override": False, "gemini_verdict": None}
 
 
-def verify_with_gemini_video(video_bytes: bytes, model_prediction: bool, model_confidence: float) -> dict:
+async def verify_with_gemini_video(context: VideoContext, model_prediction: bool, model_confidence: float) -> dict:
     """Use Gemini to verify video analysis - only if predicted as FAKE"""
     if not gemini_model or not model_prediction:  # Only check if model says it's FAKE
         return {"override": False, "gemini_verdict": None}
     
     try:
-        # Extract a few frames for Gemini to analyze
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp:
-            tmp.write(video_bytes)
-            video_path = tmp.name
-        
-        cap = cv2.VideoCapture(video_path)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        # Extract 3 frames (beginning, middle, end)
-        frame_indices = [0, total_frames // 2, total_frames - 1]
-        frames = []
-        
-        for idx in frame_indices:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-            ret, frame = cap.read()
-            if ret:
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(frame_rgb)
-                frames.append(pil_image)
-        
-        cap.release()
-        os.unlink(video_path)
+        # 3 frames (beginning, middle, end), already decoded with the request's context
+        frame_indices = gemini_frame_indices(context.metadata.frame_count)
+        frames = [frame for _, frame in context.frames(frame_indices)]
         
         if not frames:
             return {"override": False, "gemini_verdict": None}
@@ -761,8 +740,10 @@ Respond in JSON format:
 }"""
         
         # Analyze first frame with Gemini
-        response = gemini_model.generate_content([prompt, frames[0]])
-        gemini_result = json.loads(response.text.strip().replace('```json', '').replace('```', ''))
+        frame_jpeg = BytesIO()
+        Image.fromarray(frames[0]).save(frame_jpeg, format="JPEG", quality=90)
+        response_text = await gemini_model.generate([prompt, blob_part(frame_jpeg.getvalue(), "image/jpeg")])
+        gemini_result = json.loads(response_text.strip().replace('```json', '').replace('```', ''))
         
         # If Gemini disagrees with model (model says FAKE, Gemini says REAL)
         if not gemini_result["is_fake"] and model_prediction:
@@ -782,7 +763,15 @@ Respond in JSON format:
         return {"override": False, "gemini_verdict": None}
 
 
-def verify_with_gemini_audio(audio_bytes: bytes, model_prediction: bool, model_confidence: float) -> dict:
+async def delete_gemini_file(file: dict) -> None:
+    """Remove a File API upload once its verification is done (Gemini would keep it 48 h)"""
+    try:
+        await gemini_model.delete_file(file)
+    except Exception as e:
+        print(f"⚠️ Gemini file cleanup failed: {str(e)}")
+
+
+async def verify_with_gemini_audio(media: MediaInput, model_prediction: bool, model_confidence: float) -> dict:
     """Use Gemini to verify audio analysis - only if predicted as FAKE"""
     if not gemini_model or not model_prediction:  # Only check if model says it's FAKE
         return {"override": False, "gemini_verdict": None}
@@ -802,18 +791,17 @@ Respond in JSON format:
     "reasoning": "brief explanation"
 }"""
         
-        # Save audio temporarily for Gemini
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp:
-            tmp.write(audio_bytes)
-            audio_path = tmp.name
-        
-        # Upload audio file to Gemini
-        audio_file = genai.upload_file(audio_path)
-        response = gemini_model.generate_content([prompt, audio_file])
-        
-        os.unlink(audio_path)
+        # Inline when small enough (no separate upload round trip), else through the File API
+        audio_part, uploaded = await gemini_model.media_part(
+            media.data, audio_mime_type(media.data), timeout=settings.gemini_timeout_seconds
+        )
+        try:
+            response_text = await gemini_model.generate([prompt, audio_part])
+        finally:
+            if uploaded:
+                await delete_gemini_file(uploaded)
         
-        gemini_result = json.loads(response.text.strip().replace('```json', '').replace('```', ''))
+        gemini_result = json.loads(response_text.strip().replace('```json', '').replace('```', ''))
         
         # If Gemini disagrees with model (model says FAKE, Gemini says REAL)
         if not gemini_result["is_fake"] and model_prediction:
@@ -833,283 +821,406 @@ Respond in JSON format:
         return {"override": False, "gemini_verdict": None}
 
 
+# ============================================
+# Verdict Cache (content hash + model version)
+# ============================================
+
+cache_redis = create_redis_backend(settings.redis_url) if settings.verdict_cache_use_redis else None
+
+verdict_cache = VerdictCache(
+    model_versions=model_versions,
+    redis=cache_redis,
+    ttl_seconds=settings.cache_ttl_seconds,
+    max_entries=settings.verdict_cache_max_entries,
+)
+
+# check_text verdicts keyed on normalized claim text, TTL by freshness class
+claim_cache = ClaimCache(
+    VerdictCache(
+        model_versions=model_versions,
+        redis=cache_redis,
+        ttl_seconds=settings.cache_ttl_seconds,
+        max_entries=settings.claim_cache_max_entries,
+        namespace="claim",
+    ),
+    ttl_by_class=settings.claim_cache_ttl_seconds,
+)
+
+# Tavily results keyed on the formulated query; concurrent identical searches share one call
+search_cache = SearchCache(
+    ttl_seconds=settings.search_cache_ttl_seconds,
+    max_entries=settings.search_cache_max_entries,
+)
+
+
+async def search_web(query: str, **params) -> dict:
+    """Tavily search through the search cache."""
+    if not settings.search_cache_enabled:
+        return await tavily.search(query=query, **params)
+    return await search_cache.search(tavily.search, query, **params)
+
+
+async def lookup_verdict(kind: str, digest: str, variant: str = "") -> Optional["CheckResponse"]:
+    """Previously computed response for identical bytes (and model version), if any"""
+    if not settings.verdict_cache_enabled:
+        return None
+    cached = await verdict_cache.get(kind, digest, variant)
+    if cached is None:
+        return None
+    print(f"⚡ Verdict cache hit ({kind}, {digest[:12]})")
+    return CheckResponse(**cached)
+
+
+async def store_verdict(kind: str, digest: str, response: "CheckResponse", variant: str = "") -> None:
+    if settings.verdict_cache_enabled:
+        await verdict_cache.set(kind, digest, response.model_dump(), variant)
+
+
+# ============================================
+# Domain Reputation (check_url, check_text sources, extension sync)
+# ============================================
+
+domain_index = DomainReputationIndex.load(settings.domain_reputation_file or None)
+print(f"✅ Domain reputation index: {len(domain_index)} entries (v{domain_index.version})")
+
+
 # ============================================
 # API Endpoints
 # ============================================
 
+@app.on_event("startup")
+async def sync_verdict_cache():
+    """Drop cached verdicts written by an older version of any upgraded model"""
+    for kind in ("image", "video", "voice"):
+        if await verdict_cache.sync_model_version(kind):
+            print(f"♻️ Verdict cache: invalidated {kind} entries from previous model version")
+    if await claim_cache.verdicts.sync_model_version(ClaimCache.KIND):
+        print("♻️ Claim cache: invalidated entries from previous text pipeline version")
+
+
+@app.on_event("startup")
+async def start_background_model_loading():
+    """In background mode, start every MODEL_PRELOAD model loading (in parallel) once the port is bound"""
+    if settings.model_background_loading:
+        for name in settings.model_preload:
+            model_registry.load_in_background(name)
+
+
+@app.on_event("shutdown")
+async def close_external_clients():
+    """Close the pooled Tavily/Gemini connections"""
+    for client in (tavily, gemini_model):
+        if client is not None:
+            await client.aclose()
+
+
 @app.get("/api/v1/health")
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
         "ai_status": {
-            "fake_news_detector": True,  # Lazy loaded on first use
+            "fake_news_detector": model_registry.state("text") != "failed",  # Lazy loaded on first use
             "tavily": tavily is not None,
             "gemini_backup": gemini_model is not None,
-            "image_deepfake_detector": image_detector_model is not None,
-            "video_deepfake_detector": video_detector_model is not None,
-            "voice_deepfake_detector": voice_detector_model is not None
+            "image_deepfake_detector": model_registry.state("image") != "failed",
+            "video_deepfake_detector": model_registry.state("video") != "failed",
+            "voice_deepfake_detector": model_registry.is_loaded("voice")
+        },
+        "models": model_registry.status(),
+        "model_memory": {
+            "resident_mb": round(model_registry.resident_bytes() / 2**20, 1),
+            "budget_mb": settings.model_memory_budget_mb or None
         }
     }
 
 
-@app.post("/api/v1/check-text", response_model=CheckResponse)
-async def check_text(request: TextCheckRequest):
+@app.get("/api/v1/ready")
+async def readiness_check():
+    """Readiness probe: 200 once every MODEL_PRELOAD model is loaded, else 503 with per-model state"""
+    models = {name: info["state"] for name, info in model_registry.status().items()}
+    ready = all(models[name] == "ready" for name in settings.model_preload)
+    body = {"ready": ready, "models": models}
+    if not ready:
+        return JSONResponse(
+            status_code=503,
+            content=body,
+            headers={"Retry-After": str(settings.model_retry_after_seconds)},
+        )
+    return body
+
+
+@app.get("/api/v1/domains/snapshot")
+async def domain_snapshot(since: Optional[int] = None):
     """
-    Intelligent Web-Based Fact-Checking System:
-    1. Search web for latest verified information about the claim
-    2. Compare user's statement with recent real-world data
-    3. Return only REAL or FAKE (no process details)
+    Versioned domain reputation snapshot for the extension.
+    Pass the last synced version as `since` to receive only the changes.
     """
+    return Response(
+        content=json.dumps(domain_index.snapshot(since), separators=(",", ":")),
+        media_type="application/json",
+        headers={"ETag": f'"domains-v{domain_index.version}"', "Cache-Control": "public, max-age=300"},
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    """Expose Prometheus metrics (batch sizes, queue wait)"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+# ============================================
+# Text Fact-Checking Pipeline Stages
+# ============================================
+# check_text runs: cache/normalization -> fast-path rules (early exit) ->
+# Tavily web analysis || RoBERTa -> Gemini (only if still undecided).
+
+@contextmanager
+def timed_stage(timings: dict, stage: str):
+    """Record a stage's wall time in `timings` (ms) and the stage histogram"""
+    start = time.perf_counter()
     try:
-        print(f"\n{'='*70}")
-        print(f"📝 FACT-CHECKING: '{request.text[:80]}...'")
-        print(f"{'='*70}")
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings[stage] = round(elapsed * 1000, 1)
+        TEXT_STAGE_DURATION.labels(stage=stage).observe(elapsed)
+
+
+def fast_path_verdict(claim_lower: str) -> Optional[dict]:
+    """Known conspiracy theories and basic facts, answered without any model or web call"""
+    # KNOWN CONSPIRACY THEORIES & DANGEROUS MISINFORMATION (FAKE)
+    fake_indicators = [
+        'vaccine' in claim_lower and 'autism' in claim_lower,
+        'flat earth' in claim_lower or ('earth' in claim_lower and 'flat' in claim_lower and 'is' in claim_lower),
+        '5g' in claim_lower and ('covid' in claim_lower or 'coronavirus' in claim_lower),
+        'moon landing' in claim_lower and ('fake' in claim_lower or 'hoax' in claim_lower or 'faked' in claim_lower),
+        'climate' in claim_lower and 'hoax' in claim_lower,
+        'bleach' in claim_lower and ('cure' in claim_lower or 'cures' in claim_lower or 'treat' in claim_lower or 'treatment' in claim_lower),
+        'drink' in claim_lower and 'bleach' in claim_lower,
+    ]
+    
+    if any(fake_indicators):
+        print(f"   🎯 FAST PATH: Known conspiracy theory detected")
+        return {
+            'is_fake': True,
+            'confidence': 0.95,
+            'reasoning': "Well-known debunked conspiracy theory"
+        }
+    
+    # KNOWN BASIC FACTS (REAL)
+    real_indicators = [
+        'water' in claim_lower and 'h2o' in claim_lower,
+        'water' in claim_lower and 'freeze' in claim_lower and ('0' in claim_lower or 'zero' in claim_lower),
+        'water' in claim_lower and 'boil' in claim_lower and '100' in claim_lower,
+        'sun' in claim_lower and 'rise' in claim_lower and 'east' in claim_lower,
+        'earth' in claim_lower and 'orbit' in claim_lower and 'sun' in claim_lower,
+        'earth' in claim_lower and 'round' in claim_lower,
+        'earth' in claim_lower and 'sphere' in claim_lower,
+        'gravity' in claim_lower and ('exist' in claim_lower or 'real' in claim_lower or 'pull' in claim_lower),
+        'dna' in claim_lower and 'genetic' in claim_lower,
+        'paris' in claim_lower and 'capital' in claim_lower and 'france' in claim_lower,
+        'obama' in claim_lower and ('president' in claim_lower or '44th' in claim_lower),
+        'human' in claim_lower and 'oxygen' in claim_lower and ('need' in claim_lower or 'breathe' in claim_lower),
+        'oxygen' in claim_lower and 'breathe' in claim_lower,
+    ]
+    
+    if any(real_indicators):
+        print(f"   🎯 FAST PATH: Known basic fact detected")
+        return {
+            'is_fake': False,
+            'confidence': 0.95,
+            'reasoning': "Verified basic scientific/historical fact"
+        }
+    
+    return None
+
+
+def formulate_search_query(text: str) -> str:
+    """Smart query formulation based on claim type"""
+    claim_lower = text.lower()
+    
+    # For political/current events - get latest info
+    if any(word in claim_lower for word in CURRENT_EVENT_KEYWORDS):
+        search_query = f"{text[:200]} 2024 2025 current"
+        print(f"🌐 Searching for current political facts: '{search_query[:60]}...'")
+    # For conspiracy theories - find fact-checks
+    elif any(word in claim_lower for word in CONSPIRACY_KEYWORDS):
+        search_query = f"fact check debunk: {text[:200]}"
+        print(f"🌐 Searching for fact-checks: '{search_query[:60]}...'")
+    # For general claims - balanced search
+    else:
+        search_query = f"verify: {text[:200]}"
+        print(f"🌐 Searching for verification: '{search_query[:60]}...'")
+    return search_query
+
+
+async def search_claim_sources(text: str) -> Tuple[str, List[dict]]:
+    """Search the web for recent verified information; returns (web_facts, sources)"""
+    web_facts = ""
+    tavily_sources = []
+    if not tavily:
+        return web_facts, tavily_sources
+    
+    try:
+        search_results = await search_web(
+            formulate_search_query(text),
+            max_results=5,
+            search_depth="advanced"
+        )
         
-        # Search the web for recent verified information
-        web_facts = ""
-        tavily_sources = []
-        if tavily:
-            try:
-                # Smart query formulation based on claim type
-                claim_lower = request.text.lower()
-                
-                # For political/current events - get latest info
-                if any(word in claim_lower for word in ['president', 'prime minister', 'pm', 'leader', 'current', 'elected']):
-                    search_query = f"{request.text[:200]} 2024 2025 current"
-                    print(f"🌐 Searching for current political facts: '{search_query[:60]}...'")
-                # For conspiracy theories - find fact-checks
-                elif any(word in claim_lower for word in ['vaccine', 'autism', 'flat', '5g', 'covid', 'hoax']):
-                    search_query = f"fact check debunk: {request.text[:200]}"
-                    print(f"🌐 Searching for fact-checks: '{search_query[:60]}...'")
-                # For general claims - balanced search
-                else:
-                    search_query = f"verify: {request.text[:200]}"
-                    print(f"🌐 Searching for verification: '{search_query[:60]}...'")
-                
-                search_results = tavily.search(
-                    query=search_query, 
-                    max_results=5,
-                    search_depth="advanced"
-                )
+        if search_results and 'results' in search_results:
+            for item in search_results['results']:
+                title = item.get('title', '')
+                content = item.get('content', '')[:500]
+                url = item.get('url', '')
+                score = item.get('score', 0)
                 
-                if search_results and 'results' in search_results:
-                    for item in search_results['results']:
-                        title = item.get('title', '')
-                        content = item.get('content', '')[:500]
-                        url = item.get('url', '')
-                        score = item.get('score', 0)
-                        
-                        web_facts += f"{title}: {content}\n"
-                        tavily_sources.append({
-                            'title': title,
-                            'content': content,
-                            'url': url,
-                            'score': score
-                        })
-                    print(f"✅ Found {len(search_results['results'])} verified sources")
-            except Exception as e:
-                print(f"⚠️ Web search failed: {str(e)}")
-        
-        # Use all models to verify against web data
-        print(f"🔍 Comparing claim with latest verified data...")
-        
-        # Get predictions from all available models
-        predictions = []
+                web_facts += f"{title}: {content}\n"
+                tavily_sources.append({
+                    'title': title,
+                    'content': content,
+                    'url': url,
+                    'score': score
+                })
+            print(f"✅ Found {len(search_results['results'])} verified sources")
+    except Exception as e:
+        print(f"⚠️ Web search failed: {str(e)}")
+    
+    return web_facts, tavily_sources
+
+
+def analyze_web_sources(tavily_sources: List[dict]) -> Optional[dict]:
+    """SMART Web Analysis: weighted debunk/support vote over the Tavily sources"""
+    if not tavily_sources:
+        return None
+    
+    try:
+        print(f"🔍 Smart analysis of {len(tavily_sources)} web sources...")
+        
+        # Analyze each source
+        source_verdicts = []
+        for source in tavily_sources:
+            content = source['content'].lower()
+            title = source['title'].lower()
+            combined = f"{title} {content}"
+            url = source.get('url', '').lower()
+            
+            # Fact-checking sites (high trust) and authoritative sources
+            site_labels = domain_index.lookup(url)
+            is_fact_checker = 'fact_checker' in site_labels
+            is_authoritative = 'authority' in site_labels
+            
+            # Count indicators (distinct patterns present, one pass over the source)
+            indicator_hits = SOURCE_TEXT_MATCHER.scores(combined)
+            debunk_score = indicator_hits['debunk']
+            support_score = indicator_hits['support']
+            
+            # Determine source verdict
+            if is_fact_checker and debunk_score > 0:
+                # Fact-checkers debunking = very strong FAKE signal
+                source_verdicts.append(('FAKE', 0.95, f"Fact-checker debunked: {source['title'][:50]}"))
+            elif is_fact_checker and support_score > debunk_score:
+                # Fact-checkers confirming = very strong REAL signal
+                source_verdicts.append(('REAL', 0.95, f"Fact-checker verified: {source['title'][:50]}"))
+            elif debunk_score > support_score * 2:
+                # Strong debunking language
+                source_verdicts.append(('FAKE', 0.80 + min(debunk_score * 0.02, 0.15), 
+                                       f"Debunked by: {source['title'][:50]}"))
+            elif support_score > debunk_score * 2 and is_authoritative:
+                # Strong support from authoritative source
+                source_verdicts.append(('REAL', 0.80 + min(support_score * 0.02, 0.15),
+                                       f"Confirmed by: {source['title'][:50]}"))
+            elif support_score > debunk_score:
+                # Moderate support
+                source_verdicts.append(('REAL', 0.65, f"Supported by: {source['title'][:50]}"))
+            elif debunk_score > support_score:
+                # Moderate debunking
+                source_verdicts.append(('FAKE', 0.65, f"Questioned by: {source['title'][:50]}"))
+        
+        # Aggregate verdicts
+        if not source_verdicts:
+            print(f"   ⚠️ No clear verdict from sources")
+            return None
+        
+        fake_votes = [v for v in source_verdicts if v[0] == 'FAKE']
+        real_votes = [v for v in source_verdicts if v[0] == 'REAL']
+        
+        # Weighted voting (fact-checkers and high confidence votes count more)
+        fake_weight = sum(v[1] for v in fake_votes)
+        real_weight = sum(v[1] for v in real_votes)
+        
+        print(f"   Sources: {len(fake_votes)} say FAKE, {len(real_votes)} say REAL")
+        print(f"   Weights: FAKE={fake_weight:.2f}, REAL={real_weight:.2f}")
+        
+        if fake_weight > real_weight * 1.2:
+            # Clear FAKE consensus
+            is_fake = True
+            confidence = min(0.95, 0.70 + (fake_weight / (fake_weight + real_weight + 0.01)) * 0.25)
+            reasoning = fake_votes[0][2] if fake_votes else "Multiple sources debunk"
+        elif real_weight > fake_weight * 1.2:
+            # Clear REAL consensus
+            is_fake = False
+            confidence = min(0.95, 0.70 + (real_weight / (fake_weight + real_weight + 0.01)) * 0.25)
+            reasoning = real_votes[0][2] if real_votes else "Multiple sources confirm"
+        else:
+            # Mixed or unclear - be conservative
+            is_fake = fake_weight > real_weight
+            confidence = 0.60
+            reasoning = "Sources show mixed evidence"
         
-        # 1. RoBERTa Model
+        print(f"   Web verdict: {'FAKE' if is_fake else 'REAL'} ({confidence:.1%})")
+        return {
+            'is_fake': is_fake,
+            'confidence': confidence,
+            'reasoning': reasoning
+        }
+    
+    except Exception as e:
+        print(f"   Web verification failed: {str(e)}")
+        traceback.print_exc()
+        return None
+
+
+async def run_web_stage(text: str, timings: dict) -> Tuple[str, Optional[dict]]:
+    """Tavily search + source analysis; returns (web_facts, web_verification)"""
+    with timed_stage(timings, "web"):
+        web_facts, tavily_sources = await search_claim_sources(text)
+        return web_facts, analyze_web_sources(tavily_sources)
+
+
+async def run_roberta_stage(text: str, timings: dict) -> Optional[dict]:
+    """RoBERTa fake-news classifier prediction, or None if it failed"""
+    with timed_stage(timings, "roberta"):
+        if settings.model_background_loading and not model_registry.is_loaded("text"):
+            # Don't hold the request for a cold RoBERTa load; web/Gemini stages still decide
+            model_registry.load_in_background("text")
+            print("   RoBERTa: still loading, skipped")
+            return None
         try:
-            detector = load_text_detector()
-            result = detector(request.text)[0]
+            result = await inference_executor.run_model("text", run_text_detector, text)
             model_score = result['score']
             model_is_fake = 'FAKE' in result['label'].upper()
-            predictions.append({
+            print(f"   RoBERTa: {'FAKE' if model_is_fake else 'REAL'} ({model_score:.1%})")
+            return {
                 'model': 'RoBERTa',
                 'is_fake': model_is_fake,
                 'confidence': model_score
-            })
-            print(f"   RoBERTa: {'FAKE' if model_is_fake else 'REAL'} ({model_score:.1%})")
+            }
         except Exception as e:
             print(f"   RoBERTa failed: {str(e)}")
-        
-        # 2. SMART Web Analysis using Tavily results (PRIMARY METHOD)
-        web_verification = None
-        if tavily_sources:
-            try:
-                print(f"🔍 Smart analysis of {len(tavily_sources)} web sources...")
-                claim_lower = request.text.lower()
-                
-                # Enhanced debunking/fact-check indicators (MORE SENSITIVE)
-                debunk_patterns = [
-                    # Strong debunking
-                    'false', 'fake', 'myth', 'debunk', 'incorrect', 'wrong', 'misleading', 'untrue',
-                    'not true', 'no evidence', 'conspiracy theory', 'hoax', 'disproven', 'refuted',
-                    'fact check: false', 'claim is false', 'this is false', 'misinformation',
-                    'lacks evidence', 'unsubstantiated', 'baseless', 'fabricated', 'discredited',
-                    # Context clues
-                    'despite claims', 'contrary to', 'in reality', 'actually', 'truth is',
-                    'scientific consensus', 'studies show', 'experts say', 'research shows',
-                    'no scientific evidence', 'no proof', 'no support', 'widely debunked',
-                    # Additional strong indicators
-                    'has been debunked', 'thoroughly debunked', 'completely false', 'entirely false',
-                    'no link', 'no connection', 'does not cause', 'study finds no', 'experts reject',
-                    'pseudoscience', 'anti-science', 'against science', 'contradicts science'
-                ]
-                
-                support_patterns = [
-                    # Strong support
-                    'confirmed', 'verified', 'true', 'accurate', 'correct', 'factual', 'legitimate',
-                    'proven', 'established', 'documented', 'official', 'evidence shows',
-                    'studies confirm', 'research confirms', 'experts confirm', 'science shows',
-                    'peer-reviewed', 'published in', 'according to', 'data shows',
-                    # Authoritative sources
-                    'cdc', 'who', 'nih', 'fda', 'reuters', 'ap news', 'bbc', 'scientific american',
-                    'nature', 'science journal', 'government', 'university'
-                ]
-                
-                # Analyze each source
-                source_verdicts = []
-                for source in tavily_sources:
-                    content = source['content'].lower()
-                    title = source['title'].lower()
-                    combined = f"{title} {content}"
-                    url = source.get('url', '').lower()
-                    
-                    # Check for fact-checking sites (high trust)
-                    fact_check_sites = ['snopes', 'factcheck.org', 'politifact', 'reuters/fact-check', 
-                                       'apnews.com/hub/fact-checking', 'fullfact', 'africacheck']
-                    is_fact_checker = any(site in url for site in fact_check_sites)
-                    
-                    # Check for authoritative sources
-                    authority_sites = ['cdc.gov', 'who.int', 'nih.gov', 'nature.com', 'science.org',
-                                      'gov', 'edu', 'bbc.com/news', 'reuters.com', 'apnews.com']
-                    is_authoritative = any(site in url for site in authority_sites)
-                    
-                    # Count indicators
-                    debunk_score = sum(1 for pattern in debunk_patterns if pattern in combined)
-                    support_score = sum(1 for pattern in support_patterns if pattern in combined)
-                    
-                    # Determine source verdict
-                    if is_fact_checker and debunk_score > 0:
-                        # Fact-checkers debunking = very strong FAKE signal
-                        source_verdicts.append(('FAKE', 0.95, f"Fact-checker debunked: {source['title'][:50]}"))
-                    elif is_fact_checker and support_score > debunk_score:
-                        # Fact-checkers confirming = very strong REAL signal
-                        source_verdicts.append(('REAL', 0.95, f"Fact-checker verified: {source['title'][:50]}"))
-                    elif debunk_score > support_score * 2:
-                        # Strong debunking language
-                        source_verdicts.append(('FAKE', 0.80 + min(debunk_score * 0.02, 0.15), 
-                                               f"Debunked by: {source['title'][:50]}"))
-                    elif support_score > debunk_score * 2 and is_authoritative:
-                        # Strong support from authoritative source
-                        source_verdicts.append(('REAL', 0.80 + min(support_score * 0.02, 0.15),
-                                               f"Confirmed by: {source['title'][:50]}"))
-                    elif support_score > debunk_score:
-                        # Moderate support
-                        source_verdicts.append(('REAL', 0.65, f"Supported by: {source['title'][:50]}"))
-                    elif debunk_score > support_score:
-                        # Moderate debunking
-                        source_verdicts.append(('FAKE', 0.65, f"Questioned by: {source['title'][:50]}"))
-                
-                # Aggregate verdicts
-                if source_verdicts:
-                    fake_votes = [v for v in source_verdicts if v[0] == 'FAKE']
-                    real_votes = [v for v in source_verdicts if v[0] == 'REAL']
-                    
-                    # Weighted voting (fact-checkers and high confidence votes count more)
-                    fake_weight = sum(v[1] for v in fake_votes)
-                    real_weight = sum(v[1] for v in real_votes)
-                    
-                    print(f"   Sources: {len(fake_votes)} say FAKE, {len(real_votes)} say REAL")
-                    print(f"   Weights: FAKE={fake_weight:.2f}, REAL={real_weight:.2f}")
-                    
-                    if fake_weight > real_weight * 1.2:
-                        # Clear FAKE consensus
-                        is_fake = True
-                        confidence = min(0.95, 0.70 + (fake_weight / (fake_weight + real_weight + 0.01)) * 0.25)
-                        reasoning = fake_votes[0][2] if fake_votes else "Multiple sources debunk"
-                    elif real_weight > fake_weight * 1.2:
-                        # Clear REAL consensus
-                        is_fake = False
-                        confidence = min(0.95, 0.70 + (real_weight / (fake_weight + real_weight + 0.01)) * 0.25)
-                        reasoning = real_votes[0][2] if real_votes else "Multiple sources confirm"
-                    else:
-                        # Mixed or unclear - be conservative
-                        is_fake = fake_weight > real_weight
-                        confidence = 0.60
-                        reasoning = "Sources show mixed evidence"
-                    
-                    web_verification = {
-                        'is_fake': is_fake,
-                        'confidence': confidence,
-                        'reasoning': reasoning
-                    }
-                    print(f"   Web verdict: {'FAKE' if is_fake else 'REAL'} ({confidence:.1%})")
-                else:
-                    print(f"   ⚠️ No clear verdict from sources")
-                
-            except Exception as e:
-                print(f"   Web verification failed: {str(e)}")
-                import traceback
-                traceback.print_exc()
-        
-        # 3. PRE-CHECK: Known conspiracy theories and basic facts (FAST PATH)
-        claim_lower = request.text.lower()
-        final_result = None
-        
-        # KNOWN CONSPIRACY THEORIES & DANGEROUS MISINFORMATION (FAKE)
-        fake_indicators = [
-            'vaccine' in claim_lower and 'autism' in claim_lower,
-            'flat earth' in claim_lower or ('earth' in claim_lower and 'flat' in claim_lower and 'is' in claim_lower),
-            '5g' in claim_lower and ('covid' in claim_lower or 'coronavirus' in claim_lower),
-            'moon landing' in claim_lower and ('fake' in claim_lower or 'hoax' in claim_lower or 'faked' in claim_lower),
-            'climate' in claim_lower and 'hoax' in claim_lower,
-            'bleach' in claim_lower and ('cure' in claim_lower or 'cures' in claim_lower or 'treat' in claim_lower or 'treatment' in claim_lower),
-            'drink' in claim_lower and 'bleach' in claim_lower,
-        ]
-        
-        if any(fake_indicators):
-            print(f"   🎯 FAST PATH: Known conspiracy theory detected")
-            final_result = {
-                'is_fake': True,
-                'confidence': 0.95,
-                'reasoning': "Well-known debunked conspiracy theory"
-            }
-        
-        # KNOWN BASIC FACTS (REAL) - Only if not already marked as fake
-        if not final_result:
-            real_indicators = [
-                'water' in claim_lower and 'h2o' in claim_lower,
-                'water' in claim_lower and 'freeze' in claim_lower and ('0' in claim_lower or 'zero' in claim_lower),
-                'water' in claim_lower and 'boil' in claim_lower and '100' in claim_lower,
-                'sun' in claim_lower and 'rise' in claim_lower and 'east' in claim_lower,
-                'earth' in claim_lower and 'orbit' in claim_lower and 'sun' in claim_lower,
-                'earth' in claim_lower and 'round' in claim_lower,
-                'earth' in claim_lower and 'sphere' in claim_lower,
-                'gravity' in claim_lower and ('exist' in claim_lower or 'real' in claim_lower or 'pull' in claim_lower),
-                'dna' in claim_lower and 'genetic' in claim_lower,
-                'paris' in claim_lower and 'capital' in claim_lower and 'france' in claim_lower,
-                'obama' in claim_lower and ('president' in claim_lower or '44th' in claim_lower),
-                'human' in claim_lower and 'oxygen' in claim_lower and ('need' in claim_lower or 'breathe' in claim_lower),
-                'oxygen' in claim_lower and 'breathe' in claim_lower,
-            ]
+            return None
+
+
+async def run_gemini_stage(text: str, web_facts: str, timings: dict) -> Optional[dict]:
+    """Gemini verifier over the claim and the web facts, or None if it failed"""
+    with timed_stage(timings, "gemini"):
+        try:
+            print(f"🧠 Gemini: Analyzing claim against latest data...")
             
-            if any(real_indicators):
-                print(f"   🎯 FAST PATH: Known basic fact detected")
-                final_result = {
-                    'is_fake': False,
-                    'confidence': 0.95,
-                    'reasoning': "Verified basic scientific/historical fact"
-                }
-        
-        # 4. Gemini verifier (ONLY if fast-path didn't match)
-        if not final_result and gemini_model:
-            try:
-                print(f"🧠 Gemini: Analyzing claim against latest data...")
-                
-                prompt = f"""You are an expert fact-checker with access to current scientific consensus and verified information.
+            prompt = f"""You are an expert fact-checker with access to current scientific consensus and verified information.
 
-CLAIM TO VERIFY: "{request.text}"
+CLAIM TO VERIFY: "{text}"
 
 WEB SOURCES (if available):
 {web_facts if web_facts else "Use your training data and scientific knowledge"}
@@ -1154,41 +1265,97 @@ OUTPUT ONLY THIS JSON (no markdown, no explanation):
     "confidence": 0.95,
     "reasoning": "Brief reason"
 }}"""
-                
-                response = gemini_model.generate_content(prompt)
-                response_text = response.text.strip().replace('```json', '').replace('```', '')
-                gemini_result = json.loads(response_text)
-                
-                predictions.append({
-                    'model': 'Gemini',
-                    'is_fake': gemini_result['is_fake'],
-                    'confidence': gemini_result['confidence']
-                })
-                
-                # Gemini has highest priority (after fast-path)
-                final_result = gemini_result
-                print(f"   Gemini: {'FAKE' if gemini_result['is_fake'] else 'REAL'} ({gemini_result['confidence']:.1%})")
-                
-            except Exception as e:
-                print(f"   Gemini failed: {str(e)[:100]}")
+            
+            response_text = await gemini_model.generate(prompt)
+            response_text = response_text.strip().replace('```json', '').replace('```', '')
+            gemini_result = json.loads(response_text)
+            print(f"   Gemini: {'FAKE' if gemini_result['is_fake'] else 'REAL'} ({gemini_result['confidence']:.1%})")
+            return gemini_result
         
-        # Priority: Fast-Path > Gemini > Tavily Web > RoBERTa
-        if not final_result and web_verification:
+        except Exception as e:
+            print(f"   Gemini failed: {str(e)[:100]}")
+            return None
+
+
+async def cancel_stage(task: Optional[asyncio.Task]) -> None:
+    """Cancel a stage whose result is no longer needed"""
+    if task is not None and not task.done():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+@app.post("/api/v1/check-text", response_model=CheckResponse)
+async def check_text(request: TextCheckRequest):
+    """
+    Intelligent Web-Based Fact-Checking System, run as explicit stages:
+    1. Cache lookup on the normalized claim
+    2. Fast-path rules for known conspiracy theories / basic facts (early exit)
+    3. Tavily web analysis and RoBERTa in parallel
+    4. Gemini only if the web verdict is not decisive
+    Returns only REAL or FAKE (no process details)
+    """
+    timings = {}
+    exit_stage = "fallback"
+    roberta_task = None
+    try:
+        # Identical (after normalization) claims skip every model and external call
+        with timed_stage(timings, "cache"):
+            cached = await claim_cache.get(request.text) if settings.claim_cache_enabled else None
+        if cached:
+            TEXT_PIPELINE_EXITS.labels(stage="cache").inc()
+            return CheckResponse(**cached)
+        
+        print(f"\n{'='*70}")
+        print(f"📝 FACT-CHECKING: '{request.text[:80]}...'")
+        print(f"{'='*70}")
+        
+        # Fast path: no web search or model needed for well-known claims
+        with timed_stage(timings, "fast_path"):
+            final_result = fast_path_verdict(request.text.lower())
+        if final_result:
+            exit_stage = "fast_path"
+        
+        web_verification = None
+        roberta_prediction = None
+        if not final_result:
+            print(f"🔍 Comparing claim with latest verified data...")
+            # RoBERTa runs while the web search is in flight; it's only needed as a fallback
+            roberta_task = asyncio.create_task(run_roberta_stage(request.text, timings))
+            web_facts, web_verification = await run_web_stage(request.text, timings)
+            
+            if web_verification and web_verification['confidence'] >= settings.text_web_decisive_confidence:
+                final_result = web_verification
+                exit_stage = "web"
+                print(f"   ✅ Decisive Tavily web-based verification")
+            elif gemini_model:
+                # Gemini has highest priority (after fast-path and decisive web verdicts)
+                final_result = await run_gemini_stage(request.text, web_facts, timings)
+                if final_result:
+                    exit_stage = "gemini"
+            
+            if final_result:
+                await cancel_stage(roberta_task)
+            elif web_verification:
                 # Use web verification if Gemini failed
                 final_result = web_verification
+                exit_stage = "web"
                 print(f"   ✅ Using Tavily web-based verification")
+            else:
+                roberta_prediction = await roberta_task
         
-        if not final_result and predictions:
-                # RoBERTa as last resort
-                model_pred = predictions[0]
-                final_result = {
-                    'is_fake': model_pred['is_fake'],
-                    'confidence': max(0.55, model_pred['confidence'] * 0.8),
-                    'reasoning': f"RoBERTa model prediction (no web data)"
-                }
-                print(f"   ⚠️ Using RoBERTa only")
+        if not final_result and roberta_prediction:
+            # RoBERTa as last resort
+            final_result = {
+                'is_fake': roberta_prediction['is_fake'],
+                'confidence': max(0.55, roberta_prediction['confidence'] * 0.8),
+                'reasoning': f"RoBERTa model prediction (no web data)"
+            }
+            exit_stage = "roberta"
+            print(f"   ⚠️ Using RoBERTa only")
         
-        # Ultimate fallback
+        # Only verdicts backed by rules or sources are cached: RoBERTa-only and the
+        # conservative default mean the sources were unreachable, and the next request may reach them
+        verified = exit_stage in ("fast_path", "web", "gemini")
         if not final_result:
             final_result = {
                 'is_fake': True,  # Conservative: mark as fake if we can't verify
@@ -1206,19 +1373,28 @@ OUTPUT ONLY THIS JSON (no markdown, no explanation):
         analysis = f"{verdict}"
         
         print(f"{'='*70}")
-        print(f"FINAL VERDICT: {verdict} ({confidence:.1%})")
+        print(f"FINAL VERDICT: {verdict} ({confidence:.1%}) via {exit_stage}")
+        print(f"Stage timings (ms): {timings}")
         print(f"{'='*70}\n")
+        TEXT_PIPELINE_EXITS.labels(stage=exit_stage).inc()
         
-        return CheckResponse(
+        response = CheckResponse(
             is_fake=is_fake,
             confidence=confidence,
             analysis=analysis,
             verdict=verdict
         )
+        if settings.claim_cache_enabled and verified:
+            await claim_cache.set(request.text, response.model_dump())
+        return response
     
     except Exception as e:
         print(f"❌ Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Client disconnects cancel this handler; don't leave the RoBERTa stage running
+        if roberta_task is not None and not roberta_task.done():
+            roberta_task.cancel()
 
 
 class URLCheckRequest(BaseModel):
@@ -1245,47 +1421,29 @@ async def check_url(request: URLCheckRequest):
         domain = urlparse(request.url).netloc.lower()
         print(f"📍 Domain: {domain}")
         
-        # DOMAIN REPUTATION CHECK - Known misinformation sites
-        known_fake_domains = [
-            'naturalnews.com', 'infowars.com', 'beforeitsnews.com', 'worldtruth.tv',
-            'yournewswire.com', 'neonnettle.com', 'realfarmacy.com', 'thelastamericanvagabond.com',
-            'newsbreak.com', 'collective-evolution.com', 'davidicke.com', 'activistpost.com',
-            'rumormillnews.com', 'stateofthenation.co', 'awarenessact.com', 'trueactivist.com',
-            'thefederalistpapers.org', 'themindunleashed.com', 'undergroundhealth.com',
-            'americannews.com', 'conservativetribune.com', 'usapoliticstoday.com'
-        ]
-        
-        # Trusted domains - Legitimate sources
-        trusted_domains = [
-            'cdc.gov', 'nih.gov', 'who.int', 'fda.gov', 'nasa.gov', 'usgs.gov', 'noaa.gov',
-            'bbc.com', 'bbc.co.uk', 'reuters.com', 'apnews.com', 'npr.org', 'pbs.org',
-            'nytimes.com', 'washingtonpost.com', 'wsj.com', 'theguardian.com',
-            'nature.com', 'sciencemag.org', 'science.org', 'cell.com', 'thelancet.com',
-            'nejm.org', 'plos.org', 'nih.gov', 'pubmed.ncbi.nlm.nih.gov',
-            'wikipedia.org', 'britannica.com', 'snopes.com', 'factcheck.org',
-            'politifact.com', 'example.com'
-        ]
+        # DOMAIN REPUTATION CHECK - shared index (also synced to the extension)
+        domain_labels = domain_index.lookup(request.url)
         
         # Check if domain is in known fake list
-        if any(fake_domain in domain for fake_domain in known_fake_domains):
+        if 'fake' in domain_labels:
             print(f"🚨 DOMAIN ALERT: Known misinformation source detected!")
             return CheckResponse(
                 is_fake=True,
                 confidence=0.92,
                 analysis=f"Domain {domain} is known for publishing misinformation and conspiracy theories",
                 verdict="FAKE",
-                details={"source": "domain_reputation", "domain": domain}
+                details={"source": "domain_reputation", "domain": domain, "reputation_version": domain_index.version}
             )
         
         # Check if domain is trusted
-        if any(trusted_domain in domain for trusted_domain in trusted_domains):
+        if 'trusted' in domain_labels:
             print(f"✅ DOMAIN: Trusted source detected")
             return CheckResponse(
                 is_fake=False,
                 confidence=0.93,
                 analysis=f"Domain {domain} is a trusted and reputable source",
                 verdict="REAL",
-                details={"source": "domain_reputation", "domain": domain}
+                details={"source": "domain_reputation", "domain": domain, "reputation_version": domain_index.version}
             )
         
         # Fetch URL content (with timeout)
@@ -1348,15 +1506,21 @@ async def check_url(request: URLCheckRequest):
 @app.post("/api/v1/check-image")
 async def check_image(file: UploadFile = File(...)):
     """Check if image is a deepfake with Gemini backup verification"""
-    if not image_detector_model:
-        raise HTTPException(status_code=503, detail="Image detection model not available")
+    require_model("image", "Image detection")
     
     try:
         image_bytes = await file.read()
-        result = analyze_image_with_sota(image_bytes)
+        digest = await inference_executor.run_io(content_digest, image_bytes)
+        cached = await lookup_verdict("image", digest)
+        if cached:
+            return cached
+        
+        image_tensor = await inference_executor.run_model("image", preprocess_image, image_bytes)
+        prob_fake = await image_batcher.submit(image_tensor)
+        result = interpret_image_score(prob_fake)
         
         # Gemini backup verification (only if predicted as FAKE)
-        gemini_check = verify_with_gemini_image(image_bytes, result["is_fake"], result["confidence"])
+        gemini_check = await verify_with_gemini_image(image_bytes, result["is_fake"], result["confidence"])
         if gemini_check["override"]:
             result["is_fake"] = gemini_check["is_fake"]
             result["confidence"] = gemini_check["confidence"]
@@ -1365,13 +1529,15 @@ async def check_image(file: UploadFile = File(...)):
                                 f"Original Model: FAKE ({result.get('original_confidence', result['confidence']):.1%})\n" + \
                                 f"Gemini Verification: REAL ({gemini_check['confidence']:.1%})"
         
-        return CheckResponse(
+        response = CheckResponse(
             is_fake=result["is_fake"],
             confidence=result["confidence"],
             analysis=result["analysis"],
             verdict=result["verdict"],
             details=result.get("model_details")
         )
+        await store_verdict("image", digest, response)
+        return response
     
     except Exception as e:
         print(f"Error analyzing image: {str(e)}")
@@ -1379,18 +1545,60 @@ async def check_image(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def video_audio_enabled() -> bool:
+    """Whether check_video can score the audio track now without failing or stalling on the voice model"""
+    if not settings.video_audio_analysis or not settings.ffmpeg_binary:
+        return False
+    try:
+        require_model("voice", "Voice detection")  # in background mode, starts loading it for later requests
+    except HTTPException:
+        return False
+    return True
+
+
+async def run_video_audio(media: MediaInput) -> dict:
+    """analyze_video_audio on a model worker; a failure only costs the video its audio verdict"""
+    try:
+        return await inference_executor.run_model("voice", analyze_video_audio, media)
+    except Exception as e:
+        print(f"⚠️ Video audio track not analyzed: {str(e)}")
+        return {"status": "error", "error": str(e)}
+
+
 @app.post("/api/v1/check-video")
-async def check_video(file: UploadFile = File(...)):
-    """Check if video is a deepfake with Gemini backup verification"""
-    if not video_detector_model:
-        raise HTTPException(status_code=503, detail="Video detection model not available")
+async def check_video(file: UploadFile = File(...), frames: Optional[int] = Form(None)):
+    """
+    Check if video is a deepfake with Gemini backup verification.
+    `frames` optionally overrides how many frames are sampled (latency vs coverage).
+    With VIDEO_AUDIO_ANALYSIS the audio track is scored by the voice detector
+    concurrently and a cloned voice also makes the video FAKE.
+    """
+    require_model("video", "Video detection")
     
     try:
         video_bytes = await file.read()
-        result = analyze_video_with_sota(video_bytes)
+        digest = await inference_executor.run_io(content_digest, video_bytes)
+        with_audio = video_audio_enabled()
+        variant = f"frames={resolve_video_frame_count(frames)}" + ("+audio" if with_audio else "")
+        cached = await lookup_verdict("video", digest, variant)
+        if cached:
+            return cached
+        
+        with MediaInput(video_bytes, suffix=upload_suffix(file, '.mp4'), mime_type=file.content_type) as media:
+            # The audio track is demuxed and scored on another model worker while the frames are
+            audio_task = asyncio.ensure_future(run_video_audio(media)) if with_audio else None
+            try:
+                # Decode once; the frame scorer and Gemini verifier both read from this context
+                context, frame_indices = await inference_executor.run_model(
+                    "video", decode_video_context, media, frames
+                )
+                result = await inference_executor.run_model("video", analyze_video_with_sota, context, frame_indices)
+            finally:
+                # The audio worker reads the upload: let it finish before the upload is closed
+                audio_result = (await asyncio.gather(audio_task, return_exceptions=True))[0] if audio_task else None
         
         # Gemini backup verification (only if predicted as FAKE)
-        gemini_check = verify_with_gemini_video(video_bytes, result["is_fake"], result["confidence"])
+        gemini_check = await verify_with_gemini_video(context, result["is_fake"], result["confidence"])
         if gemini_check["override"]:
             result["is_fake"] = gemini_check["is_fake"]
             result["confidence"] = gemini_check["confidence"]
@@ -1399,13 +1607,19 @@ async def check_video(file: UploadFile = File(...)):
                                 f"Original Model: FAKE ({result.get('original_confidence', result['confidence']):.1%})\n" + \
                                 f"Gemini Verification: REAL ({gemini_check['confidence']:.1%})"
         
-        return CheckResponse(
+        # Gemini only sees frames, so the audio verdict is combined after its check
+        if audio_result is not None:
+            result = combine_video_and_audio(result, audio_result)
+        
+        response = CheckResponse(
             is_fake=result["is_fake"],
             confidence=result["confidence"],
             analysis=result["analysis"],
             verdict=result["verdict"],
             details=result.get("model_details")
         )
+        await store_verdict("video", digest, response, variant)
+        return response
     
     except Exception as e:
         print(f"Error analyzing video: {str(e)}")
@@ -1416,43 +1630,24 @@ async def check_video(file: UploadFile = File(...)):
 @app.post("/api/v1/check-voice")
 async def check_voice(file: UploadFile = File(...)):
     """Check if audio is a deepfake using SOTA model with Gemini backup verification"""
+    require_model("voice", "Voice detection")
+    
     try:
         audio_bytes = await file.read()
+        digest = await inference_executor.run_io(content_digest, audio_bytes)
+        # Whole-clip and first-4-seconds verdicts for the same bytes differ: keep them apart
+        variant = "windows" if settings.voice_sliding_windows else ""
+        if settings.voice_vad:
+            variant += "+vad"
+        cached = await lookup_verdict("voice", digest, variant)
+        if cached:
+            return cached
         
-        # Save temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
-            tmp_file.write(audio_bytes)
-            audio_path = tmp_file.name
+        media = MediaInput(audio_bytes, suffix=upload_suffix(file, '.wav'), mime_type=file.content_type)
         
         try:
-            # Lazy load SOTA voice detector
-            model, feature_extractor = load_voice_detector()
-            
-            # Load and preprocess audio according to SOTA model requirements
-            # Model expects: 4-second clips at 16 kHz
-            waveform, sr = librosa.load(audio_path, sr=16000, mono=True)
-            
-            # Ensure 4 seconds length (64,000 samples at 16kHz)
-            target_len = 4 * 16000
-            if len(waveform) < target_len:
-                # Pad with zeros
-                waveform = np.pad(waveform, (0, target_len - len(waveform)), mode='constant')
-            else:
-                # Truncate to 4 seconds
-                waveform = waveform[:target_len]
-            
-            # Extract features using Wav2Vec2 feature extractor
-            input_values = feature_extractor(
-                waveform,
-                sampling_rate=16000,
-                return_tensors="pt"
-            ).input_values
-            
-            # Run inference
-            model.eval()
-            with torch.no_grad():
-                logits = model(input_values)
-                prob_fake = torch.sigmoid(logits).item()
+            voice_result = await inference_executor.run_model("voice", analyze_voice_with_sota, media)
+            prob_fake = voice_result["probability_fake"]
             
             # Interpret results (model outputs probability of FAKE)
             # Threshold: 0.5 (per model card)
@@ -1463,7 +1658,7 @@ async def check_voice(file: UploadFile = File(...)):
             model_confidence = confidence
             
             # Gemini backup verification
-            gemini_check = verify_with_gemini_audio(audio_bytes, model_prediction, model_confidence)
+            gemini_check = await verify_with_gemini_audio(media, model_prediction, model_confidence)
             
             if gemini_check.get("should_check", False):
                 final_is_fake = gemini_check["is_fake"]
@@ -1491,9 +1686,16 @@ async def check_voice(file: UploadFile = File(...)):
                 analysis = f"Voice Analysis: {verdict} (Confidence: {final_confidence:.1%})\n\n"
                 analysis += "🎯 Architecture: Wav2Vec2 + BiGRU + Multi-Head Attention\n"
                 analysis += f"📊 Model trained on 822K samples (19 datasets)\n"
-                analysis += f"🎤 Input: 4-second clip at 16 kHz"
+                analysis += f"🎤 Input: {voice_result['windows_analyzed']} x 4-second window(s) at 16 kHz"
+                if voice_result["windows_skipped"]:
+                    analysis += f" ({voice_result['windows_skipped']} silent/noise-only window(s) skipped)"
+                flagged = [w for w in voice_result["timeline"] if w["probability_fake"] >= 0.5]
+                if flagged and len(flagged) < len(voice_result["timeline"]):
+                    analysis += "\n⚠️ Synthetic-sounding segments: " + ", ".join(
+                        f"{w['start_seconds']:.1f}-{w['end_seconds']:.1f}s" for w in flagged[:5]
+                    )
             
-            return CheckResponse(
+            response = CheckResponse(
                 is_fake=final_is_fake,
                 confidence=final_confidence,
                 analysis=analysis,
@@ -1503,12 +1705,18 @@ async def check_voice(file: UploadFile = File(...)):
                     "architecture": "Wav2Vec2 + BiGRU + 8-head Attention",
                     "parameters": "98.5M",
                     "model_score": f"{prob_fake:.4f}",
-                    "audio_duration": f"{len(waveform) / 16000:.2f}s"
+                    "audio_duration": f"{voice_result['duration_seconds']:.2f}s",
+                    "windows_analyzed": voice_result["windows_analyzed"],
+                    "windows_skipped": voice_result["windows_skipped"],
+                    "speech_seconds": voice_result["speech_seconds"],
+                    "timeline": voice_result["timeline"]
                 }
             )
+            await store_verdict("voice", digest, response, variant)
+            return response
         
         finally:
-            os.unlink(audio_path)
+            media.close()
     
     except Exception as e:
         print(f"Error analyzing audio: {str(e)}")
@@ -1516,6 +1724,143 @@ async def check_voice(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+
+active_voice_streams = 0
+
+
+@app.websocket("/api/v1/stream-voice")
+async def stream_voice(
+    websocket: WebSocket,
+    audio_format: str = Query("pcm_s16le", alias="format"),
+    sample_rate: int = Query(16000, ge=8000, le=192000),
+    channels: int = Query(1, ge=1, le=8),
+):
+    """
+    Rolling voice-deepfake scores for live audio (e.g. a call in progress).
+
+    The client sends binary messages of raw little-endian PCM
+    (format=pcm_s16le|pcm_f32le, with sample_rate and channels) or an Ogg/WebM
+    Opus stream as produced by MediaRecorder (format=opus), then the text
+    message "end". Each 4-second window (VOICE_WINDOW_OVERLAP overlap) is
+    scored as soon as its last sample arrives and pushed back as
+    {"type": "window", ...}; after "end" a {"type": "final", ...} summary is
+    sent and the socket is closed. Windows of all open streams share forward
+    passes through voice_batcher, and each connection buffers at most one
+    window plus one hop of audio.
+    """
+    global active_voice_streams
+    await websocket.accept()
+    if audio_format not in PCM_DTYPES and audio_format != "opus":
+        await websocket.close(code=1003, reason=f"Unsupported format: {audio_format}")
+        return
+    try:
+        require_model("voice", "Voice detection")
+    except HTTPException as e:
+        await websocket.close(code=1013, reason=str(e.detail))
+        return
+    if active_voice_streams >= settings.voice_stream_max_connections:
+        await websocket.close(code=1013, reason="Too many concurrent voice streams")
+        return
+    
+    sr = 16000
+    window = 4 * sr
+    hop = max(1, int(window * (1 - settings.voice_window_overlap)))
+    windower = StreamWindower(window, hop)
+    scores = RollingWindowScores(settings.voice_aggregate_top_windows)
+    skipped = 0
+    
+    async def score(ready: List[Tuple[int, np.ndarray]]) -> None:
+        nonlocal skipped
+        speech = [True] * len(ready)
+        if settings.voice_vad and ready:
+            # Unlike an upload, a stream may go without any score until speech starts
+            speech = [
+                bool(window_speech_ratios(
+                    samples, [0], window, sr, energy_floor_db=settings.voice_vad_energy_floor_db
+                )[0][0] >= settings.voice_vad_min_speech_ratio)
+                for _, samples in ready
+            ]
+        # Windows completed by one message are submitted together so they can share a batch
+        probs = iter(await asyncio.gather(*(
+            voice_batcher.submit(samples) for (_, samples), is_speech in zip(ready, speech) if is_speech
+        )))
+        for (start, _), is_speech in zip(ready, speech):
+            prob = next(probs) if is_speech else None
+            if prob is None:
+                skipped += 1
+            else:
+                scores.add(prob)
+            rolling = scores.value()
+            await websocket.send_json({
+                "type": "window",
+                "start_seconds": round(start / sr, 2),
+                "end_seconds": round(min(start + window, windower.buffer.total) / sr, 2),
+                "speech": is_speech,
+                "probability_fake": None if prob is None else round(prob, 4),
+                "rolling_probability_fake": None if rolling is None else round(rolling, 4),
+                "is_fake": rolling is not None and rolling >= 0.5,
+            })
+        VOICE_WINDOWS.labels(outcome="scored").inc(speech.count(True))
+        VOICE_WINDOWS.labels(outcome="skipped").inc(speech.count(False))
+    
+    active_voice_streams += 1
+    decoder = None
+    try:
+        if audio_format in PCM_DTYPES and sample_rate == sr:
+            decoder = PcmStreamDecoder(audio_format, channels)
+        else:
+            # Opus, or PCM that needs resampling: one ffmpeg process for the whole stream
+            input_args = [] if audio_format == "opus" else [
+                "-f", audio_format[4:], "-ar", str(sample_rate), "-ac", str(channels)
+            ]
+            decoder = await FfmpegStreamDecoder(input_args, sr, settings.ffmpeg_binary or "ffmpeg").start()
+        
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                await score(windower.push(await decoder.feed(message["bytes"])))
+            elif message.get("text") == "end":
+                break
+        
+        await score(windower.push(await decoder.finish()))
+        tail = windower.flush()
+        if tail:
+            await score([tail])
+        prob_fake = scores.value()
+        if prob_fake is None:
+            verdict, confidence = "NO_SPEECH", 0.0
+        else:
+            verdict = "FAKE" if prob_fake >= 0.5 else "REAL"
+            confidence = prob_fake if prob_fake >= 0.5 else 1.0 - prob_fake
+        await websocket.send_json({
+            "type": "final",
+            "verdict": verdict,
+            "is_fake": verdict == "FAKE",
+            "confidence": confidence,
+            "probability_fake": prob_fake,
+            "duration_seconds": round(windower.buffer.total / sr, 2),
+            "windows_analyzed": scores.count,
+            "windows_skipped": skipped,
+        })
+        await websocket.close()
+    
+    except WebSocketDisconnect:
+        pass
+    except (AudioDecodeError, FileNotFoundError) as e:
+        # Undecodable stream, or no ffmpeg binary for Opus / resampling
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1003 if isinstance(e, AudioDecodeError) else 1011)
+    except Exception as e:
+        print(f"Error in voice stream: {str(e)}")
+        print(traceback.format_exc())
+        await websocket.close(code=1011)
+    finally:
+        active_voice_streams -= 1
+        if decoder is not None:
+            await decoder.close()
+
 if __name__ == "__main__":
     import uvicorn
     print("\n🚀 Starting AI-Powered Deepfake Detection Server with SOTA Models...")
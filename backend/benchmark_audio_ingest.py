@@ -0,0 +1,140 @@
+"""
+Audio Ingest Benchmark
+Compares the previous check_voice decode (librosa.load from the upload buffer,
+falling back to a temp-file path) with shared.media.audio.decode_audio
+(soundfile from memory / ffmpeg pipe + cached polyphase resampling) across
+formats, source sample rates and durations. Reports the median latency and
+the SNR of the new output against librosa's.
+
+Formats that need an encoder (mp3, m4a) are generated with ffmpeg and skipped
+when it isn't installed.
+
+Usage:
+    python benchmark_audio_ingest.py [--formats wav flac ogg mp3 m4a] [--durations 5 30 120]
+        [--rates 44100 48000] [--repeats 5] [--ffmpeg ffmpeg]
+"""
+import argparse
+import io
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from shared.media import MediaInput, decode_audio
+
+TARGET_SR = 16000
+SOUNDFILE_FORMATS = {"wav": ("WAV", "PCM_16"), "flac": ("FLAC", "PCM_16"), "ogg": ("OGG", "VORBIS")}
+
+
+def synthetic_speech(duration, sample_rate, seed=0):
+    """Stereo signal with a voice-like harmonic stack, syllable-rate envelope and noise"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t) ** 2
+    mono = 0.2 * voice * envelope + 0.01 * rng.standard_normal(len(t))
+    return np.stack([mono, 0.9 * mono], axis=1).astype(np.float32)
+
+
+def encode(audio, sample_rate, fmt, ffmpeg):
+    """Encoded bytes of `audio` in `fmt`, or None if no encoder is available"""
+    if fmt in SOUNDFILE_FORMATS:
+        buffer = io.BytesIO()
+        container, subtype = SOUNDFILE_FORMATS[fmt]
+        with sf.SoundFile(buffer, "w", sample_rate, audio.shape[1], format=container, subtype=subtype) as f:
+            for start in range(0, len(audio), 16384):  # libsndfile's Vorbis encoder crashes on one huge write
+                f.write(audio[start:start + 16384])
+        return buffer.getvalue()
+    if not ffmpeg:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp) / "source.wav", Path(tmp) / f"encoded.{fmt}"
+        sf.write(source, audio, sample_rate, subtype="PCM_16")
+        subprocess.run([ffmpeg, "-v", "error", "-y", "-i", str(source), "-b:a", "128k", str(target)], check=True)
+        return target.read_bytes()
+
+
+def librosa_load(data, suffix):
+    """The previous load_waveform: librosa from the buffer, else from a file path"""
+    import librosa
+    try:
+        waveform, _ = librosa.load(io.BytesIO(data), sr=TARGET_SR, mono=True)
+    except Exception:
+        with tempfile.NamedTemporaryFile(suffix=suffix) as f:
+            f.write(data)
+            f.flush()
+            waveform, _ = librosa.load(f.name, sr=TARGET_SR, mono=True)
+    return waveform
+
+
+def ingest_load(data, suffix, ffmpeg):
+    media = MediaInput(data, suffix=suffix)
+    try:
+        return decode_audio(media, TARGET_SR, ffmpeg=ffmpeg)
+    finally:
+        media.close()
+
+
+def median_seconds(fn, repeats):
+    result = fn()  # first call also warms caches (resample filter, imports)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def snr_db(reference, candidate):
+    length = min(len(reference), len(candidate))
+    reference, candidate = reference[:length], candidate[:length]
+    noise = np.sum((reference - candidate) ** 2)
+    return float("inf") if noise == 0 else 10 * np.log10(np.sum(reference ** 2) / noise)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark audio decode + resample for check_voice")
+    parser.add_argument("--formats", nargs="+", default=["wav", "flac", "ogg", "mp3", "m4a"])
+    parser.add_argument("--durations", nargs="+", type=float, default=[5, 30, 120])
+    parser.add_argument("--rates", nargs="+", type=int, default=[44100, 48000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--ffmpeg", default="ffmpeg")
+    args = parser.parse_args()
+
+    ffmpeg = shutil.which(args.ffmpeg)
+    if not ffmpeg:
+        print("⚠️  ffmpeg not found: mp3/m4a skipped, decode_audio falls back to librosa for them")
+    rows = []
+    for fmt in args.formats:
+        for rate in args.rates:
+            for duration in args.durations:
+                data = encode(synthetic_speech(duration, rate), rate, fmt, ffmpeg)
+                if data is None:
+                    continue
+                suffix = f".{fmt}"
+                old_s, reference = median_seconds(lambda: librosa_load(data, suffix), args.repeats)
+                new_s, waveform = median_seconds(lambda: ingest_load(data, suffix, ffmpeg), args.repeats)
+                rows.append((fmt, rate, duration, old_s, new_s, snr_db(reference, waveform),
+                             len(waveform) - len(reference)))
+
+    print("\n" + "=" * 92)
+    print("🎧 AUDIO INGEST: librosa vs decode_audio")
+    print("=" * 92)
+    print(f"{'Format':7s} {'Rate':>6s} {'Dur s':>6s} {'librosa ms':>11s} {'ingest ms':>10s} "
+          f"{'Speedup':>8s} {'SNR dB':>8s} {'dLen':>6s}")
+    print("-" * 92)
+    for fmt, rate, duration, old_s, new_s, snr, length_delta in rows:
+        print(f"{fmt:7s} {rate:6d} {duration:6.0f} {old_s * 1000:11.1f} {new_s * 1000:10.1f} "
+              f"{old_s / new_s:7.2f}x {snr:8.1f} {length_delta:6d}")
+    print("=" * 92 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Torch vs ONNX Runtime Latency Benchmark
+Times eager torch and the ONNX Runtime backend on the frame detectors at
+several batch sizes and reports latency, throughput and max logit difference.
+Uses the real architectures (random weights, no download) when timm is
+installed, a small EfficientNet-like stand-in otherwise.
+
+Usage:
+    python benchmark_backends.py [--models image video] [--batch-sizes 1 4 8 16] [--repeats 10]
+        [--threads 0]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+
+from shared.inference.onnx_backend import ONNXRUNTIME_AVAILABLE, OnnxModel, export_onnx, max_logit_difference
+
+
+class StandInDetector(nn.Module):
+    """Depthwise-separable conv stack + classifier head (used when timm is missing)"""
+    def __init__(self, width=32, blocks=6):
+        super().__init__()
+        layers = [nn.Conv2d(3, width, 3, stride=2, padding=1), nn.BatchNorm2d(width), nn.SiLU()]
+        for i in range(blocks):
+            stride = 2 if i % 2 == 0 else 1
+            layers += [
+                nn.Conv2d(width, width, 3, stride=stride, padding=1, groups=width), nn.BatchNorm2d(width), nn.SiLU(),
+                nn.Conv2d(width, width * 2, 1), nn.BatchNorm2d(width * 2), nn.SiLU(),
+            ]
+            width *= 2
+        self.backbone = nn.Sequential(*layers, nn.AdaptiveAvgPool2d(1), nn.Flatten())
+        self.classifier = nn.Sequential(nn.Linear(width, 512), nn.ReLU(), nn.Dropout(0.3), nn.Linear(512, 1))
+
+    def forward(self, x):
+        return self.classifier(self.backbone(x))
+
+
+def build_model(name):
+    """(model, input_size, description)"""
+    try:
+        import sota_models
+        cls, size = {
+            "image": (sota_models.DeepfakeImageDetector, 380),
+            "video": (sota_models.DeepfakeVideoDetector, 299),
+        }[name]
+        model = cls(pretrained=False)
+        return model.eval(), size, model.backbone_name
+    except ImportError:
+        size = 380 if name == "image" else 299
+        return StandInDetector().eval(), size, "stand-in CNN (timm not installed)"
+
+
+def time_call(fn, batch, repeats):
+    fn(batch)  # warm up allocator / ORT arena
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(batch)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare eager torch and ONNX Runtime on the frame detectors")
+    parser.add_argument("--models", nargs="+", default=["image", "video"], choices=["image", "video"])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 4, 8, 16])
+    parser.add_argument("--repeats", type=int, default=10, help="Timed calls per batch size (median)")
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads for both backends (0 = default)")
+    args = parser.parse_args()
+
+    if not ONNXRUNTIME_AVAILABLE:
+        print("❌ onnxruntime is not installed (pip install onnx onnxruntime)")
+        return
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.models:
+            torch.manual_seed(0)
+            model, size, description = build_model(name)
+            print(f"\n📦 {name}: {description} @ {size}px, exporting...")
+            session = OnnxModel(export_onnx(model, Path(tmp) / f"{name}.onnx", size), intra_op_threads=args.threads)
+
+            def run_torch(batch):
+                with torch.no_grad():
+                    return model(batch)
+
+            for batch_size in args.batch_sizes:
+                batch = torch.rand(batch_size, 3, size, size)
+                torch_s = time_call(run_torch, batch, args.repeats)
+                onnx_s = time_call(session, batch, args.repeats)
+                diff = max_logit_difference(model, session, batch)
+                rows.append((name, batch_size, torch_s, onnx_s, diff))
+
+    print("\n" + "=" * 84)
+    print("⚡ TORCH vs ONNX RUNTIME")
+    print("=" * 84)
+    print(f"{'Model':7s} {'Batch':>6s} {'torch ms':>10s} {'ORT ms':>10s} {'torch img/s':>12s} "
+          f"{'ORT img/s':>10s} {'Speedup':>8s} {'max |dLogit|':>13s}")
+    print("-" * 84)
+    for name, batch_size, torch_s, onnx_s, diff in rows:
+        print(f"{name:7s} {batch_size:6d} {torch_s * 1000:10.1f} {onnx_s * 1000:10.1f} "
+              f"{batch_size / torch_s:12.1f} {batch_size / onnx_s:10.1f} {torch_s / onnx_s:7.2f}x {diff:13.2e}")
+    print("=" * 84 + "\n")
+
+
+if __name__ == "__main__":
+    main()
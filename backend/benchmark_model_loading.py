@@ -0,0 +1,124 @@
+"""
+Model Loading Benchmark
+Compares the server's original checkpoint path (build the module, torch.load the
+whole checkpoint, load_state_dict copy) with the local artifact path (meta-device
+build + mmap-backed weights) on a synthetic Linear/BatchNorm model. Each load runs
+in a fresh process so peak RSS is measured per strategy.
+
+Usage:
+    python benchmark_model_loading.py [--size-mb 400] [--repeats 3]
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+
+from shared.inference import build_module, read_artifact, write_artifact
+
+
+def make_model(size_mb):
+    """Stack of 1024x1024 Linear+BatchNorm blocks totalling roughly size_mb of fp32 weights"""
+    blocks = max(1, int(size_mb * 2**20 / (1024 * 1024 * 4)))
+    layers = []
+    for _ in range(blocks):
+        layers += [nn.Linear(1024, 1024), nn.BatchNorm1d(1024), nn.ReLU()]
+    return nn.Sequential(*layers, nn.Linear(1024, 1))
+
+
+def memory_status():
+    """(RssAnon, RssFile) in MB: private heap vs file-backed (shareable) pages"""
+    values = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(("RssAnon", "RssFile")):
+                key, amount, _ = line.split()
+                values[key.rstrip(":")] = int(amount) / 1024
+    return values.get("RssAnon", 0.0), values.get("RssFile", 0.0)
+
+
+def child(strategy, directory, size_mb):
+    """Load once with `strategy` and print timings/memory as JSON"""
+    torch.set_num_threads(1)
+    anon_before, _ = memory_status()
+    start = time.perf_counter()
+    if strategy == "checkpoint":
+        model = make_model(size_mb)
+        checkpoint = torch.load(Path(directory) / "checkpoint.bin", map_location="cpu")
+        model.load_state_dict(checkpoint, strict=False)
+        del checkpoint
+    else:
+        state_dict, config = read_artifact(directory)
+        model = build_module(lambda: make_model(config["size_mb"]), state_dict)
+    model.eval()
+    with torch.no_grad():
+        output = model(torch.ones(2, 1024)).sum().item()
+    seconds = time.perf_counter() - start
+    anon, file_backed = memory_status()
+    print(json.dumps({
+        "seconds": seconds,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "anon_mb": anon - anon_before,
+        "file_mb": file_backed,
+        "output": output,
+    }))
+
+
+def run_child(strategy, directory, size_mb):
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", strategy, "--dir", str(directory), "--size-mb", str(size_mb)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark checkpoint vs mmap artifact model loading")
+    parser.add_argument("--size-mb", type=float, default=400, help="Approximate weight size")
+    parser.add_argument("--repeats", type=int, default=3, help="Loads per strategy (best time reported)")
+    parser.add_argument("--child", choices=["checkpoint", "artifact"], help=argparse.SUPPRESS)
+    parser.add_argument("--dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.dir, args.size_mb)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        torch.manual_seed(0)
+        model = make_model(args.size_mb)
+        torch.save(model.state_dict(), Path(tmp) / "checkpoint.bin")
+        write_artifact(Path(tmp) / "artifact", model.state_dict(), {"size_mb": args.size_mb})
+        del model
+
+        print("\n" + "=" * 78)
+        print("📦 MODEL LOADING BENCHMARK")
+        print(f"   Synthetic model: ~{args.size_mb:.0f} MB fp32 weights, best of {args.repeats} fresh processes")
+        print("=" * 78)
+        print(f"{'Strategy':32s} {'Load (s)':>9s} {'Peak RSS':>10s} {'Private':>9s} {'Shareable':>10s}")
+        print("-" * 78)
+        outputs = []
+        for label, strategy, directory in (
+            ("torch.load + load_state_dict", "checkpoint", tmp),
+            ("mmap artifact + meta build", "artifact", Path(tmp) / "artifact"),
+        ):
+            runs = [run_child(strategy, directory, args.size_mb) for _ in range(args.repeats)]
+            best = min(runs, key=lambda run: run["seconds"])
+            outputs.append(best["output"])
+            print(f"{label:32s} {best['seconds']:9.2f} {best['peak_rss_mb']:8.0f}MB "
+                  f"{best['anon_mb']:7.0f}MB {best['file_mb']:8.0f}MB")
+        print("-" * 78)
+        print(f"Outputs identical: {'✅' if outputs[0] == outputs[1] else '❌'}")
+        print("Private = anonymous memory added by the load; Shareable = file-backed pages,")
+        print("which every worker mapping the same artifact shares through the page cache.")
+        print("=" * 78 + "\n")
+
+
+if __name__ == "__main__":
+    main()
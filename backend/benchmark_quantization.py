@@ -0,0 +1,202 @@
+"""
+INT8 Quantization Accuracy & Latency Harness
+Loads each detector in fp32 and in every requested INT8 mode and scores the same
+inputs with all of them:
+
+  image  - images in --data-dir plus backend/test_*.jpg (labels from "fake"/"real" in the name)
+  video  - evenly spaced frames of the videos in --data-dir
+  voice  - audio files in --data-dir (synthetic clips when there are none)
+  text   - the labelled claims of the existing accuracy scripts
+           (quick_accuracy_test.py, final_accuracy_test.py, test_text_accuracy.py)
+
+For each mode it reports latency, weight size, verdict agreement with fp32,
+mean |delta P(fake)| and labelled accuracy, and whether the mode passes the
+acceptance thresholds. Enable a passing mode with e.g.
+MODEL_QUANTIZATION={"text": "dynamic"}.
+
+Usage:
+    python benchmark_quantization.py [--models image video voice text] [--modes dynamic static]
+        [--data-dir test-data] [--repeats 3] [--min-agreement 0.95] [--max-accuracy-drop 0.02]
+"""
+import argparse
+import ast
+import copy
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+import sota_models
+from shared.inference.quantization import model_size_bytes
+
+BACKEND_DIR = Path(__file__).resolve().parent
+ACCURACY_SCRIPTS = ("quick_accuracy_test.py", "final_accuracy_test.py", "test_text_accuracy.py")
+AUDIO_SUFFIXES = (".wav", ".mp3", ".flac", ".ogg", ".m4a")
+
+
+def label_from_name(path):
+    name = path.stem.lower()
+    if "fake" in name:
+        return True
+    if "real" in name:
+        return False
+    return None
+
+
+def load_accuracy_claims():
+    """(claim, is_fake) pairs from the `tests` / `test_cases` lists of the accuracy scripts (parsed, not run)"""
+    claims = {}
+    for script in ACCURACY_SCRIPTS:
+        tree = ast.parse((BACKEND_DIR / script).read_text(encoding="utf-8"))
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(
+                isinstance(target, ast.Name) and target.id in ("tests", "test_cases") for target in node.targets
+            ):
+                for claim, expected in ast.literal_eval(node.value):
+                    claims[claim] = expected == "FAKE"
+    return list(claims.items())
+
+
+def image_items(detector, data_dir):
+    from PIL import Image
+    paths = sorted(
+        [p for p in Path(data_dir).glob("*") if p.suffix.lower() in sota_models.CALIBRATION_IMAGE_SUFFIXES]
+        + list(BACKEND_DIR.glob("test_*.jpg"))
+    )
+    return [(detector.preprocess(Image.open(p).convert("RGB")), label_from_name(p)) for p in paths]
+
+
+def video_items(detector, data_dir):
+    from PIL import Image
+    import cv2
+    items = []
+    for path in sorted(p for p in Path(data_dir).glob("*") if p.suffix.lower() in sota_models.CALIBRATION_VIDEO_SUFFIXES):
+        cap = cv2.VideoCapture(str(path))
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        for index in np.linspace(0, max(total - 1, 0), num=8, dtype=int):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(index))
+            ok, frame = cap.read()
+            if ok:
+                image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                items.append((detector.preprocess(image), label_from_name(path)))
+        cap.release()
+    return items
+
+
+def voice_items(detector, data_dir):
+    import librosa
+    clip = detector.input_size
+    paths = sorted(p for p in Path(data_dir).glob("*") if p.suffix.lower() in AUDIO_SUFFIXES)
+    items = []
+    for path in paths:
+        waveform, _ = librosa.load(str(path), sr=16000, mono=True)
+        items.append((np.pad(waveform, (0, max(0, clip - len(waveform))))[:clip], label_from_name(path)))
+    if not items:
+        print("   ⚠️  No audio in data dir - using synthetic clips (agreement only)")
+        rng = np.random.default_rng(0)
+        t = np.arange(clip) / 16000
+        for freq in (110, 220, 440, 880):
+            tone = 0.3 * np.sin(2 * np.pi * freq * t) + 0.02 * rng.standard_normal(clip)
+            items.append((tone.astype(np.float32), None))
+    return items
+
+
+def text_items(detector, data_dir):
+    return load_accuracy_claims()
+
+
+ITEMS = {"image": image_items, "video": video_items, "voice": voice_items, "text": text_items}
+
+
+def score(name, detector, inputs):
+    """P(fake) per input"""
+    if name in ("image", "video"):
+        return sota_models.predict_fake_probs(detector.model, inputs, chunk_size=8)
+    if name == "voice":
+        return [sota_models.predict_voice_fake_prob(detector, waveform) for waveform in inputs]
+    results = [detector.model(claim)[0] for claim in inputs]
+    return [r["score"] if "FAKE" in r["label"].upper() else 1.0 - r["score"] for r in results]
+
+
+def weights_module(name, detector):
+    return detector.model.model if name == "text" else detector.model
+
+
+def evaluate(name, detector, inputs, labels, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        probs = score(name, detector, inputs)
+        timings.append(time.perf_counter() - start)
+    labelled = [(p >= 0.5, label) for p, label in zip(probs, labels) if label is not None]
+    return {
+        "probs": probs,
+        "ms_per_item": statistics.median(timings) / max(1, len(inputs)) * 1000,
+        "size_mb": model_size_bytes(weights_module(name, detector)) / 2**20,
+        "accuracy": sum(pred == label for pred, label in labelled) / len(labelled) if labelled else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fp32 and INT8 detectors on accuracy and latency")
+    parser.add_argument("--models", nargs="+", default=["image", "video", "voice", "text"],
+                        choices=list(sota_models.LOADERS))
+    parser.add_argument("--modes", nargs="+", default=["dynamic", "static"], choices=["dynamic", "static"])
+    parser.add_argument("--data-dir", default=str(BACKEND_DIR / "test-data"))
+    parser.add_argument("--repeats", type=int, default=3, help="Timed passes over the inputs (median)")
+    parser.add_argument("--min-agreement", type=float, default=0.95, help="Min verdict agreement with fp32")
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.02, help="Max labelled accuracy loss")
+    args = parser.parse_args()
+
+    torch.set_num_threads(max(1, torch.get_num_threads()))
+    rows = []
+    for name in args.models:
+        print(f"\n📦 {name}: loading fp32 model...")
+        fp32 = sota_models.LOADERS[name]()
+        items = ITEMS[name](fp32, args.data_dir)
+        if not items:
+            print(f"   ⚠️  No inputs for {name} in {args.data_dir}, skipped")
+            continue
+        inputs, labels = [item for item, _ in items], [label for _, label in items]
+        baseline = evaluate(name, fp32, inputs, labels, args.repeats)
+        rows.append((name, "fp32", baseline, None, None, True))
+        for mode in args.modes:
+            variant = sota_models.quantize_detector(name, copy.deepcopy(fp32), mode)
+            result = evaluate(name, variant, inputs, labels, args.repeats)
+            agreement = float(np.mean([(a >= 0.5) == (b >= 0.5) for a, b in zip(baseline["probs"], result["probs"])]))
+            delta = float(np.mean(np.abs(np.array(baseline["probs"]) - np.array(result["probs"]))))
+            accuracy_ok = (
+                result["accuracy"] is None
+                or result["accuracy"] >= baseline["accuracy"] - args.max_accuracy_drop
+            )
+            accept = agreement >= args.min_agreement and accuracy_ok
+            rows.append((name, variant.quantization if variant.quantization == mode else f"{mode}->{variant.quantization}",
+                         result, agreement, delta, accept))
+        rows.append((name, None, {"n": len(inputs)}, None, None, None))
+        del fp32
+
+    print("\n" + "=" * 96)
+    print("🔢 INT8 QUANTIZATION: ACCURACY & LATENCY")
+    print("=" * 96)
+    print(f"{'Model':7s} {'Mode':18s} {'ms/item':>9s} {'Speedup':>8s} {'Size MB':>8s} "
+          f"{'Agree':>7s} {'|dP|':>7s} {'Accuracy':>9s} {'Accept':>7s}")
+    print("-" * 96)
+    baseline_ms = {}
+    for name, mode, result, agreement, delta, accept in rows:
+        if mode is None:
+            print(f"{'':7s} ({result['n']} inputs)")
+            continue
+        if mode == "fp32":
+            baseline_ms[name] = result["ms_per_item"]
+        accuracy = f"{result['accuracy']:.1%}" if result["accuracy"] is not None else "n/a"
+        print(f"{name:7s} {mode:18s} {result['ms_per_item']:9.2f} {baseline_ms[name] / result['ms_per_item']:7.2f}x "
+              f"{result['size_mb']:8.1f} {'-' if agreement is None else f'{agreement:.1%}':>7s} "
+              f"{'-' if delta is None else f'{delta:.4f}':>7s} {accuracy:>9s} "
+              f"{'' if mode == 'fp32' else ('✅' if accept else '❌'):>7s}")
+    print("=" * 96 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Source Scoring Matcher Benchmark
+Compares check_text's original per-pattern loop (lists rebuilt per request,
+one `pattern in text` scan per pattern) with the precompiled PatternMatcher,
+on synthetic Tavily-style sources.
+
+Usage:
+    python benchmark_text_matcher.py [--sources 5] [--requests 2000] [--length 500]
+"""
+import argparse
+import random
+import time
+
+from shared.text import AHOCORASICK_AVAILABLE, PatternMatcher
+from shared.text.indicators import DEBUNK_PATTERNS, SUPPORT_PATTERNS
+
+FILLER = (
+    "the claim spread widely on social media this week after a video was shared by several accounts "
+    "health officials said the report was reviewed by independent researchers and the agency"
+).split()
+
+
+def make_sources(count, length, seed=0):
+    """Lowercased title + content strings mixing indicator phrases and filler"""
+    rng = random.Random(seed)
+    phrases = DEBUNK_PATTERNS + SUPPORT_PATTERNS
+    sources = []
+    for _ in range(count):
+        words = []
+        while len(" ".join(words)) < length:
+            words.append(rng.choice(phrases) if rng.random() < 0.15 else rng.choice(FILLER))
+        sources.append(" ".join(words)[:length])
+    return sources
+
+
+def score_loop(sources):
+    """The original check_text scoring (lists rebuilt for every request)"""
+    debunk_patterns = list(DEBUNK_PATTERNS)
+    support_patterns = list(SUPPORT_PATTERNS)
+    results = []
+    for combined in sources:
+        debunk_score = sum(1 for pattern in debunk_patterns if pattern in combined)
+        support_score = sum(1 for pattern in support_patterns if pattern in combined)
+        results.append((debunk_score, support_score))
+    return results
+
+
+def make_score_matcher(matcher):
+    def score(sources):
+        results = []
+        for combined in sources:
+            indicator_hits = matcher.scores(combined)
+            results.append((indicator_hits["debunk"], indicator_hits["support"]))
+        return results
+    return score
+
+
+def time_scorer(scorer, sources, requests):
+    """Microseconds per check_text request (all sources scored once)"""
+    start = time.perf_counter()
+    for _ in range(requests):
+        scorer(sources)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark source indicator scoring")
+    parser.add_argument("--sources", type=int, default=5, help="Tavily sources per request")
+    parser.add_argument("--requests", type=int, default=2000, help="Simulated requests")
+    parser.add_argument("--length", type=int, default=500, help="Characters per source")
+    args = parser.parse_args()
+
+    sources = make_sources(args.sources, args.length)
+    scorers = [("Original loop", score_loop)]
+    for use_automaton in (True, False):
+        matcher = PatternMatcher({"debunk": DEBUNK_PATTERNS, "support": SUPPORT_PATTERNS}, use_automaton)
+        scorers.append((f"PatternMatcher ({matcher.backend})", make_score_matcher(matcher)))
+        if not AHOCORASICK_AVAILABLE:
+            break
+
+    print("\n" + "=" * 70)
+    print("🔤 SOURCE SCORING MATCHER BENCHMARK")
+    print(f"   {args.sources} sources x {args.length} chars, {args.requests} requests")
+    if not AHOCORASICK_AVAILABLE:
+        print("   ⚠️  pyahocorasick not installed - only the find() fallback is measured")
+    print("=" * 70)
+    print(f"{'Scorer':36s} {'us/request':>12s} {'Speedup':>8s} {'Match':>6s}")
+    print("-" * 70)
+
+    expected = score_loop(sources)
+    baseline = None
+    for name, scorer in scorers:
+        micros = time_scorer(scorer, sources, args.requests)
+        baseline = baseline or micros
+        match = "✅" if scorer(sources) == expected else "❌"
+        print(f"{name:36s} {micros:12.1f} {baseline / micros:7.2f}x {match:>6s}")
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
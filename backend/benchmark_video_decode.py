@@ -0,0 +1,85 @@
+"""
+Video Frame Sampling Benchmark
+Compares seek-per-frame decoding (cap.set + read) with the sequential
+grab()/retrieve() sampler used by the SOTA server.
+
+Usage:
+    python benchmark_video_decode.py [--frames 10] [--repeats 5] [--target-size 299] [videos...]
+"""
+import argparse
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from shared.media import read_frames_seek, read_frames_sequential, sample_frame_indices
+
+
+def time_sampler(path, sampler, frames, repeats, target_size):
+    """Return (median seconds, frames decoded) for one sampler on one file"""
+    timings = []
+    decoded = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        cap = cv2.VideoCapture(str(path))
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        indices = sample_frame_indices(total_frames, frames)
+        result = sampler(cap, indices, target_size=target_size)
+        cap.release()
+        timings.append(time.perf_counter() - start)
+        decoded = len(result)
+    return float(np.median(timings)), decoded
+
+
+def frames_match(path, frames):
+    """Both samplers must return identical pixels for the same indices"""
+    cap = cv2.VideoCapture(str(path))
+    indices = sample_frame_indices(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), frames)
+    seek = read_frames_seek(cap, indices)
+    cap.release()
+    cap = cv2.VideoCapture(str(path))
+    sequential = read_frames_sequential(cap, indices)
+    cap.release()
+    return seek.keys() == sequential.keys() and all(
+        np.array_equal(seek[idx], sequential[idx]) for idx in seek
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark video frame sampling strategies")
+    parser.add_argument("videos", nargs="*", help="Video files (default: test-data/*.mp4)")
+    parser.add_argument("--frames", type=int, default=10, help="Frames sampled per video")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per strategy")
+    parser.add_argument("--target-size", type=int, default=299, help="Decode-time downscale (0 = off)")
+    args = parser.parse_args()
+
+    videos = [Path(v) for v in args.videos] or sorted(Path(__file__).parent.joinpath("test-data").glob("*.mp4"))
+    if not videos:
+        print("⚠️  No videos found")
+        return
+
+    target_size = args.target_size or None
+
+    print("\n" + "=" * 78)
+    print("🎥 VIDEO FRAME SAMPLING BENCHMARK")
+    print(f"   {args.frames} frames/video, median of {args.repeats} runs, target size: {target_size or 'off'}")
+    print("=" * 78)
+    print(f"{'Video':32s} {'Seek (ms)':>10s} {'Seq (ms)':>10s} {'Seq+DS (ms)':>12s} {'Speedup':>8s} {'Match':>6s}")
+    print("-" * 78)
+
+    for path in videos:
+        seek_s, _ = time_sampler(path, read_frames_seek, args.frames, args.repeats, None)
+        seq_s, decoded = time_sampler(path, read_frames_sequential, args.frames, args.repeats, None)
+        seq_ds_s, _ = time_sampler(path, read_frames_sequential, args.frames, args.repeats, target_size)
+        match = "✅" if frames_match(path, args.frames) else "❌"
+        print(
+            f"{path.name[:32]:32s} {seek_s * 1000:10.1f} {seq_s * 1000:10.1f} "
+            f"{seq_ds_s * 1000:12.1f} {seek_s / max(seq_s, 1e-9):7.2f}x {match:>6s}"
+        )
+
+    print("=" * 78 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Preload-then-fork Server for the SOTA Inference API
+Loads (and optimizes) the MODEL_PRELOAD models once in a master process, then
+forks worker processes that serve ai_server_sota:app on one shared listening
+socket. The workers inherit the weights copy-on-write, so each extra worker
+costs roughly its own Python heap instead of another copy of every model.
+
+- gc is disabled in the master and everything it allocated is moved to the
+  permanent generation (gc.freeze) right before forking, so collections in
+  the workers never write to the shared pages.
+- The master loads with one intra-op thread and runs no forward passes
+  (warmup happens in each worker), so no OpenMP / ONNX Runtime thread pools
+  exist at fork time. Each worker restores ONNX_INTRA_OP_THREADS and
+  MODEL_WARMUP, and recreates the ONNX Runtime sessions of the preloaded
+  models with its own thread count (ORT fixes it when a session is created).
+- Each worker gets TORCH_INTRA_OP_THREADS threads per model worker, default
+  cores // (workers * INFERENCE_MODEL_WORKERS), so the workers together never
+  oversubscribe the cores.
+- A worker that dies is re-forked from the master (models still loaded).
+
+Models not in MODEL_PRELOAD still load lazily, separately in each worker
+(and are warmed up there when MODEL_WARMUP is on).
+Prometheus metrics are per worker.
+
+Usage:
+    python serve_prefork.py [--workers 4] [--host 0.0.0.0] [--port 8000] [--memory-report-seconds 30]
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+
+import uvicorn
+
+# Before torch is imported: no inductor compile worker pool in the master (MODEL_OPTIMIZATION=compile)
+os.environ.setdefault("TORCHINDUCTOR_COMPILE_THREADS", "1")
+
+from shared.config import settings
+from shared.inference.onnx_backend import OnnxModel
+
+
+def process_memory_mb(pid):
+    """RSS / PSS / private (USS) in MB from /proc/<pid>/smaps_rollup (empty where unavailable)"""
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    except OSError:
+        return {}
+    return {
+        "rss": fields.get("Rss", 0.0),
+        "pss": fields.get("Pss", 0.0),
+        "private": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+def bind_socket(host, port, backlog=2048):
+    """Listening socket shared by every worker (the kernel spreads accepts across them)"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def load_in_master():
+    """Import the server with its MODEL_PRELOAD models loaded: eagerly, single-threaded, without warmup"""
+    settings.model_background_loading = False
+    settings.model_warmup = False
+    settings.torch_intra_op_threads = 1
+    settings.onnx_intra_op_threads = 1  # ORT creates no thread pool for a single thread
+    import ai_server_sota
+    return ai_server_sota
+
+
+def rebuild_onnx_sessions(server, threads):
+    """Recreate the single-threaded ORT sessions inherited from the master with `threads` threads"""
+    for name, detector in server.model_registry.loaded().items():
+        model = getattr(detector, "model", None)
+        if isinstance(model, OnnxModel):
+            model.set_intra_op_threads(threads)
+            print(f"⚡ Worker {os.getpid()}: {name} ONNX session rebuilt with {threads} intra-op thread(s)")
+
+
+def run_worker(server, sock, threads, onnx_threads, warmup, host, port):
+    gc.enable()
+    # Undo load_in_master's overrides for everything the worker loads or warms up itself
+    settings.onnx_intra_op_threads = onnx_threads
+    settings.model_warmup = warmup
+    server.model_registry.warmup_enabled = warmup
+    server.inference_executor.intra_op_threads = threads
+    if "torch" in sys.modules:
+        server.inference_executor.configure_torch()
+    rebuild_onnx_sessions(server, onnx_threads or threads)
+    if warmup:
+        server.model_registry.warmup_loaded()
+    config = uvicorn.Config(server.app, host=host, port=port, log_level="info")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn_worker(server, sock, threads, onnx_threads, warmup, host, port):
+    pid = os.fork()
+    if pid:
+        return pid
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, signal.SIG_DFL)  # the master's handlers; uvicorn installs its own
+    code = 0
+    try:
+        print(f"👷 Worker {os.getpid()}: {threads} intra-op thread(s) per model worker")
+        run_worker(server, sock, threads, onnx_threads, warmup, host, port)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def report_memory(master_pid, pids):
+    print("\n" + "=" * 60)
+    print("📊 PREFORK MEMORY (MB)")
+    print("=" * 60)
+    print(f"{'Process':16s} {'RSS':>10s} {'PSS':>10s} {'Private':>10s}")
+    print("-" * 60)
+    for label, pid in [("master", master_pid)] + [(f"worker {pid}", pid) for pid in pids]:
+        memory = process_memory_mb(pid)
+        if memory:
+            print(f"{label:16s} {memory['rss']:10.0f} {memory['pss']:10.0f} {memory['private']:10.0f}")
+    print("=" * 60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve ai_server_sota from workers forked after preloading the models")
+    parser.add_argument("--workers", type=int, default=settings.prefork_workers,
+                        help="Worker processes (0 = half the cores)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("--memory-report-seconds", type=float, default=0,
+                        help="Print per-process memory this long after forking (0 = off)")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    workers = args.workers or max(1, cores // 2)
+    threads = settings.torch_intra_op_threads or max(1, cores // (workers * max(1, settings.inference_model_workers)))
+    onnx_threads = settings.onnx_intra_op_threads
+    warmup = settings.model_warmup
+
+    # Keep the master's heap compact and its objects out of later collections (see gc.freeze docs)
+    gc.disable()
+    sock = bind_socket(args.host, args.port)
+    print(f"\n🚀 Prefork master {os.getpid()}: loading models before forking {workers} workers...")
+    start = time.perf_counter()
+    server = load_in_master()
+    print(f"✅ Master ready in {time.perf_counter() - start:.1f}s; listening on {args.host}:{args.port}")
+    if threading.active_count() > 1:
+        names = ", ".join(t.name for t in threading.enumerate() if t is not threading.main_thread())
+        print(f"⚠️ Master has running threads at fork time ({names}); they do not exist in the workers")
+    gc.collect()
+    gc.freeze()
+
+    spawn = lambda: spawn_worker(server, sock, threads, onnx_threads, warmup, args.host, args.port)
+    pids = {spawn() for _ in range(workers)}
+
+    stopping = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stopping.set())
+    report_at = time.monotonic() + args.memory_report_seconds if args.memory_report_seconds else None
+    signalled = False
+    while pids:
+        if stopping.is_set() and not signalled:
+            print(f"🛑 Stopping {len(pids)} workers...")
+            for pid in pids:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            signalled = True
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid:
+            pids.discard(pid)
+            if not stopping.is_set():
+                print(f"⚠️ Worker {pid} exited (code {os.waitstatus_to_exitcode(status)}), re-forking")
+                time.sleep(1)  # don't spin if workers die on startup
+                pids.add(spawn())
+            continue
+        if report_at is not None and time.monotonic() >= report_at:
+            report_memory(os.getpid(), sorted(pids))
+            report_at = None
+        time.sleep(0.2)
+    sock.close()
+    print("👋 Prefork master exiting")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Caching utilities for VeriFy AI.
+"""
+from .claim_cache import ClaimCache, classify_claim, normalize_claim
+from .fake_redis import FakeRedis
+from .lru import LRUCache
+from .search_cache import SearchCache, normalize_query
+from .verdict_cache import VerdictCache, content_digest, create_redis_backend
+
+__all__ = [
+    "ClaimCache",
+    "FakeRedis",
+    "LRUCache",
+    "SearchCache",
+    "VerdictCache",
+    "classify_claim",
+    "content_digest",
+    "create_redis_backend",
+    "normalize_claim",
+    "normalize_query",
+]
@@ -0,0 +1,74 @@
+"""
+Verdict cache for text claims, keyed on normalized claim text.
+
+"Vaccines cause autism" and "vaccines  cause autism." normalize to the same key
+(Unicode compatibility folding, accent stripping, case folding, punctuation and
+whitespace collapsing), so trivially different submissions share one verdict.
+
+Each claim is put in a freshness class which decides its TTL: claims about
+current office holders and events go stale quickly, while settled science and
+well-known conspiracy theories can be cached for much longer.
+"""
+import hashlib
+import re
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+from .verdict_cache import VerdictCache
+
+# Claim-type keywords, shared with check_text's search query formulation
+CURRENT_EVENT_KEYWORDS = ('president', 'prime minister', 'pm', 'leader', 'current', 'elected')
+CONSPIRACY_KEYWORDS = ('vaccine', 'autism', 'flat', '5g', 'covid', 'hoax')
+
+# Freshness classes
+CLAIM_CLASS_CURRENT = "current"
+CLAIM_CLASS_STABLE = "stable"
+CLAIM_CLASS_GENERAL = "general"
+
+_PUNCTUATION = re.compile(r"[^\w\s]", re.UNICODE)
+_WHITESPACE = re.compile(r"\s+", re.UNICODE)
+
+
+def normalize_claim(text: str) -> str:
+    """Canonical form of a claim used as its cache key."""
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).casefold()
+    folded = _PUNCTUATION.sub(" ", folded)
+    return _WHITESPACE.sub(" ", folded).strip()
+
+
+def classify_claim(text: str) -> str:
+    """Freshness class of a claim (mirrors the branches in check_text's web search)."""
+    claim_lower = text.lower()
+    if any(word in claim_lower for word in CURRENT_EVENT_KEYWORDS):
+        return CLAIM_CLASS_CURRENT
+    if any(word in claim_lower for word in CONSPIRACY_KEYWORDS):
+        return CLAIM_CLASS_STABLE
+    return CLAIM_CLASS_GENERAL
+
+
+class ClaimCache:
+    """Normalized-claim verdict cache with per-class TTLs on top of ``VerdictCache``."""
+
+    KIND = "text"
+
+    def __init__(self, verdicts: VerdictCache, ttl_by_class: Dict[str, int]):
+        self.verdicts = verdicts
+        self.ttl_by_class = dict(ttl_by_class)
+
+    def _lookup_key(self, text: str) -> Tuple[str, str, Optional[int]]:
+        normalized = normalize_claim(text)
+        claim_class = classify_claim(normalized)
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return digest, claim_class, self.ttl_by_class.get(claim_class)
+
+    async def get(self, text: str) -> Optional[dict]:
+        digest, claim_class, ttl = self._lookup_key(text)
+        return await self.verdicts.get(self.KIND, digest, variant=claim_class, ttl_seconds=ttl)
+
+    async def set(self, text: str, verdict: dict) -> None:
+        digest, claim_class, ttl = self._lookup_key(text)
+        await self.verdicts.set(self.KIND, digest, verdict, variant=claim_class, ttl_seconds=ttl)
+
+    async def invalidate(self) -> int:
+        return await self.verdicts.invalidate(self.KIND)
@@ -0,0 +1,57 @@
+"""
+In-memory stand-in for the subset of ``redis.asyncio.Redis`` used by the caches.
+
+Lets the two-tier caches run (and be tested) without a Redis server.
+"""
+import fnmatch
+import time
+from typing import AsyncIterator, Dict, Optional, Tuple, Union
+
+
+class FakeRedis:
+    """Async, single-process imitation of get/set/delete/scan_iter with expiry."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Optional[float], bytes]] = {}
+
+    @staticmethod
+    def _encode(value: Union[str, bytes]) -> bytes:
+        return value.encode() if isinstance(value, str) else value
+
+    @staticmethod
+    def _key(key: Union[str, bytes]) -> str:
+        return key.decode() if isinstance(key, bytes) else key
+
+    def _live(self, key: str) -> Optional[bytes]:
+        key = self._key(key)
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key: Union[str, bytes]) -> Optional[bytes]:
+        return self._live(key)
+
+    async def set(self, key: Union[str, bytes], value: Union[str, bytes], ex: Optional[int] = None) -> bool:
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[self._key(key)] = (expires_at, self._encode(value))
+        return True
+
+    async def delete(self, *keys: Union[str, bytes]) -> int:
+        removed = 0
+        for key in keys:
+            if self._data.pop(self._key(key), None) is not None:
+                removed += 1
+        return removed
+
+    async def scan_iter(self, match: str = "*") -> AsyncIterator[bytes]:
+        for key in list(self._data):
+            if self._live(key) is not None and fnmatch.fnmatchcase(key, match):
+                yield key.encode()
+
+    async def close(self) -> None:
+        self._data.clear()
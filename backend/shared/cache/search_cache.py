@@ -0,0 +1,85 @@
+"""
+Web search result cache with in-flight request coalescing.
+
+The extension often fires the same fact-check from several tabs (or users) at
+once, and each one used to pay for its own Tavily round trip. Results are kept
+in a TTL + LRU map keyed on the formulated query and its search parameters, and
+concurrent misses for the same key share one outbound call (singleflight): the
+first caller starts the search as a task, later callers await that task.
+"""
+import asyncio
+import hashlib
+import json
+import re
+from typing import Any, Awaitable, Callable, Dict
+
+from shared.monitoring.metrics import CACHE_REQUESTS
+
+from .lru import LRUCache
+
+_WHITESPACE = re.compile(r"\s+", re.UNICODE)
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query."""
+    return _WHITESPACE.sub(" ", query).strip().casefold()
+
+
+class SearchCache:
+    """TTL + LRU cache for search results with singleflight on misses."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = 900,
+        max_entries: int = 2048,
+        namespace: str = "search",
+        kind: str = "tavily",
+    ):
+        self.namespace = namespace
+        self.kind = kind
+        self.local = LRUCache(max_entries=max_entries, default_ttl=ttl_seconds)
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def key(self, query: str, **params: Any) -> str:
+        spec = json.dumps([normalize_query(query), params], sort_keys=True, default=str)
+        return hashlib.sha256(spec.encode("utf-8")).hexdigest()
+
+    def _record(self, result: str) -> None:
+        CACHE_REQUESTS.labels(cache=self.namespace, kind=self.kind, tier="local", result=result).inc()
+
+    async def search(self, fetch: Callable[..., Awaitable[dict]], query: str, **params: Any) -> dict:
+        """
+        Cached ``await fetch(query=query, **params)``.
+
+        The returned dict is shared between callers and must be treated as
+        read-only. Failed searches are not cached; every caller waiting on the
+        failed call sees the exception.
+        """
+        key = self.key(query, **params)
+        cached = self.local.get(key)
+        if cached is not None:
+            self._record("hit")
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._record("coalesced")
+        else:
+            self._record("miss")
+            task = asyncio.ensure_future(fetch(query=query, **params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        # Shield so one caller disconnecting doesn't cancel the search for the others
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if result is not None:
+            self.local.set(key, result)
+
+    def clear(self) -> None:
+        self.local.clear()
@@ -0,0 +1,164 @@
+"""
+Two-tier verdict cache for media detection endpoints.
+
+Keys are ``<namespace>:<kind>:<model version>:<sha256 of upload>[:<variant>]``, so
+the same viral image or video is only run through the models (and Gemini) once
+per model version. Lookups hit a bounded in-process LRU first and fall back to
+Redis, which is shared across workers and replicas. Values are stored as compact
+JSON bytes in both tiers.
+
+Upgrading a model changes its version string and therefore its keys; on startup
+``sync_model_version`` also drops the entries written by the previous version so
+they don't linger in Redis until their TTL.
+"""
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from shared.monitoring.logging import logger
+from shared.monitoring.metrics import CACHE_INVALIDATIONS, CACHE_REQUESTS
+
+from .lru import LRUCache
+
+
+def content_digest(data: bytes) -> str:
+    """SHA-256 hex digest of an upload (same format as ``Detection.file_hash``)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def create_redis_backend(url: str, timeout_seconds: float = 0.25):
+    """Redis client for ``url``; ``memory://`` returns the in-process FakeRedis."""
+    if url.startswith("memory://"):
+        from .fake_redis import FakeRedis
+        return FakeRedis()
+    import redis.asyncio as redis
+    return redis.from_url(
+        url,
+        socket_connect_timeout=timeout_seconds,
+        socket_timeout=timeout_seconds,
+    )
+
+
+class VerdictCache:
+    """Content-hash keyed verdict cache: local LRU in front of an optional Redis tier."""
+
+    def __init__(
+        self,
+        model_versions: Dict[str, str],
+        redis: Any = None,
+        ttl_seconds: int = 3600,
+        max_entries: int = 10000,
+        namespace: str = "verdict",
+    ):
+        """
+        Args:
+            model_versions: Current model version per kind (``{"image": "..."}``).
+                Kept by reference, so the caller can retag a kind in place
+                (e.g. once a model has loaded and its configuration is known).
+            redis: ``redis.asyncio`` client (or FakeRedis); None disables the shared tier.
+            ttl_seconds: Expiry for entries in both tiers.
+            max_entries: Bound on the in-process tier.
+            namespace: Key prefix, also used as the metrics label.
+        """
+        self.model_versions = model_versions
+        self.redis = redis
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self.local = LRUCache(max_entries=max_entries, default_ttl=ttl_seconds)
+
+    def _prefix(self, kind: str) -> str:
+        return f"{self.namespace}:{kind}:"
+
+    def key(self, kind: str, digest: str, variant: str = "") -> str:
+        version = self.model_versions.get(kind, "0")
+        key = f"{self._prefix(kind)}{version}:{digest}"
+        return f"{key}:{variant}" if variant else key
+
+    def _record(self, kind: str, tier: str, result: str) -> None:
+        CACHE_REQUESTS.labels(cache=self.namespace, kind=kind, tier=tier, result=result).inc()
+
+    async def get(
+        self,
+        kind: str,
+        digest: str,
+        variant: str = "",
+        ttl_seconds: Optional[int] = None,
+    ) -> Optional[dict]:
+        """Cached verdict for this upload, or None (``ttl_seconds`` bounds local re-population)."""
+        key = self.key(kind, digest, variant)
+
+        payload = self.local.get(key)
+        if payload is not None:
+            self._record(kind, "local", "hit")
+            return json.loads(payload)
+        self._record(kind, "local", "miss")
+
+        if self.redis is None:
+            return None
+        try:
+            payload = await self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"Verdict cache: Redis get failed ({e})")
+            return None
+        if payload is None:
+            self._record(kind, "redis", "miss")
+            return None
+
+        self._record(kind, "redis", "hit")
+        self.local.set(key, payload, ttl=ttl_seconds or self.ttl_seconds)
+        return json.loads(payload)
+
+    async def set(
+        self,
+        kind: str,
+        digest: str,
+        verdict: dict,
+        variant: str = "",
+        ttl_seconds: Optional[int] = None,
+    ) -> None:
+        """Store a verdict in both tiers (``ttl_seconds`` overrides the default expiry)."""
+        key = self.key(kind, digest, variant)
+        ttl = ttl_seconds or self.ttl_seconds
+        payload = json.dumps(verdict, separators=(",", ":")).encode()
+        self.local.set(key, payload, ttl=ttl)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(key, payload, ex=ttl)
+        except Exception as e:
+            logger.warning(f"Verdict cache: Redis set failed ({e})")
+
+    async def invalidate(self, kind: str) -> int:
+        """Drop every cached verdict for ``kind`` (all model versions)."""
+        prefix = self._prefix(kind)
+        removed = self.local.delete_where(lambda key: key.startswith(prefix))
+        if self.redis is not None:
+            try:
+                keys = [key async for key in self.redis.scan_iter(match=f"{prefix}*")]
+                if keys:
+                    removed += await self.redis.delete(*keys)
+            except Exception as e:
+                logger.warning(f"Verdict cache: Redis invalidation failed ({e})")
+        CACHE_INVALIDATIONS.labels(cache=self.namespace, kind=kind).inc(removed)
+        return removed
+
+    async def sync_model_version(self, kind: str) -> bool:
+        """
+        Invalidate ``kind`` if Redis last saw a different model version.
+        Returns True when entries from an older model were dropped.
+        """
+        if self.redis is None:
+            return False
+        marker = f"{self.namespace}:model-version:{kind}"
+        current = self.model_versions.get(kind, "0")
+        try:
+            stored = await self.redis.get(marker)
+            if stored is not None and stored.decode() == current:
+                return False
+            if stored is not None:
+                await self.invalidate(kind)
+            await self.redis.set(marker, current)
+            return stored is not None
+        except Exception as e:
+            logger.warning(f"Verdict cache: model version sync failed ({e})")
+            return False
@@ -0,0 +1,16 @@
+"""
+Async clients for external services (Tavily, Gemini).
+"""
+from .base import AsyncServiceClient, ServiceError, ServiceTimeout
+from .gemini import GeminiClient, blob_part, file_part
+from .tavily import TavilySearchClient
+
+__all__ = [
+    "AsyncServiceClient",
+    "GeminiClient",
+    "ServiceError",
+    "ServiceTimeout",
+    "TavilySearchClient",
+    "blob_part",
+    "file_part",
+]
@@ -0,0 +1,104 @@
+"""
+Shared plumbing for async HTTP clients of external services.
+
+Every call gets a hard deadline (connect + send + wait + read), runs under a
+per-service concurrency limit and reuses a bounded keep-alive connection pool.
+Cancelling the awaiting task (client disconnect, pipeline short-circuit)
+aborts the request and frees its slot immediately.
+"""
+import asyncio
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+class ServiceError(Exception):
+    """An external service call failed (HTTP error, bad payload or transport error)."""
+
+    def __init__(self, service: str, message: str, status_code: Optional[int] = None):
+        super().__init__(f"{service}: {message}")
+        self.service = service
+        self.status_code = status_code
+
+
+class ServiceTimeout(ServiceError):
+    """An external service call exceeded its deadline."""
+
+
+class AsyncServiceClient:
+    """Async JSON-over-HTTP client with timeouts and bounded connections/concurrency."""
+
+    service = "service"
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout_seconds: float = 10.0,
+        max_connections: int = 20,
+        max_concurrency: int = 8,
+        headers: Optional[Dict[str, str]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            base_url: Service root URL.
+            timeout_seconds: Default end-to-end deadline per call.
+            max_connections: Size of the keep-alive connection pool.
+            max_concurrency: Max in-flight calls; further callers wait for a slot
+                (the wait counts against their deadline).
+            headers: Headers sent with every request (auth).
+            transport: Custom httpx transport, e.g. ``httpx.ASGITransport`` for
+                the offline stand-in server.
+        """
+        self.timeout_seconds = timeout_seconds
+        self.max_concurrency = max(1, max_concurrency)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=httpx.Timeout(timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+
+    async def post_json(self, path: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """POST ``payload`` and return the decoded JSON body within ``timeout`` seconds."""
+        response = await self.request("POST", path, timeout=timeout, json=payload)
+        return self.json_body(response)
+
+    async def request(self, method: str, path: str, timeout: Optional[float] = None, **kwargs: Any) -> httpx.Response:
+        """
+        Any HTTP call (``kwargs`` go to ``httpx.AsyncClient.request``) under the
+        same deadline, concurrency limit and error mapping; 4xx/5xx raise.
+        """
+        deadline = timeout or self.timeout_seconds
+        try:
+            return await asyncio.wait_for(self._request(method, path, **kwargs), deadline)
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            raise ServiceTimeout(self.service, f"no response within {deadline:.1f}s") from None
+        except httpx.HTTPError as e:
+            raise ServiceError(self.service, f"request failed ({e.__class__.__name__}: {e})") from e
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                response = await self._http.request(method, path, **kwargs)
+            finally:
+                self.in_flight -= 1
+        if response.status_code >= 400:
+            raise ServiceError(self.service, f"HTTP {response.status_code}: {response.text[:200]}", response.status_code)
+        return response
+
+    def json_body(self, response: httpx.Response) -> Dict[str, Any]:
+        try:
+            return response.json()
+        except ValueError:
+            raise ServiceError(self.service, "response is not JSON", response.status_code) from None
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
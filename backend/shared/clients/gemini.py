@@ -0,0 +1,151 @@
+"""
+Async Gemini client (``generateContent`` REST API, replaces ``google.generativeai``).
+
+Images, video frames and audio are sent inline as base64 parts, which avoids
+the separate file upload round trip of ``genai.upload_file``. Media above the
+inline limit goes through the File API instead (``media_part``), with the same
+async client, timeouts and concurrency limit.
+"""
+import asyncio
+import base64
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+from .base import AsyncServiceClient, ServiceError, ServiceTimeout
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com"
+
+# generateContent rejects requests above ~20 MB; leave room for base64 and the prompt
+MAX_INLINE_BYTES = 14 * 1024 * 1024
+
+Part = Union[str, Dict[str, Any]]
+
+
+def blob_part(data: bytes, mime_type: str) -> Dict[str, Any]:
+    """Inline media part for ``generate``."""
+    if len(data) > MAX_INLINE_BYTES:
+        raise ValueError(f"{len(data)} bytes is too large to send inline (max {MAX_INLINE_BYTES})")
+    return {"inline_data": {"mime_type": mime_type, "data": base64.b64encode(data).decode("ascii")}}
+
+
+def file_part(file: Dict[str, Any]) -> Dict[str, Any]:
+    """Part referring to a File API upload (the ``file`` resource from ``upload_file``)."""
+    return {"file_data": {"mime_type": file["mimeType"], "file_uri": file["uri"]}}
+
+
+class GeminiClient(AsyncServiceClient):
+    """Text + media generation against one Gemini model."""
+
+    service = "gemini"
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gemini-2.0-flash-exp",
+        base_url: str = GEMINI_BASE_URL,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        **limits: Any,
+    ):
+        super().__init__(
+            base_url,
+            headers={"x-goog-api-key": api_key},
+            transport=transport,
+            **limits,
+        )
+        self.model = model
+
+    async def generate(self, parts: Union[Part, List[Part]], timeout: Optional[float] = None) -> str:
+        """Generate a response for ``parts`` (strings and ``blob_part`` dicts); returns its text."""
+        if not isinstance(parts, list):
+            parts = [parts]
+        payload = {
+            "contents": [{
+                "role": "user",
+                "parts": [{"text": part} if isinstance(part, str) else part for part in parts],
+            }]
+        }
+        body = await self.post_json(f"/v1beta/models/{self.model}:generateContent", payload, timeout=timeout)
+        try:
+            content_parts = body["candidates"][0]["content"]["parts"]
+        except (KeyError, IndexError, TypeError):
+            reason = (body.get("promptFeedback") or {}).get("blockReason", "no candidates")
+            raise ServiceError(self.service, f"empty response ({reason})") from None
+        return "".join(part.get("text", "") for part in content_parts)
+
+    async def upload_file(
+        self,
+        data: bytes,
+        mime_type: str,
+        display_name: str = "upload",
+        timeout: Optional[float] = None,
+        poll_seconds: float = 0.5,
+    ) -> Dict[str, Any]:
+        """
+        Upload ``data`` with the File API's resumable protocol and wait until it
+        is ACTIVE (audio/video is processed server-side first). Returns the
+        ``file`` resource; Gemini deletes it after 48 hours, or ``delete_file``.
+
+        ``timeout`` bounds the whole upload, processing included. A file that
+        is still processing at the deadline (ServiceTimeout) or that failed to
+        process (ServiceError) is deleted before raising.
+        """
+        loop = asyncio.get_running_loop()
+        budget = timeout or self.timeout_seconds
+        deadline = loop.time() + budget
+        remaining = lambda: max(0.001, deadline - loop.time())
+        start = await self.request(
+            "POST", "/upload/v1beta/files", timeout=remaining(),
+            headers={
+                "X-Goog-Upload-Protocol": "resumable",
+                "X-Goog-Upload-Command": "start",
+                "X-Goog-Upload-Header-Content-Length": str(len(data)),
+                "X-Goog-Upload-Header-Content-Type": mime_type,
+            },
+            json={"file": {"display_name": display_name}},
+        )
+        upload_url = start.headers.get("x-goog-upload-url")
+        if not upload_url:
+            raise ServiceError(self.service, "file upload was not accepted (no upload URL)", start.status_code)
+        finished = await self.request(
+            "POST", upload_url, timeout=remaining(),
+            headers={"X-Goog-Upload-Command": "upload, finalize", "X-Goog-Upload-Offset": "0"},
+            content=data,
+        )
+        file = self.json_body(finished).get("file") or {}
+        try:
+            while file.get("state") == "PROCESSING":
+                if loop.time() + poll_seconds >= deadline:
+                    raise ServiceTimeout(self.service, f"uploaded file still processing after {budget:.1f}s")
+                await asyncio.sleep(poll_seconds)
+                file = self.json_body(await self.request("GET", f"/v1beta/{file['name']}", timeout=remaining()))
+            if file.get("state", "ACTIVE") != "ACTIVE" or "uri" not in file:
+                raise ServiceError(self.service, f"file upload failed (state {file.get('state')})")
+        except ServiceError:
+            if file.get("name"):
+                await self._delete_quietly(file)
+            raise
+        return file
+
+    async def _delete_quietly(self, file: Dict[str, Any]) -> None:
+        """Best-effort cleanup of an upload that won't be used."""
+        try:
+            await self.delete_file(file)
+        except ServiceError:
+            pass  # Gemini deletes it after 48 hours anyway
+
+    async def delete_file(self, file: Dict[str, Any]) -> None:
+        await self.request("DELETE", f"/v1beta/{file['name']}")
+
+    async def media_part(
+        self, data: bytes, mime_type: str, timeout: Optional[float] = None
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        ``(part, file)`` for ``generate``: inline up to ``MAX_INLINE_BYTES``
+        (``file`` is None), otherwise uploaded through the File API (``file`` is
+        the uploaded resource, for ``delete_file``).
+        """
+        if len(data) <= MAX_INLINE_BYTES:
+            return blob_part(data, mime_type), None
+        file = await self.upload_file(data, mime_type, timeout=timeout)
+        return file_part(file), file
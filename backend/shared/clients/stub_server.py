@@ -0,0 +1,109 @@
+"""
+Local stand-in for the Tavily and Gemini APIs.
+
+Serves canned responses on the same routes the clients call, so the pipeline
+can run (and be tested) offline. Use it in-process through
+``httpx.ASGITransport(app=create_stub_app())`` or as a real server:
+
+    python -m shared.clients.stub_server --port 8099
+    TAVILY_BASE_URL=http://localhost:8099 GEMINI_BASE_URL=http://localhost:8099 python ai_server_sota.py
+"""
+import argparse
+import asyncio
+import json
+import uuid
+from typing import Any, Dict
+
+from fastapi import FastAPI, HTTPException, Request, Response
+
+
+def create_stub_app(
+    delay_seconds: float = 0.0, verdict: Dict[str, Any] = None, file_state: str = "ACTIVE"
+) -> FastAPI:
+    """
+    Args:
+        delay_seconds: Artificial latency for every response (timeout tests).
+        verdict: JSON object the fake Gemini answers with.
+        file_state: State an uploaded file moves to on its first status check
+            (``"PROCESSING"``: it never finishes processing).
+    """
+    verdict = verdict or {"is_fake": True, "confidence": 0.9, "reasoning": "stub verdict"}
+    app = FastAPI(title="VeriFy AI external service stub")
+    app.state.requests = []
+    app.state.files = {}  # File API uploads by id
+
+    @app.post("/search")
+    async def search(request: Request):
+        body = await request.json()
+        app.state.requests.append(("tavily", body))
+        await asyncio.sleep(delay_seconds)
+        if not body.get("query"):
+            raise HTTPException(status_code=400, detail="query is required")
+        results = [
+            {
+                "title": f"Result {i + 1} for {body['query'][:40]}",
+                "url": f"https://example.org/{i + 1}",
+                "content": "Stub search result content.",
+                "score": round(0.9 - 0.1 * i, 2),
+            }
+            for i in range(min(int(body.get("max_results", 5)), 5))
+        ]
+        return {"query": body["query"], "answer": None, "results": results}
+
+    @app.post("/v1beta/models/{model}:generateContent")
+    async def generate_content(model: str, request: Request):
+        body = await request.json()
+        app.state.requests.append(("gemini", body))
+        await asyncio.sleep(delay_seconds)
+        text = "```json\n" + json.dumps(verdict) + "\n```"
+        return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+
+    @app.post("/upload/v1beta/files")
+    async def start_upload(request: Request):
+        body = await request.json()
+        if request.headers.get("x-goog-upload-command") != "start":
+            raise HTTPException(status_code=400, detail="expected a resumable upload start")
+        file_id = uuid.uuid4().hex[:12]
+        app.state.files[file_id] = {
+            "name": f"files/{file_id}",
+            "displayName": body.get("file", {}).get("display_name", ""),
+            "mimeType": request.headers["x-goog-upload-header-content-type"],
+            "sizeBytes": request.headers["x-goog-upload-header-content-length"],
+            "uri": f"{request.base_url}v1beta/files/{file_id}",
+            "state": "PROCESSING",  # becomes `file_state` on the first status check
+        }
+        return Response(headers={"x-goog-upload-url": f"{request.base_url}upload/v1beta/files/{file_id}:session"})
+
+    @app.post("/upload/v1beta/files/{file_id}:session")
+    async def finish_upload(file_id: str, request: Request):
+        file = app.state.files.get(file_id)
+        data = await request.body()
+        if file is None or len(data) != int(file["sizeBytes"]):
+            raise HTTPException(status_code=400, detail="unknown upload or size mismatch")
+        app.state.requests.append(("gemini-upload", {"file": file_id, "bytes": len(data)}))
+        return {"file": dict(file)}
+
+    @app.get("/v1beta/files/{file_id}")
+    async def get_file(file_id: str):
+        if file_id not in app.state.files:
+            raise HTTPException(status_code=404, detail="file not found")
+        app.state.files[file_id]["state"] = file_state
+        return app.state.files[file_id]
+
+    @app.delete("/v1beta/files/{file_id}")
+    async def delete_file(file_id: str):
+        if app.state.files.pop(file_id, None) is None:
+            raise HTTPException(status_code=404, detail="file not found")
+        return {}
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the Tavily/Gemini stand-in server")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--delay", type=float, default=0.0, help="Latency per response (seconds)")
+    args = parser.parse_args()
+    uvicorn.run(create_stub_app(args.delay), host="127.0.0.1", port=args.port)
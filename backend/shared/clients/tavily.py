@@ -0,0 +1,49 @@
+"""
+Async Tavily search client (REST API, replaces the blocking ``tavily-python`` SDK).
+"""
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .base import AsyncServiceClient
+
+TAVILY_BASE_URL = "https://api.tavily.com"
+
+
+class TavilySearchClient(AsyncServiceClient):
+    """``POST /search`` with the same arguments and response shape as ``TavilyClient.search``."""
+
+    service = "tavily"
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = TAVILY_BASE_URL,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        **limits: Any,
+    ):
+        super().__init__(
+            base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            transport=transport,
+            **limits,
+        )
+        self.api_key = api_key
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 5,
+        search_depth: str = "basic",
+        timeout: Optional[float] = None,
+        **params: Any,
+    ) -> Dict[str, Any]:
+        """Search the web; returns ``{"query", "answer", "results": [{title, url, content, score}]}``."""
+        payload = {
+            "api_key": self.api_key,  # older API versions read the key from the body
+            "query": query,
+            "max_results": max_results,
+            "search_depth": search_depth,
+            **params,
+        }
+        return await self.post_json("/search", payload, timeout=timeout)
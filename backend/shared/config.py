@@ -3,7 +3,7 @@ Shared configuration module for VeriFy AI backend services.
 Loads environment variables and provides typed configuration objects.
 """
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -63,6 +63,87 @@ class Settings(BaseSettings):
     model_video_url: str = "http://localhost:8004"
     model_voice_url: str = "http://localhost:8005"
 
+    # SOTA Inference Server (ai_server_sota)
+    image_batch_max_size: int = 16
+    image_batch_max_wait_ms: float = 10.0
+    video_sample_frames: int = 10
+    video_max_sample_frames: int = 64
+    video_batch_chunk_size: int = 8
+    video_decode_downscale: bool = True
+    gemini_frame_size: int = 768
+    # check_video also runs the voice detector on the audio track, concurrently with the frames
+    video_audio_analysis: bool = True
+    video_audio_min_speech_seconds: float = 1.0  # less speech than this (VOICE_VAD): audio not scored
+    ffmpeg_binary: str = "ffmpeg"  # decodes audio libsndfile can't (M4A/AAC); empty = librosa/audioread
+    # check_voice scores the whole clip as overlapping 4 s windows (False = first 4 s only)
+    voice_sliding_windows: bool = True
+    voice_window_overlap: float = 0.5  # fraction of a window shared with the next one
+    voice_window_batch_size: int = 8  # windows per forward pass
+    voice_max_windows: int = 32  # per request; longer clips get fewer, evenly spread windows
+    voice_aggregate_top_windows: int = 2  # clip score = mean of the N highest windows (0 = all)
+    # Energy / zero-crossing voice-activity detection: silent or noise-only windows skip the model
+    voice_vad: bool = True
+    voice_vad_energy_floor_db: float = -50.0  # frames quieter than this (dBFS) are never speech
+    voice_vad_min_speech_ratio: float = 0.1  # windows with less speech than this are skipped
+    # /stream-voice: live audio over WebSocket, windows of all streams batched together
+    voice_stream_max_connections: int = 64
+    voice_stream_batch_max_size: int = 16
+    voice_stream_batch_max_wait_ms: float = 20.0
+    inference_model_workers: int = 2
+    inference_io_workers: int = 16
+    torch_intra_op_threads: int = 0  # 0 = split cores across model workers
+    inference_concurrency: Dict[str, int] = {"image": 4, "video": 1, "voice": 2, "text": 4}
+    verdict_cache_enabled: bool = True
+    verdict_cache_use_redis: bool = False  # shared tier at redis_url ("memory://" for a local fake)
+    verdict_cache_max_entries: int = 10000
+    # Bump a version when its model is upgraded: cached verdicts from the old one are dropped
+    model_versions: Dict[str, str] = {
+        "image": "Arko007/deepfake-image-detector@1",
+        "video": "Arko007/deepfake-detector-dfd-sota@1",
+        "voice": "koyelog/deepfake-voice-detector-sota@1",
+        "text": "text-pipeline@1",
+    }
+    claim_cache_enabled: bool = True
+    claim_cache_max_entries: int = 50000
+    # TTL per claim freshness class: current events go stale fast, settled claims don't
+    claim_cache_ttl_seconds: Dict[str, int] = {"current": 900, "general": 21600, "stable": 604800}
+    search_cache_enabled: bool = True
+    search_cache_ttl_seconds: int = 900
+    search_cache_max_entries: int = 2048
+    tavily_base_url: str = "https://api.tavily.com"
+    tavily_timeout_seconds: float = 10.0
+    tavily_max_concurrency: int = 8
+    gemini_base_url: str = "https://generativelanguage.googleapis.com"
+    sota_gemini_model: str = "gemini-2.0-flash-exp"  # ai_server_sota's backup verifier (GEMINI_MODEL: other services)
+    gemini_timeout_seconds: float = 20.0
+    gemini_max_concurrency: int = 4
+    external_max_connections: int = 20  # keep-alive pool per external service
+    # check_text skips Gemini when the web-source verdict is at least this confident
+    text_web_decisive_confidence: float = 0.85
+    domain_reputation_file: str = ""  # empty = bundled shared/reputation/domains.json
+    model_preload: List[str] = ["image", "video"]  # loaded at startup; the rest on first use
+    model_warmup: bool = True  # dummy forward pass right after each load
+    model_memory_budget_mb: int = 0  # 0 = unlimited; otherwise evict idle models LRU
+    # Bind first, then load models in background threads; /api/v1/ready gates traffic
+    model_background_loading: bool = False
+    model_retry_after_seconds: int = 5  # Retry-After on 503s for models still loading
+    model_artifact_dir: str = ""  # prepare_model_artifacts.py output; empty = load from HuggingFace
+    model_artifact_verify: bool = False  # re-hash artifact files against the manifest on load
+    # Opt-in INT8 per model: "none" | "dynamic" | "static" (see benchmark_quantization.py)
+    model_quantization: Dict[str, str] = {}
+    model_quantization_calibration_dir: str = "test-data"  # images/videos for static calibration
+    # Per-model execution backend: "torch" (default) | "onnx" (image/video; falls back to torch)
+    model_backends: Dict[str, str] = {}
+    onnx_cache_dir: str = "onnx_models"  # exported graphs, keyed on model version
+    onnx_intra_op_threads: int = 0  # 0 = same as the torch intra-op thread budget
+    onnx_parity_tolerance: float = 1e-3  # max |logit| difference vs torch before falling back
+    # Per-model load-time graph optimization: "none" | "eager" (fold BN, strip dropout,
+    # channels_last) | "freeze" (+ torch.jit.freeze) | "compile" (+ torch.compile)
+    model_optimization: Dict[str, str] = {}
+    # serve_prefork.py: worker processes forked after the master preloads the models
+    # (0 = half the cores); TORCH_INTRA_OP_THREADS then applies per worker
+    prefork_workers: int = 0
+
     # Rate Limiting
     rate_limit_per_minute: int = 60
     rate_limit_per_hour: int = 1000
@@ -0,0 +1,18 @@
+"""
+Inference utilities for VeriFy AI model servers.
+"""
+from .artifacts import ArtifactError, build_module, read_artifact, verify_artifact, write_artifact
+from .batcher import MicroBatcher
+from .executor import InferenceExecutor
+from .registry import ModelRegistry
+
+__all__ = [
+    "ArtifactError",
+    "InferenceExecutor",
+    "MicroBatcher",
+    "ModelRegistry",
+    "build_module",
+    "read_artifact",
+    "verify_artifact",
+    "write_artifact",
+]
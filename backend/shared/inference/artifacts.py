@@ -0,0 +1,155 @@
+"""
+Local model artifacts with memory-mapped weight loading.
+
+``write_artifact`` bakes a constructed model into a directory:
+
+    <dir>/weights.pt      state_dict in torch's zip format (mmap-loadable)
+    <dir>/config.json     whatever the loader needs to rebuild the module
+    <dir>/manifest.json   sha256 + size of every file, written last
+
+``read_artifact`` opens the weights with ``torch.load(mmap=True,
+weights_only=True)``: tensors are views onto the page cache instead of
+private copies, so worker processes loading the same artifact share physical
+pages. ``build_module`` constructs the module on the meta device (no weight
+allocation at all) and adopts the mapped tensors with
+``load_state_dict(assign=True)``. Together they avoid the checkpoint-dict +
+module double allocation of ``torch.load`` followed by ``load_state_dict``.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+WEIGHTS_FILE = "weights.pt"
+CONFIG_FILE = "config.json"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+class ArtifactError(Exception):
+    """Artifact missing, incomplete or failing its checksum"""
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_artifact(
+    directory: Path,
+    state_dict: Optional[Dict[str, Any]],
+    config: Dict[str, Any],
+    source: Optional[Dict[str, Any]] = None,
+) -> dict:
+    """
+    Write weights, config and a checksum manifest for every file in ``directory``
+    (including extra files the caller saved there first, e.g. a feature extractor).
+
+    Args:
+        directory: Artifact directory (created if missing).
+        state_dict: Complete state_dict of the constructed module, or None when
+            the weights were saved in another format (e.g. a transformers directory).
+        config: JSON-serialisable constructor arguments / metadata.
+        source: Provenance recorded in the manifest (e.g. HF repo and filename).
+    """
+    import torch
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest_path = directory / MANIFEST_FILE
+    if manifest_path.exists():
+        manifest_path.unlink()  # an artifact without a manifest is treated as incomplete
+
+    if state_dict is not None:
+        tensors = {key: value.detach().contiguous().cpu() for key, value in state_dict.items()}
+        torch.save(tensors, directory / WEIGHTS_FILE)
+    with open(directory / CONFIG_FILE, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2, sort_keys=True)
+
+    files = {}
+    for path in sorted(directory.rglob("*")):
+        if path.is_file() and path.name != MANIFEST_FILE:
+            files[path.relative_to(directory).as_posix()] = {
+                "sha256": file_sha256(path),
+                "size": path.stat().st_size,
+            }
+    manifest = {
+        "manifest_version": MANIFEST_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "torch_version": torch.__version__,
+        "source": source or {},
+        "files": files,
+    }
+    tmp_path = manifest_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def verify_artifact(directory: Path, checksums: bool = False) -> dict:
+    """
+    Check the manifest against the files on disk and return it.
+
+    Sizes are always compared; ``checksums=True`` also re-hashes every file,
+    which reads the whole artifact (seconds for a GB-sized model).
+    """
+    directory = Path(directory)
+    manifest_path = directory / MANIFEST_FILE
+    if not manifest_path.exists():
+        raise ArtifactError(f"No manifest in {directory} (artifact missing or incomplete)")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    for name, expected in manifest["files"].items():
+        path = directory / name
+        if not path.exists():
+            raise ArtifactError(f"{path} listed in manifest but missing")
+        if path.stat().st_size != expected["size"]:
+            raise ArtifactError(f"{path} size differs from manifest")
+        if checksums and file_sha256(path) != expected["sha256"]:
+            raise ArtifactError(f"{path} checksum differs from manifest")
+    return manifest
+
+
+def read_artifact(directory: Path, verify_checksums: bool = False) -> Tuple[Dict[str, Any], dict]:
+    """(mmap-backed state_dict, config) of a verified artifact."""
+    import torch
+
+    directory = Path(directory)
+    verify_artifact(directory, checksums=verify_checksums)
+    state_dict = torch.load(directory / WEIGHTS_FILE, map_location="cpu", mmap=True, weights_only=True)
+    with open(directory / CONFIG_FILE, encoding="utf-8") as f:
+        config = json.load(f)
+    return state_dict, config
+
+
+def build_module(factory: Callable[[], Any], state_dict: Dict[str, Any]) -> Any:
+    """
+    Construct ``factory()`` without allocating weights and adopt ``state_dict``'s tensors.
+
+    The module is built on the meta device; ``load_state_dict(assign=True)``
+    then swaps in the (mmap-backed) tensors. If the module can't be built on
+    meta, or keeps tensors the state_dict doesn't cover (non-persistent
+    buffers), it is rebuilt on CPU and the tensors are assigned the same way.
+    """
+    import torch
+
+    try:
+        with torch.device("meta"):
+            module = factory()
+        module.load_state_dict(state_dict, strict=True, assign=True)
+        leftover = [
+            name for name, tensor in list(module.named_parameters()) + list(module.named_buffers())
+            if tensor.is_meta
+        ]
+        if leftover:
+            raise ArtifactError(f"Tensors not covered by the artifact: {leftover[:3]}")
+    except Exception:
+        module = factory()
+        module.load_state_dict(state_dict, strict=True, assign=True)
+    return module.eval()
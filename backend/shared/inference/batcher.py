@@ -0,0 +1,117 @@
+"""
+Request-coalescing micro-batcher for model inference.
+
+Concurrent callers ``await batcher.submit(item)``. A single worker task collects
+queued items until either ``max_batch_size`` items are waiting or the oldest item
+has waited ``max_wait_ms``, runs one batched call off the event loop and fans the
+results back out to the waiting callers. Given an ``InferenceExecutor``, the
+batched call goes through ``run_model`` so the modality's concurrency limit
+covers it like any other forward pass.
+"""
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+from shared.monitoring.metrics import INFERENCE_BATCH_SIZE, INFERENCE_QUEUE_WAIT
+
+from .executor import InferenceExecutor
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item requests into batched calls."""
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+        executor: Optional[Union[Executor, InferenceExecutor]] = None,
+    ):
+        """
+        Args:
+            name: Model name used as the metrics label.
+            batch_fn: Blocking function mapping a list of items to a list of
+                results of the same length and order.
+            max_batch_size: Upper bound on items per batched call.
+            max_wait_ms: Longest time the first item of a batch waits for company.
+            executor: Pool the batched call runs on (default: the loop's executor).
+                An ``InferenceExecutor`` runs it as ``run_model(name, ...)``,
+                under the per-modality limit for ``name``.
+        """
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result from the next batch."""
+        loop = asyncio.get_running_loop()
+        self._ensure_worker(loop)
+        future = loop.create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        return await future
+
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the collector task on first use (or after an event loop change)."""
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._dispatch(loop, batch)
+
+    async def _dispatch(self, loop: asyncio.AbstractEventLoop, batch: list) -> None:
+        # Callers that gave up (client disconnect, timeout) don't need a slot
+        batch = [entry for entry in batch if not entry[1].done()]
+        if not batch:
+            return
+
+        started = time.perf_counter()
+        for _, _, enqueued in batch:
+            INFERENCE_QUEUE_WAIT.labels(model=self.name).observe(started - enqueued)
+        INFERENCE_BATCH_SIZE.labels(model=self.name).observe(len(batch))
+
+        items = [item for item, _, _ in batch]
+        try:
+            if isinstance(self.executor, InferenceExecutor):
+                results = await self.executor.run_model(self.name, self.batch_fn, items)
+            else:
+                results = await loop.run_in_executor(self.executor, self.batch_fn, items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"{self.name} batch returned {len(results)} results for {len(items)} items"
+                )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
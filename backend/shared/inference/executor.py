@@ -0,0 +1,84 @@
+"""
+Dedicated executors that keep blocking inference work off the asyncio event loop.
+
+Two pools are kept apart so slow network calls can never starve the CPU-bound
+model work (and vice versa):
+
+- the *model* pool runs torch forward passes and media decoding. It is small and
+  torch's intra-op thread count is sized so that ``workers * threads`` roughly
+  matches the number of cores;
+- the *I/O* pool runs the remaining blocking helpers (upload hashing, sync SDK
+  calls) so they never occupy a model worker.
+
+Each modality additionally gets its own concurrency limit, so a burst of video
+uploads can't occupy every model worker while image checks queue behind them.
+"""
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class InferenceExecutor:
+    """Bounded thread pools for model and I/O work with per-modality limits."""
+
+    def __init__(
+        self,
+        model_workers: int = 2,
+        io_workers: int = 16,
+        intra_op_threads: int = 0,
+        modality_limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            model_workers: Threads running forward passes concurrently.
+            io_workers: Threads available for blocking SDK/network calls.
+            intra_op_threads: Torch intra-op threads; 0 splits the cores evenly
+                across ``model_workers``.
+            modality_limits: Max in-flight model calls per modality
+                (e.g. ``{"video": 1}``). Unlisted modalities are unbounded
+                beyond the pool size.
+        """
+        self.model_workers = max(1, model_workers)
+        self.intra_op_threads = intra_op_threads or max(1, (os.cpu_count() or 1) // self.model_workers)
+        self.modality_limits = dict(modality_limits or {})
+        self.model_pool: Executor = ThreadPoolExecutor(
+            max_workers=self.model_workers, thread_name_prefix="inference-model"
+        )
+        self.io_pool: Executor = ThreadPoolExecutor(
+            max_workers=max(1, io_workers), thread_name_prefix="inference-io"
+        )
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def configure_torch(self) -> None:
+        """Apply the intra-op thread budget to torch (process-wide)."""
+        import torch
+        torch.set_num_threads(self.intra_op_threads)
+
+    def _semaphore(self, modality: str) -> Optional[asyncio.Semaphore]:
+        limit = self.modality_limits.get(modality)
+        if not limit:
+            return None
+        if modality not in self._semaphores:
+            self._semaphores[modality] = asyncio.Semaphore(limit)
+        return self._semaphores[modality]
+
+    async def run_model(self, modality: str, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run CPU-bound model work for ``modality`` on the model pool."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        semaphore = self._semaphore(modality)
+        if semaphore is None:
+            return await loop.run_in_executor(self.model_pool, call)
+        async with semaphore:
+            return await loop.run_in_executor(self.model_pool, call)
+
+    async def run_io(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking network/SDK call on the I/O pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.io_pool, functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.model_pool.shutdown(wait=wait)
+        self.io_pool.shutdown(wait=wait)
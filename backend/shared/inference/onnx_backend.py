@@ -0,0 +1,144 @@
+"""
+ONNX Runtime CPU backend for image-style detectors.
+
+``export_onnx`` traces a torch model taking ``(batch, 3, size, size)`` pixels
+to an ONNX graph with a dynamic batch axis. ``OnnxModel`` wraps an ORT
+``InferenceSession`` behind the same call signature as the torch module
+(tensor in, logits tensor out), so the scoring code doesn't care which backend
+it runs on. ``onnx_or_torch`` exports (or reuses a cached export), checks the
+session's logits against torch on a probe batch and returns the torch model
+unchanged if anything along the way fails.
+
+``onnxruntime`` (and ``onnx`` for export) are optional dependencies.
+"""
+import inspect
+from pathlib import Path
+from typing import Any, Tuple
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ort = None
+    ONNXRUNTIME_AVAILABLE = False
+
+INPUT_NAME = "pixels"
+OUTPUT_NAME = "logits"
+DEFAULT_OPSET = 17
+
+
+def export_onnx(model: Any, path: Path, input_size: int, opset: int = DEFAULT_OPSET) -> Path:
+    """Export ``model`` (eval mode, fp32) to ``path`` with a dynamic batch dimension."""
+    import torch
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    example = torch.zeros(2, 3, input_size, input_size)
+    extra = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        extra["dynamo"] = False  # newer torch defaults to the dynamo exporter (needs onnxscript)
+    with torch.no_grad():
+        torch.onnx.export(
+            model.eval(),
+            example,
+            str(tmp_path),
+            input_names=[INPUT_NAME],
+            output_names=[OUTPUT_NAME],
+            dynamic_axes={INPUT_NAME: {0: "batch"}, OUTPUT_NAME: {0: "batch"}},
+            opset_version=opset,
+            do_constant_folding=True,
+            **extra,
+        )
+    tmp_path.replace(path)  # never leave a half-written graph under the cache name
+    return path
+
+
+class OnnxModel:
+    """ORT session with the call signature of the torch detector module."""
+
+    def __init__(self, path: Path, intra_op_threads: int = 0):
+        """
+        Args:
+            path: Exported ONNX graph.
+            intra_op_threads: ORT intra-op threads (0 = ORT default, all cores).
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            raise RuntimeError("onnxruntime is not installed")
+        self.path = Path(path)
+        self.set_intra_op_threads(intra_op_threads)
+        self.input_name = self.session.get_inputs()[0].name
+
+    def set_intra_op_threads(self, intra_op_threads: int) -> None:
+        """
+        (Re)create the session with this many intra-op threads, e.g. in a worker
+        forked from a process that loaded the model with a single thread (ORT
+        sizes its thread pool when the session is created).
+        """
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+            options.inter_op_num_threads = 1
+        self.intra_op_threads = intra_op_threads
+        self.session = ort.InferenceSession(str(self.path), options, providers=["CPUExecutionProvider"])
+
+    def __call__(self, batch: Any) -> Any:
+        import numpy as np
+        import torch
+
+        pixels = np.ascontiguousarray(batch.detach().cpu().numpy(), dtype=np.float32)
+        logits = self.session.run(None, {self.input_name: pixels})[0]
+        return torch.from_numpy(logits)
+
+    def eval(self) -> "OnnxModel":
+        return self
+
+
+def max_logit_difference(reference: Any, candidate: Any, batch: Any) -> float:
+    import torch
+
+    with torch.no_grad():
+        return (reference(batch) - candidate(batch)).abs().max().item()
+
+
+def onnx_or_torch(
+    model: Any,
+    path: Path,
+    input_size: int,
+    intra_op_threads: int = 0,
+    tolerance: float = 1e-3,
+) -> Tuple[Any, str]:
+    """
+    ``(OnnxModel, "onnx")`` if ``model`` can be exported/loaded and matches torch
+    within ``tolerance`` on a probe batch, else ``(model, "torch")``.
+    An existing export at ``path`` is reused.
+    """
+    import torch
+
+    if not ONNXRUNTIME_AVAILABLE:
+        print("⚠️ ONNX backend requested but onnxruntime is not installed, using torch")
+        return model, "torch"
+    path = Path(path)
+    probe = torch.rand(2, 3, input_size, input_size, generator=torch.Generator().manual_seed(0))
+    cached = path.exists()
+    while True:
+        try:
+            if not path.exists():
+                print(f"📤 Exporting ONNX graph to {path}...")
+                export_onnx(model, path, input_size)
+            session_model = OnnxModel(path, intra_op_threads=intra_op_threads)
+            difference = max_logit_difference(model, session_model, probe)
+            if difference > tolerance:
+                raise ValueError(f"logits differ from torch by {difference:.2e} (tolerance {tolerance:.0e})")
+            return session_model, "onnx"
+        except Exception as e:
+            if cached:
+                # A stale or corrupt cached export: re-export once from the live model
+                print(f"⚠️ Cached ONNX graph {path} rejected ({str(e)[:120]}), re-exporting")
+                path.unlink(missing_ok=True)
+                cached = False
+                continue
+            print(f"⚠️ ONNX backend unavailable ({type(e).__name__}: {str(e)[:120]}), using torch")
+            return model, "torch"
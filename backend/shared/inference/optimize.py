@@ -0,0 +1,237 @@
+"""
+Load-time graph optimizations for CPU inference.
+
+Levels, selectable per model:
+
+``eager``
+    Rewrites the module in place, keeping it an ordinary ``nn.Module`` with
+    the same module names:
+
+    * BatchNorm folding: a ``BatchNorm1d/2d/3d`` directly after a
+      ``Linear``/``Conv`` is folded into that layer's weights; one after an
+      activation (``Linear -> ReLU -> BN``) is folded into the next
+      ``Linear`` instead. Folded norms become ``nn.Identity``.
+    * Dropout stripping: every ``nn.Dropout*`` becomes ``nn.Identity``.
+    * channels_last (image models only): 4-D weights are converted and a
+      forward pre-hook converts the input batch, so convolutions run on the
+      NHWC kernels.
+
+    Only plain ``nn.Sequential`` neighbours are folded. Norms fused with an
+    activation (timm's ``BatchNormAct2d``) or wired by attribute inside a
+    backbone block are left alone; ``freeze`` folds those.
+
+``freeze``
+    ``eager`` + ``torch.jit.trace`` + ``torch.jit.freeze``: parameters are
+    inlined as constants, which folds the remaining conv/BN pairs and drops
+    dead code.
+
+``compile``
+    ``eager`` + ``torch.compile``. Compilation happens on the probe call made
+    here, not on the first request.
+
+``freeze`` and ``compile`` are checked against the eager model on a probe
+batch and dropped (keeping ``eager``) if they fail or disagree. The level
+actually applied is returned so callers can report it.
+"""
+from typing import Any, Optional, Tuple
+
+NONE = "none"
+EAGER = "eager"
+FREEZE = "freeze"
+COMPILE = "compile"
+LEVELS = (NONE, EAGER, FREEZE, COMPILE)
+
+
+def is_plain_batchnorm(module: Any) -> bool:
+    """Exact BatchNorm classes only: subclasses (e.g. BatchNormAct2d) apply more than the affine transform."""
+    import torch.nn as nn
+
+    return (
+        type(module) in (nn.BatchNorm1d, nn.BatchNorm2d, nn.BatchNorm3d)
+        and module.track_running_stats
+        and module.running_mean is not None
+    )
+
+
+def batchnorm_scale_shift(bn: Any) -> Tuple[Any, Any]:
+    """(scale, shift) such that bn(x) == x * scale + shift per channel, in eval mode."""
+    import torch
+
+    scale = torch.rsqrt(bn.running_var + bn.eps)
+    if bn.weight is not None:
+        scale = scale * bn.weight
+    shift = -bn.running_mean * scale
+    if bn.bias is not None:
+        shift = shift + bn.bias
+    return scale, shift
+
+
+def fold_into_previous(layer: Any, bn: Any) -> Optional[Any]:
+    """``layer`` with ``bn`` folded in, or None if they don't line up."""
+    import torch.nn as nn
+    from torch.nn.utils.fusion import fuse_conv_bn_eval, fuse_linear_bn_eval
+
+    if isinstance(layer, nn.Linear) and type(bn) is nn.BatchNorm1d and layer.out_features == bn.num_features:
+        return fuse_linear_bn_eval(layer, bn)
+    conv_norms = {nn.Conv1d: nn.BatchNorm1d, nn.Conv2d: nn.BatchNorm2d, nn.Conv3d: nn.BatchNorm3d}
+    if conv_norms.get(type(layer)) is type(bn) and layer.out_channels == bn.num_features:
+        return fuse_conv_bn_eval(layer, bn)
+    return None
+
+
+def fold_into_next(bn: Any, layer: Any) -> Optional[Any]:
+    """``layer`` (a Linear consuming ``bn``'s output) with ``bn`` folded in, or None."""
+    import copy
+
+    import torch
+    import torch.nn as nn
+
+    if not (isinstance(layer, nn.Linear) and type(bn) is nn.BatchNorm1d and layer.in_features == bn.num_features):
+        return None
+    scale, shift = batchnorm_scale_shift(bn)
+    fused = copy.deepcopy(layer)
+    with torch.no_grad():
+        bias = layer.weight @ shift + (layer.bias if layer.bias is not None else 0)
+        fused.weight.copy_(layer.weight * scale)
+        if fused.bias is None:
+            fused.bias = nn.Parameter(bias)
+        else:
+            fused.bias.copy_(bias)
+    return fused
+
+
+def fold_batchnorm(model: Any) -> int:
+    """Fold plain BatchNorms into neighbouring Linear/Conv layers of every ``nn.Sequential``; returns the count."""
+    import torch.nn as nn
+
+    folded = 0
+    for module in model.modules():
+        if not isinstance(module, nn.Sequential):
+            continue
+        names = list(module._modules)
+        for i, name in enumerate(names):
+            bn = module._modules[name]
+            if not is_plain_batchnorm(bn):
+                continue
+            # Directly after a Linear/Conv
+            if i > 0:
+                fused = fold_into_previous(module._modules[names[i - 1]], bn)
+                if fused is not None:
+                    module._modules[names[i - 1]] = fused
+                    module._modules[name] = nn.Identity()
+                    folded += 1
+                    continue
+            # After an activation: fold into the next Linear (skipping no-ops)
+            j = i + 1
+            while j < len(names) and isinstance(module._modules[names[j]], (nn.Identity, nn.Dropout)):
+                j += 1
+            if j < len(names):
+                fused = fold_into_next(bn, module._modules[names[j]])
+                if fused is not None:
+                    module._modules[names[j]] = fused
+                    module._modules[name] = nn.Identity()
+                    folded += 1
+    return folded
+
+
+def strip_dropout(model: Any) -> int:
+    """Replace every Dropout module with Identity; returns the count."""
+    import torch.nn as nn
+
+    dropout_types = (nn.Dropout, nn.Dropout1d, nn.Dropout2d, nn.Dropout3d, nn.AlphaDropout)
+    stripped = 0
+    for module in model.modules():
+        for name, child in module.named_children():
+            if isinstance(child, dropout_types):
+                setattr(module, name, nn.Identity())
+                stripped += 1
+    return stripped
+
+
+def _channels_last_input(module: Any, args: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    import torch
+
+    batch = args[0]
+    if batch.dim() == 4:
+        batch = batch.contiguous(memory_format=torch.channels_last)
+    return (batch,) + tuple(args[1:])
+
+
+def to_channels_last(model: Any) -> Any:
+    """Convert 4-D weights to channels_last and convert (N, C, H, W) inputs on the way in."""
+    import torch
+
+    model.to(memory_format=torch.channels_last)
+    model.register_forward_pre_hook(_channels_last_input)
+    return model
+
+
+def optimize_eager(model: Any, channels_last: bool = False) -> Any:
+    """Apply the ``eager`` passes to ``model`` in place (eval mode)."""
+    model.eval()
+    fold_batchnorm(model)
+    strip_dropout(model)
+    if channels_last:
+        to_channels_last(model)
+    return model
+
+
+def max_output_difference(reference: Any, candidate: Any, example: Any) -> float:
+    import torch
+
+    with torch.no_grad():
+        return (reference(example) - candidate(example)).abs().max().item()
+
+
+def freeze_model(model: Any, example: Any) -> Any:
+    """Trace ``model`` on ``example`` and freeze the result."""
+    import torch
+
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example, check_trace=False)
+    return torch.jit.freeze(traced.eval())
+
+
+def compile_model(model: Any, example: Any) -> Any:
+    """``torch.compile`` ``model`` and compile it now on ``example``."""
+    import torch
+
+    compiled = torch.compile(model)
+    with torch.inference_mode():  # the grad mode requests run under, so no recompile
+        compiled(example)
+    return compiled
+
+
+def optimize_model(
+    model: Any,
+    level: str,
+    example: Optional[Any] = None,
+    channels_last: bool = False,
+    tolerance: float = 1e-3,
+) -> Tuple[Any, str]:
+    """
+    Optimize ``model`` at ``level`` and return ``(model, level actually applied)``.
+
+    ``example`` is a representative input batch (batch size > 1, so the trace
+    doesn't specialize on a singleton batch), required for ``freeze`` and
+    ``compile``; without one, or when they fail or differ from the eager
+    model by more than ``tolerance``, the eager model is returned.
+    """
+    if level not in LEVELS:
+        raise ValueError(f"Unknown optimization level '{level}' (expected one of {LEVELS})")
+    if level == NONE:
+        return model, NONE
+    model = optimize_eager(model, channels_last=channels_last)
+    if level == EAGER:
+        return model, EAGER
+    try:
+        if example is None:
+            raise ValueError("no example input")
+        optimized = freeze_model(model, example) if level == FREEZE else compile_model(model, example)
+        difference = max_output_difference(model, optimized, example)
+        if difference > tolerance:
+            raise ValueError(f"outputs differ from eager by {difference:.2e} (tolerance {tolerance:.0e})")
+        return optimized, level
+    except Exception as e:
+        print(f"⚠️ {level} not possible ({type(e).__name__}: {str(e)[:120]}), using eager optimizations")
+        return model, EAGER
@@ -0,0 +1,109 @@
+"""
+INT8 quantization for CPU inference.
+
+Two modes, selectable per model:
+
+``dynamic``
+    ``torch.ao.quantization.quantize_dynamic``: Linear/GRU/LSTM weights are
+    stored as int8 and activations are quantized on the fly per batch. No
+    calibration needed. Works on any module tree, including transformers
+    models (RoBERTa, Wav2Vec2) and the Linear-heavy classifier heads.
+
+``static``
+    FX graph mode post-training quantization: observers are inserted, the
+    model is calibrated on representative inputs, then convs/linears run as
+    int8 kernels end to end. Only possible when the model is FX-traceable
+    (plain CNNs are; HF transformer models usually aren't). On any failure the
+    model is quantized dynamically instead, and the mode actually applied is
+    returned so callers can report it.
+"""
+import copy
+import platform
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+NONE = "none"
+DYNAMIC = "dynamic"
+STATIC = "static"
+MODES = (NONE, DYNAMIC, STATIC)
+
+
+def select_engine() -> str:
+    """Pick the quantized kernel backend for this CPU (x86/fbgemm on Intel/AMD, qnnpack on ARM)."""
+    import torch
+
+    engines = torch.backends.quantized.supported_engines
+    preferred = ("qnnpack",) if platform.machine().lower() in ("arm64", "aarch64") else ("x86", "fbgemm")
+    for engine in preferred + ("qnnpack", "fbgemm"):
+        if engine in engines:
+            torch.backends.quantized.engine = engine
+            return engine
+    raise RuntimeError("No quantized engine available in this torch build")
+
+
+def quantize_dynamic_int8(model: Any, layer_types: Optional[Iterable[type]] = None) -> Any:
+    """Copy of ``model`` with Linear (and recurrent) layers dynamically quantized to int8."""
+    import torch
+    import torch.nn as nn
+    from torch.ao.quantization import quantize_dynamic
+
+    select_engine()
+    layer_types = set(layer_types or (nn.Linear, nn.GRU, nn.LSTM))
+    return quantize_dynamic(model.eval(), layer_types, dtype=torch.qint8, inplace=False)
+
+
+def quantize_static_int8(model: Any, calibration_batches: Sequence[Any]) -> Any:
+    """
+    FX graph mode static int8 quantization of ``model``, calibrated on ``calibration_batches``.
+
+    Raises if the model can't be traced or converted; see ``quantize_model``
+    for the fallback to dynamic quantization.
+    """
+    import torch
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+    if not calibration_batches:
+        raise ValueError("Static quantization needs at least one calibration batch")
+    engine = select_engine()
+    qconfig_mapping = get_default_qconfig_mapping(engine)
+    example_inputs = (calibration_batches[0],)
+    prepared = prepare_fx(copy.deepcopy(model).eval(), qconfig_mapping, example_inputs)
+    with torch.no_grad():
+        for batch in calibration_batches:
+            prepared(batch)
+    return convert_fx(prepared)
+
+
+def quantize_model(
+    model: Any,
+    mode: str,
+    calibration_batches: Optional[Sequence[Any]] = None,
+    layer_types: Optional[Iterable[type]] = None,
+) -> Tuple[Any, str]:
+    """
+    Quantize ``model`` in ``mode`` and return ``(model, mode actually applied)``.
+
+    ``static`` falls back to ``dynamic`` when the model can't be traced or no
+    calibration data is available.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown quantization mode '{mode}' (expected one of {MODES})")
+    if mode == NONE:
+        return model, NONE
+    if mode == STATIC:
+        try:
+            return quantize_static_int8(model, calibration_batches or []), STATIC
+        except Exception as e:
+            print(f"⚠️ Static quantization not possible ({type(e).__name__}: {str(e)[:120]}), using dynamic")
+    return quantize_dynamic_int8(model, layer_types), DYNAMIC
+
+
+def model_size_bytes(model: Any) -> int:
+    """Serialized size of ``model``'s state_dict (int8 packed weights included)."""
+    import io
+
+    import torch
+
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
@@ -0,0 +1,294 @@
+"""
+Memory-budgeted registry of loaded models.
+
+Every detector is registered with a loader (and optionally a warmup function)
+and fetched by name. The first ``get`` loads it; concurrent first callers wait
+on the same per-model lock, so a model is never loaded twice. After loading,
+the warmup runs one forward pass on a dummy input so the first real request
+doesn't pay for lazy kernel/allocator initialisation.
+
+``load_in_background`` starts a load without blocking the caller, so a server
+can accept traffic (and answer readiness probes) while its models load.
+
+Each load is charged the growth in process RSS it caused. With a memory budget
+set, loading a model that pushes the total over budget unloads the least
+recently used models that are idle (not inside ``use()``) until it fits.
+"""
+import ctypes
+import ctypes.util
+import gc
+import os
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from shared.monitoring.metrics import MODEL_EVICTIONS, MODEL_LOADS, MODEL_RESIDENT_BYTES
+
+UNLOADED = "unloaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_rss_bytes() -> int:
+    """Current resident set size of this process (0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def module_bytes(obj: Any) -> int:
+    """Parameter + buffer bytes of any torch modules held by ``obj`` (a model or a bundle)."""
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return 0  # nothing can hold a torch module; don't pay for importing torch here
+    nn = torch.nn
+    if isinstance(obj, nn.Module):
+        modules = [obj]
+    else:
+        modules = [value for value in getattr(obj, "__dict__", {}).values() if isinstance(value, nn.Module)]
+    total = 0
+    for module in modules:
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def _release_memory() -> None:
+    """Collect garbage and hand freed heap pages back to the OS (glibc only)."""
+    gc.collect()
+    libc_name = ctypes.util.find_library("c")
+    if not libc_name:
+        return
+    try:
+        ctypes.CDLL(libc_name).malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class _Entry:
+    def __init__(self, name: str, loader: Callable[[], Any], warmup: Optional[Callable[[Any], None]], pinned: bool):
+        self.name = name
+        self.loader = loader
+        self.warmup = warmup
+        self.pinned = pinned
+        self.lock = threading.Lock()
+        self.value: Any = None
+        self.state = UNLOADED
+        self.error: Optional[str] = None
+        self.memory_bytes = 0
+        self.load_seconds = 0.0
+        self.warmup_seconds = 0.0
+        self.last_used = 0.0
+        self.in_use = 0
+        self.loads = 0
+
+
+class ModelRegistry:
+    """Named models with single-flight lazy loading, warmup and LRU eviction."""
+
+    def __init__(self, memory_budget_mb: int = 0, warmup: bool = True):
+        """
+        Args:
+            memory_budget_mb: Total resident memory the loaded models may use;
+                0 disables eviction.
+            warmup: Run each model's warmup function after loading.
+        """
+        self.memory_budget_bytes = max(0, memory_budget_mb) * 1024 * 1024
+        self.warmup_enabled = warmup
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        warmup: Optional[Callable[[Any], None]] = None,
+        pinned: bool = False,
+    ) -> None:
+        """
+        Args:
+            name: Key the model is fetched by (e.g. ``"image"``).
+            loader: Blocking function returning the loaded model (or bundle).
+            warmup: Blocking function given the loaded value; runs a dummy forward pass.
+            pinned: Never evict this model to make room for others.
+        """
+        self._entries[name] = _Entry(name, loader, warmup, pinned)
+
+    def _entry(self, name: str) -> _Entry:
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise KeyError(f"Model '{name}' is not registered") from None
+
+    def get(self, name: str) -> Any:
+        """The loaded model, loading it on first use (blocks while loading)."""
+        entry = self._entry(name)
+        value = entry.value
+        if entry.state != READY or value is None:
+            value = self._load(entry)
+        entry.last_used = time.monotonic()
+        return value
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[Any]:
+        """``get`` that also shields the model from eviction until the block exits."""
+        entry = self._entry(name)
+        with self._lock:
+            entry.in_use += 1
+        try:
+            yield self.get(name)
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+
+    def _load(self, entry: _Entry) -> Any:
+        with entry.lock:
+            if entry.state == READY:
+                return entry.value
+            entry.state = LOADING
+            entry.error = None
+            rss_before = process_rss_bytes()
+            start = time.perf_counter()
+            try:
+                value = entry.loader()
+                loaded = time.perf_counter()
+                if self.warmup_enabled and entry.warmup is not None:
+                    entry.warmup(value)
+            except Exception as e:
+                entry.state = FAILED
+                entry.error = str(e)
+                MODEL_LOADS.labels(model=entry.name, result="failed").inc()
+                print(f"❌ Model registry: {entry.name} failed to load - {e}")
+                print(f"   Traceback: {traceback.format_exc()}")
+                raise
+            finished = time.perf_counter()
+            rss_delta = process_rss_bytes() - rss_before
+            # RSS growth includes warmup workspaces; concurrent loads blur it, so
+            # never charge less than the weights themselves
+            entry.memory_bytes = max(rss_delta, module_bytes(value))
+            entry.load_seconds = loaded - start
+            entry.warmup_seconds = finished - loaded
+            entry.value = value
+            entry.loads += 1
+            entry.last_used = time.monotonic()
+            entry.state = READY
+            MODEL_LOADS.labels(model=entry.name, result="loaded").inc()
+            MODEL_RESIDENT_BYTES.labels(model=entry.name).set(entry.memory_bytes)
+            print(
+                f"✅ Model registry: {entry.name} ready in {entry.load_seconds:.1f}s "
+                f"(+{entry.warmup_seconds:.2f}s warmup, {entry.memory_bytes / 2**20:.0f} MB)"
+            )
+        self._enforce_budget(keep=entry.name)
+        return value
+
+    def load_in_background(self, name: str) -> bool:
+        """Start loading ``name`` on a daemon thread unless it is ready or already loading."""
+        entry = self._entry(name)
+        with self._lock:
+            if entry.state in (READY, LOADING):
+                return False
+            entry.state = LOADING
+        threading.Thread(target=self._load_quietly, args=(entry,), name=f"model-load-{name}", daemon=True).start()
+        return True
+
+    def _load_quietly(self, entry: _Entry) -> None:
+        try:
+            self._load(entry)
+        except Exception:
+            pass  # state/error are recorded on the entry and already logged
+
+    def warmup_loaded(self) -> None:
+        """Run the warmup of every loaded model, e.g. in workers forked from a process that preloaded without it."""
+        for entry in self._entries.values():
+            if entry.state != READY or entry.warmup is None:
+                continue
+            with entry.lock:
+                start = time.perf_counter()
+                try:
+                    entry.warmup(entry.value)
+                except Exception as e:
+                    print(f"⚠️ Model registry: {entry.name} warmup failed - {e}")
+                entry.warmup_seconds = time.perf_counter() - start
+
+    def unload(self, name: str) -> bool:
+        """Drop a loaded, idle model. Returns False if it is loading, in use or not loaded."""
+        entry = self._entry(name)
+        if not entry.lock.acquire(blocking=False):
+            return False
+        try:
+            with self._lock:
+                if entry.state != READY or entry.in_use:
+                    return False
+                entry.state = UNLOADED
+                entry.value = None
+            entry.memory_bytes = 0
+            MODEL_RESIDENT_BYTES.labels(model=name).set(0)
+        finally:
+            entry.lock.release()
+        _release_memory()
+        return True
+
+    def resident_bytes(self) -> int:
+        return sum(entry.memory_bytes for entry in self._entries.values() if entry.state == READY)
+
+    def _enforce_budget(self, keep: str) -> List[str]:
+        """Unload idle models, least recently used first, until the budget is met."""
+        evicted: List[str] = []
+        if not self.memory_budget_bytes or self.resident_bytes() <= self.memory_budget_bytes:
+            return evicted
+        candidates = sorted(
+            (
+                entry for entry in self._entries.values()
+                if entry.state == READY and not entry.pinned and entry.name != keep
+            ),
+            key=lambda entry: entry.last_used,
+        )
+        for entry in candidates:
+            if self.resident_bytes() <= self.memory_budget_bytes:
+                break
+            if self.unload(entry.name):
+                evicted.append(entry.name)
+                MODEL_EVICTIONS.labels(model=entry.name).inc()
+                print(f"♻️ Model registry: evicted {entry.name} (least recently used) to stay within budget")
+        if self.resident_bytes() > self.memory_budget_bytes:
+            print(
+                f"⚠️ Model registry: {self.resident_bytes() / 2**20:.0f} MB resident exceeds the "
+                f"{self.memory_budget_bytes / 2**20:.0f} MB budget; remaining models are busy or pinned"
+            )
+        return evicted
+
+    def loaded(self) -> Dict[str, Any]:
+        """The values of the models that are currently loaded, by name."""
+        return {name: entry.value for name, entry in self._entries.items() if entry.state == READY}
+
+    def is_loaded(self, name: str) -> bool:
+        return self._entry(name).state == READY
+
+    def state(self, name: str) -> str:
+        return self._entry(name).state
+
+    def status(self) -> Dict[str, dict]:
+        """Per-model state, memory and timing (health/metrics payload)."""
+        now = time.monotonic()
+        return {
+            name: {
+                "state": entry.state,
+                "memory_mb": round(entry.memory_bytes / 2**20, 1),
+                "load_seconds": round(entry.load_seconds, 3),
+                "warmup_seconds": round(entry.warmup_seconds, 3),
+                "idle_seconds": round(now - entry.last_used, 1) if entry.state == READY else None,
+                "in_use": entry.in_use,
+                "loads": entry.loads,
+                "error": entry.error,
+            }
+            for name, entry in self._entries.items()
+        }
@@ -0,0 +1,56 @@
+"""
+Media decoding utilities for VeriFy AI model servers.
+"""
+from .audio import (
+    AudioDecodeError,
+    aggregate_window_scores,
+    audio_mime_type,
+    decode_audio,
+    demux_audio,
+    resample,
+    sliding_windows,
+    window_starts,
+)
+from .context import VideoContext, VideoMetadata, probe_video
+from .input import MediaInput
+from .stream import (
+    AudioRingBuffer,
+    FfmpegStreamDecoder,
+    PcmStreamDecoder,
+    RollingWindowScores,
+    StreamWindower,
+)
+from .vad import speech_frames, speech_windows, window_speech_ratios
+from .video import (
+    downscale_frame,
+    read_frames_seek,
+    read_frames_sequential,
+    sample_frame_indices,
+)
+
+__all__ = [
+    "MediaInput",
+    "VideoContext",
+    "VideoMetadata",
+    "probe_video",
+    "downscale_frame",
+    "read_frames_seek",
+    "read_frames_sequential",
+    "sample_frame_indices",
+    "AudioDecodeError",
+    "aggregate_window_scores",
+    "audio_mime_type",
+    "decode_audio",
+    "demux_audio",
+    "resample",
+    "sliding_windows",
+    "window_starts",
+    "speech_frames",
+    "speech_windows",
+    "window_speech_ratios",
+    "AudioRingBuffer",
+    "FfmpegStreamDecoder",
+    "PcmStreamDecoder",
+    "RollingWindowScores",
+    "StreamWindower",
+]
@@ -0,0 +1,237 @@
+"""
+Audio ingest and windowing for the voice detector.
+
+``decode_audio`` turns an upload into mono float32 at the model rate without
+touching disk where it can: soundfile (libsndfile) decodes WAV/FLAC/OGG (and
+MP3 on libsndfile >= 1.1) straight from the upload buffer, and everything else
+(M4A/AAC, MP3 on older libsndfile) is decoded by an ``ffmpeg`` subprocess whose
+float32 PCM output is read from a pipe. 16-bit PCM is converted and downmixed
+in numpy, which is much cheaper than libsndfile's float conversion followed by
+``mean(axis=1)``. Resampling uses libsoxr when available and otherwise
+``scipy.signal.resample_poly`` with the anti-aliasing filter designed once per
+(source rate, target rate) pair and cached.
+
+``demux_audio`` pulls the audio track out of a video upload the same way, so
+check_video can run the voice detector on it alongside the frame detector.
+
+The voice model scores fixed-length clips (4 s at 16 kHz). ``sliding_windows``
+cuts a whole recording into overlapping windows of that length, so a cloned
+voice spliced in anywhere in the clip lands in at least one window. The last
+window is aligned with the end of the clip so the tail is never dropped, and
+with a window budget the windows are spread evenly over the whole clip
+instead of covering only its beginning.
+"""
+import math
+import subprocess
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .input import MediaInput
+
+# Containers whose index may sit at the end of the file: ffmpeg must be able to seek
+SEEKABLE_CONTAINERS = (".m4a", ".mp4", ".mov", ".3gp")
+
+
+class AudioDecodeError(RuntimeError):
+    """The upload could not be decoded as audio."""
+
+
+def audio_mime_type(data: bytes, default: str = "audio/wav") -> str:
+    """
+    MIME type of an audio upload from its container signature (the client's
+    Content-Type is often missing or ``application/octet-stream``).
+    """
+    head = data[:12]
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "audio/wav"
+    if head[:4] == b"fLaC":
+        return "audio/flac"
+    if head[:4] == b"OggS":
+        return "audio/ogg"
+    if head[:4] == b"FORM" and head[8:12] in (b"AIFF", b"AIFC"):
+        return "audio/aiff"
+    if head[4:8] == b"ftyp":
+        return "audio/mp4"  # M4A / AAC in MP4
+    if head[:4] == b"\x1aE\xdf\xa3":
+        return "audio/webm"
+    if head[:3] == b"ID3":
+        return "audio/mp3"
+    if len(head) > 1 and head[0] == 0xFF:
+        if head[1] & 0xF6 == 0xF0:
+            return "audio/aac"  # ADTS frame sync, layer 0
+        if head[1] & 0xE0 == 0xE0:
+            return "audio/mp3"  # MPEG audio frame sync
+    return default
+
+
+@lru_cache(maxsize=32)
+def resample_filter(up: int, down: int) -> np.ndarray:
+    """
+    The low-pass FIR ``resample_poly`` would design for ``up/down`` (Kaiser,
+    beta 5), built once per ratio. Read-only: ``resample_poly`` copies it.
+    """
+    from scipy.signal import firwin
+
+    max_rate = max(up, down)
+    taps = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+    taps.setflags(write=False)
+    return taps
+
+
+def resample(waveform: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """
+    Resample a 1-D signal: libsoxr's HQ polyphase resampler when installed (the
+    one librosa uses, ~2x faster than scipy here), otherwise
+    ``scipy.signal.resample_poly`` with the cached filter for this rate pair.
+    """
+    if orig_sr == target_sr:
+        return waveform.astype(np.float32, copy=False)
+    try:
+        import soxr
+    except ImportError:
+        soxr = None
+    if soxr is not None:
+        return soxr.resample(waveform, orig_sr, target_sr, quality="HQ").astype(np.float32, copy=False)
+    from scipy.signal import resample_poly
+
+    divisor = math.gcd(orig_sr, target_sr)
+    up, down = target_sr // divisor, orig_sr // divisor
+    return resample_poly(waveform, up, down, window=resample_filter(up, down)).astype(np.float32)
+
+
+def decode_with_soundfile(data: bytes) -> Tuple[np.ndarray, int]:
+    """``(mono float32, sample rate)`` decoded from memory by libsndfile."""
+    import io
+
+    import soundfile as sf
+
+    with sf.SoundFile(io.BytesIO(data)) as f:
+        if f.subtype == "PCM_16":
+            # libsndfile's int16 -> float conversion is ~15x slower than numpy's
+            audio = f.read(dtype="int16", always_2d=True).astype(np.float32)
+            scale = 1.0 / 32768
+        else:
+            audio = f.read(dtype="float32", always_2d=True)
+            scale = 1.0
+        sample_rate = f.samplerate
+    # Downmix as a matrix-vector product: ndarray.mean(axis=1) is very slow on (n, 2) arrays
+    weights = np.full(audio.shape[1], scale / audio.shape[1], dtype=np.float32)
+    return audio @ weights, sample_rate
+
+
+def decode_with_ffmpeg(
+    media: MediaInput,
+    target_sr: int,
+    ffmpeg: str = "ffmpeg",
+    seekable: Optional[bool] = None,
+) -> np.ndarray:
+    """
+    Mono float32 at ``target_sr`` from an ffmpeg subprocess (downmixed and
+    resampled by ffmpeg). ``seekable`` inputs are read from the upload's path,
+    others piped to stdin; by default it is guessed from the suffix.
+    """
+    if seekable is None:
+        seekable = media.suffix.lower() in SEEKABLE_CONTAINERS
+    command = [
+        ffmpeg, "-nostdin", "-v", "error",
+        "-i", media.path() if seekable else "pipe:0",
+        # rematrix_maxval=1 makes the downmix an average, like soundfile's (ffmpeg's default is -3 dB per channel)
+        "-vn", "-rematrix_maxval", "1.0", "-ac", "1", "-ar", str(target_sr), "-f", "f32le", "pipe:1",
+    ]
+    result = subprocess.run(
+        command,
+        input=None if seekable else media.data,
+        capture_output=True,
+        pass_fds=media.inheritable_fds() if seekable else (),
+    )
+    if result.returncode != 0:
+        raise AudioDecodeError(result.stderr.decode(errors="replace").strip()[-300:] or "ffmpeg failed")
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def decode_audio(media: MediaInput, target_sr: int = 16000, ffmpeg: Optional[str] = "ffmpeg") -> np.ndarray:
+    """
+    Decode an upload to mono float32 at ``target_sr``: soundfile from memory,
+    then ffmpeg, then (without ffmpeg, ``ffmpeg=None`` or not on PATH)
+    librosa/audioread on the upload's path.
+    """
+    try:
+        waveform, sample_rate = decode_with_soundfile(media.data)
+        return resample(waveform, sample_rate, target_sr)
+    except Exception:
+        pass  # not a libsndfile format (M4A/AAC, MP3 on old libsndfile): fall through
+    if ffmpeg:
+        try:
+            return decode_with_ffmpeg(media, target_sr, ffmpeg)
+        except FileNotFoundError:
+            pass  # no ffmpeg binary
+    import librosa
+
+    try:
+        waveform, _ = librosa.load(media.path(), sr=target_sr, mono=True)
+    except Exception as e:
+        raise AudioDecodeError(f"Could not decode audio: {e}") from e
+    return waveform
+
+
+def demux_audio(media: MediaInput, target_sr: int = 16000, ffmpeg: str = "ffmpeg") -> Optional[np.ndarray]:
+    """
+    The audio track of a video upload as mono float32 at ``target_sr``, or
+    None if it has none. Only the audio stream is decoded; video packets are
+    skipped by the demuxer. Raises FileNotFoundError without ffmpeg.
+    """
+    try:
+        waveform = decode_with_ffmpeg(media, target_sr, ffmpeg, seekable=True)
+    except AudioDecodeError as e:
+        if "does not contain any stream" in str(e):
+            return None  # no audio track
+        raise
+    return waveform if len(waveform) else None
+
+
+def window_starts(num_samples: int, window: int, hop: int, max_windows: int = 0) -> List[int]:
+    """
+    Start offsets of ``window``-sample windows every ``hop`` samples covering
+    ``num_samples``; at most ``max_windows`` of them (0 = no limit).
+    """
+    if num_samples <= window:
+        return [0]
+    last = num_samples - window
+    count = math.ceil(last / max(1, hop)) + 1
+    if max_windows and count > max_windows:
+        # Over budget: fewer windows, wider hop, still first-to-last
+        return [int(start) for start in np.linspace(0, last, max_windows).round()]
+    return [i * hop for i in range(count - 1)] + [last]
+
+
+def sliding_windows(
+    waveform: np.ndarray,
+    window: int,
+    hop: int,
+    max_windows: int = 0,
+) -> Tuple[List[int], np.ndarray]:
+    """
+    ``(starts, windows)`` where ``windows`` is a ``(n, window)`` float32 array.
+    Clips shorter than one window are zero-padded to a single window.
+    """
+    waveform = np.asarray(waveform, dtype=np.float32)
+    if len(waveform) < window:
+        waveform = np.pad(waveform, (0, window - len(waveform)), mode="constant")
+    starts = window_starts(len(waveform), window, hop, max_windows)
+    return starts, np.stack([waveform[start:start + window] for start in starts])
+
+
+def aggregate_window_scores(probs: Sequence[float], top_windows: int = 0) -> float:
+    """
+    Mean of the ``top_windows`` highest window scores (0 = mean of all). A
+    short spliced-in segment only raises the few windows overlapping it, which
+    a plain mean over a long clip would dilute; averaging more than one window
+    keeps a single noisy window from deciding the verdict.
+    """
+    if not probs:
+        raise ValueError("No window scores to aggregate")
+    ordered = sorted(probs, reverse=True)
+    count = min(len(ordered), top_windows) if top_windows > 0 else len(ordered)
+    return float(np.mean(ordered[:count]))
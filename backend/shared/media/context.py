@@ -0,0 +1,86 @@
+"""
+Request-scoped decoded video shared by every analysis stage.
+
+The endpoint plans which frames each stage will need (the SOTA frame scorer's
+samples, the Gemini verifier's beginning/middle/end frames, ...), then
+``VideoContext.load`` opens the upload once, reads its metadata and decodes the
+union of those indices in a single sequential pass. Stages read frames from the
+context instead of opening the file again, so each upload is decoded exactly once.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .input import MediaInput
+from .video import read_frames_sequential
+
+
+@dataclass(frozen=True)
+class VideoMetadata:
+    """Container-level properties of an uploaded video."""
+
+    frame_count: int
+    fps: float
+    width: int
+    height: int
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.frame_count / self.fps if self.fps > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "frame_count": self.frame_count,
+            "fps": round(self.fps, 3),
+            "resolution": f"{self.width}x{self.height}",
+            "duration_seconds": round(self.duration_seconds, 2),
+        }
+
+
+def probe_video(media: MediaInput) -> VideoMetadata:
+    """Read frame count, fps and resolution without decoding any frames."""
+    cap = cv2.VideoCapture(media.path())
+    try:
+        return VideoMetadata(
+            frame_count=int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            fps=float(cap.get(cv2.CAP_PROP_FPS) or 0.0),
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        )
+    finally:
+        cap.release()
+
+
+class VideoContext:
+    """Decoded frames (RGB) and metadata for one uploaded video."""
+
+    def __init__(self, media: MediaInput, metadata: VideoMetadata, frames: Dict[int, np.ndarray]):
+        self.media = media
+        self.metadata = metadata
+        self._frames = frames
+
+    @classmethod
+    def load(
+        cls,
+        media: MediaInput,
+        metadata: VideoMetadata,
+        indices: Iterable[int],
+        target_size: Optional[int] = None,
+    ) -> "VideoContext":
+        """Decode every planned frame index in one pass over the stream."""
+        cap = cv2.VideoCapture(media.path())
+        try:
+            frames = read_frames_sequential(cap, list(indices), target_size=target_size)
+        finally:
+            cap.release()
+        return cls(media, metadata, frames)
+
+    @property
+    def decoded_indices(self) -> List[int]:
+        return sorted(self._frames)
+
+    def frames(self, indices: Iterable[int]) -> List[Tuple[int, np.ndarray]]:
+        """Decoded frames for ``indices`` (in order, skipping undecodable ones)."""
+        return [(idx, self._frames[idx]) for idx in sorted(set(indices)) if idx in self._frames]
@@ -0,0 +1,98 @@
+"""
+Request-scoped handle on an uploaded media file.
+
+Decoders that can read from memory (PIL, soundfile) use ``buffer()`` and never
+touch the filesystem. Decoders that need a path (OpenCV/FFmpeg, audioread,
+Gemini's file upload) share a single copy materialised lazily by ``path()``:
+an anonymous ``memfd`` on Linux, otherwise a file on tmpfs (``/dev/shm``), and
+only as a last resort a regular temp file. Every stage of a request gets the
+same path, so a 100 MB upload is copied at most once.
+"""
+import os
+import tempfile
+import threading
+from io import BytesIO
+from typing import Optional, Tuple
+
+_TMPFS_DIR = "/dev/shm"
+
+
+class MediaInput:
+    """Uploaded bytes plus an on-demand, shared file-backed view of them."""
+
+    def __init__(
+        self,
+        data: bytes,
+        suffix: str = "",
+        mime_type: Optional[str] = None,
+        name: str = "upload",
+    ):
+        self.data = data
+        self.suffix = suffix
+        self.mime_type = mime_type
+        self.name = name
+        self._path: Optional[str] = None
+        self._fd: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def buffer(self) -> BytesIO:
+        """A fresh in-memory file object over the upload (no copy until written to)."""
+        return BytesIO(self.data)
+
+    def path(self) -> str:
+        """Filesystem path with the upload's contents, created once per request."""
+        with self._lock:
+            if self._path is None:
+                self._path = self._materialize()
+            return self._path
+
+    def inheritable_fds(self) -> Tuple[int, ...]:
+        """
+        Descriptors a child process must inherit (``subprocess`` ``pass_fds``)
+        for ``path()`` to resolve in it: a memfd path is ``/proc/self/fd/N``.
+        """
+        with self._lock:
+            return (self._fd,) if self._fd is not None else ()
+
+    def _materialize(self) -> str:
+        if hasattr(os, "memfd_create"):
+            fd = None
+            try:
+                fd = os.memfd_create(self.name, 0)
+                self._write_all(fd)
+            except OSError:
+                if fd is not None:
+                    os.close(fd)
+            else:
+                self._fd = fd
+                return f"/proc/self/fd/{fd}"
+
+        directory = _TMPFS_DIR if os.access(_TMPFS_DIR, os.W_OK) else None
+        with tempfile.NamedTemporaryFile(delete=False, suffix=self.suffix, dir=directory) as tmp:
+            tmp.write(self.data)
+            return tmp.name
+
+    def _write_all(self, fd: int) -> None:
+        view = memoryview(self.data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+
+    def close(self) -> None:
+        """Release the file-backed copy, if one was created."""
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+            elif self._path is not None and os.path.exists(self._path):
+                os.unlink(self._path)
+            self._fd = None
+            self._path = None
+
+    def __enter__(self) -> "MediaInput":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
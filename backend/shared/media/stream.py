@@ -0,0 +1,217 @@
+"""
+Incremental audio for streaming voice detection.
+
+A live call arrives as a sequence of small chunks instead of one upload. The
+pieces here keep per-connection state bounded no matter how long the call
+runs:
+
+- ``PcmStreamDecoder`` / ``FfmpegStreamDecoder`` turn the incoming chunks
+  into mono float32 at the model rate: raw 16 kHz PCM directly in numpy,
+  anything else (Ogg/WebM Opus from MediaRecorder, PCM at other rates) through
+  one long-lived ffmpeg subprocess per connection.
+- ``AudioRingBuffer`` holds only the most recent samples, one window plus one
+  hop of them.
+- ``StreamWindower`` cuts the stream into the same overlapping windows
+  ``sliding_windows`` produces for an upload, emitting each as soon as its
+  last sample has arrived.
+- ``RollingWindowScores`` aggregates the window scores seen so far like
+  ``aggregate_window_scores`` does, from a count, a sum and the top few
+  scores instead of every score of the call.
+"""
+import asyncio
+import heapq
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .audio import AudioDecodeError
+
+PCM_DTYPES = {"pcm_s16le": np.dtype("<i2"), "pcm_f32le": np.dtype("<f4")}
+
+
+class AudioRingBuffer:
+    """Fixed-capacity float32 buffer of the latest samples, addressed by absolute sample index."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self.total = 0  # samples written since the stream started
+
+    def write(self, samples: np.ndarray) -> None:
+        samples = np.asarray(samples, dtype=np.float32)
+        self.total += len(samples)
+        samples = samples[-self.capacity:]  # older ones would be overwritten anyway
+        position = (self.total - len(samples)) % self.capacity
+        head = min(len(samples), self.capacity - position)
+        self._data[position:position + head] = samples[:head]
+        self._data[:len(samples) - head] = samples[head:]
+
+    def read(self, start: int, length: int) -> np.ndarray:
+        """Copy of samples ``[start, start + length)``, which must still be buffered."""
+        if start < self.total - self.capacity or start + length > self.total or length > self.capacity:
+            raise ValueError(f"Samples {start}-{start + length} are not in the buffer")
+        indices = np.arange(start, start + length) % self.capacity
+        return self._data[indices]
+
+
+class StreamWindower:
+    """Overlapping fixed-length windows over a stream of samples."""
+
+    def __init__(self, window: int, hop: int):
+        self.window = window
+        self.hop = max(1, min(hop, window))
+        self.buffer = AudioRingBuffer(window + self.hop)
+        self.next_end = window  # end of the next window to emit
+        self.last_end = 0  # end of the last window emitted
+
+    def push(self, samples: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+        """Append samples; ``(start, window)`` for every window they complete."""
+        ready = []
+        # In pieces of at most one hop so no completed window is overwritten before it is read
+        for offset in range(0, len(samples), self.hop):
+            self.buffer.write(samples[offset:offset + self.hop])
+            while self.buffer.total >= self.next_end:
+                start = self.next_end - self.window
+                ready.append((start, self.buffer.read(start, self.window)))
+                self.last_end = self.next_end
+                self.next_end += self.hop
+        return ready
+
+    def flush(self) -> Optional[Tuple[int, np.ndarray]]:
+        """
+        At the end of the stream, the window flush with its end if samples
+        arrived after the last emitted window (zero-padded when the whole
+        stream is shorter than a window).
+        """
+        total = self.buffer.total
+        if total <= self.last_end:
+            return None
+        if total < self.window:
+            return 0, np.pad(self.buffer.read(0, total), (0, self.window - total))
+        self.last_end = total
+        return total - self.window, self.buffer.read(total - self.window, self.window)
+
+
+class RollingWindowScores:
+    """Running ``aggregate_window_scores`` over a stream of window scores in O(top_windows) memory."""
+
+    def __init__(self, top_windows: int = 0):
+        self.top_windows = top_windows
+        self.count = 0
+        self.total = 0.0
+        self._top: List[float] = []  # min-heap of the highest scores
+
+    def add(self, prob: float) -> None:
+        self.count += 1
+        self.total += prob
+        if self.top_windows > 0:
+            if len(self._top) < self.top_windows:
+                heapq.heappush(self._top, prob)
+            elif prob > self._top[0]:
+                heapq.heapreplace(self._top, prob)
+
+    def value(self) -> Optional[float]:
+        """The aggregate so far, or None before the first score."""
+        if not self.count:
+            return None
+        if self.top_windows > 0:
+            return float(np.mean(self._top))
+        return self.total / self.count
+
+
+class PcmStreamDecoder:
+    """Raw little-endian PCM at the model rate: interleaved channels, averaged to mono."""
+
+    def __init__(self, sample_format: str = "pcm_s16le", channels: int = 1):
+        self.dtype = PCM_DTYPES[sample_format]
+        self.channels = max(1, channels)
+        self._pending = b""  # bytes of an incomplete frame split across chunks
+
+    async def feed(self, data: bytes) -> np.ndarray:
+        data = self._pending + data
+        frame_bytes = self.dtype.itemsize * self.channels
+        usable = len(data) - len(data) % frame_bytes
+        self._pending = data[usable:]
+        audio = np.frombuffer(data[:usable], dtype=self.dtype).astype(np.float32)
+        if self.dtype.kind == "i":
+            audio *= 1.0 / 32768
+        if self.channels > 1:
+            audio = audio.reshape(-1, self.channels) @ np.full(self.channels, 1.0 / self.channels, dtype=np.float32)
+        return audio
+
+    async def finish(self) -> np.ndarray:
+        return np.zeros(0, dtype=np.float32)
+
+    async def close(self) -> None:
+        pass
+
+
+class FfmpegStreamDecoder:
+    """
+    One ffmpeg subprocess per stream: chunks are written to its stdin and the
+    mono float32 it produces at ``target_sr`` is collected from stdout by a
+    background task. ``feed`` returns whatever has been decoded so far, so
+    output lags the input by ffmpeg's internal buffering (typically one chunk).
+    """
+
+    def __init__(self, input_args: Sequence[str] = (), target_sr: int = 16000, ffmpeg: str = "ffmpeg"):
+        self.command = [
+            ffmpeg, "-nostdin", "-v", "error",
+            *input_args, "-i", "pipe:0",
+            "-vn", "-rematrix_maxval", "1.0", "-ac", "1", "-ar", str(target_sr), "-f", "f32le", "pipe:1",
+        ]
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._decoded = bytearray()
+
+    async def start(self) -> "FfmpegStreamDecoder":
+        self._process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._reader = asyncio.create_task(self._read())
+        return self
+
+    async def _read(self) -> None:
+        while True:
+            chunk = await self._process.stdout.read(65536)
+            if not chunk:
+                return
+            self._decoded.extend(chunk)
+
+    def _take(self) -> np.ndarray:
+        usable = len(self._decoded) - len(self._decoded) % 4
+        audio = np.frombuffer(bytes(self._decoded[:usable]), dtype=np.float32)
+        del self._decoded[:usable]
+        return audio
+
+    async def feed(self, data: bytes) -> np.ndarray:
+        try:
+            self._process.stdin.write(data)
+            await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            raise AudioDecodeError(await self._error()) from None
+        return self._take()
+
+    async def finish(self) -> np.ndarray:
+        """Close ffmpeg's input and return the rest of its output."""
+        if not self._process.stdin.is_closing():
+            self._process.stdin.close()
+        await self._reader
+        if await self._process.wait() != 0:
+            raise AudioDecodeError(await self._error())
+        return self._take()
+
+    async def _error(self) -> str:
+        stderr = await self._process.stderr.read()
+        return stderr.decode(errors="replace").strip()[-300:] or "ffmpeg could not decode the stream"
+
+    async def close(self) -> None:
+        """Stop the subprocess (e.g. when the client disconnects mid-stream)."""
+        if self._process and self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+        if self._reader:
+            self._reader.cancel()
@@ -0,0 +1,92 @@
+"""
+Energy / zero-crossing voice-activity detection for the voice detector.
+
+Voice notes and call recordings are often mostly silence or background noise,
+and every 4 s window sent to the voice model costs a Wav2Vec2 + BiGRU forward
+pass. ``window_speech_ratios`` measures how much of each window contains
+speech so that windows without any can be dropped before the model runs.
+
+The detector is deliberately conservative: a frame counts as speech when it is
+loud enough (above an absolute floor and within ``dynamic_range_db`` of the
+clip's loud frames) and not noise-like (zero-crossing rate below
+``max_zcr``, which rejects hiss and other broadband noise). Speech frames are
+extended by a short hangover so unvoiced consonants and short pauses between
+words stay attached to the speech around them. Everything is computed on a
+``(frames, frame_length)`` view of the waveform in a handful of numpy calls.
+"""
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+def frame_features(waveform: np.ndarray, frame_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ``(energy_db, zcr)`` per non-overlapping frame: RMS level in dBFS and the
+    fraction of adjacent samples that change sign. A trailing partial frame is
+    ignored.
+    """
+    waveform = np.asarray(waveform, dtype=np.float32)
+    num_frames = len(waveform) // frame_length
+    frames = waveform[:num_frames * frame_length].reshape(num_frames, frame_length)
+    power = np.einsum("ij,ij->i", frames, frames) / frame_length
+    energy_db = 10 * np.log10(power + 1e-12)
+    crossings = np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1)
+    return energy_db, crossings / max(1, frame_length - 1)
+
+
+def speech_frames(
+    waveform: np.ndarray,
+    sample_rate: int,
+    frame_ms: float = 30.0,
+    energy_floor_db: float = -50.0,
+    dynamic_range_db: float = 35.0,
+    max_zcr: float = 0.4,
+    hangover_ms: float = 200.0,
+) -> Tuple[np.ndarray, int]:
+    """``(mask, frame_length)``: a boolean speech mask with one entry per frame."""
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    energy_db, zcr = frame_features(waveform, frame_length)
+    if not len(energy_db):
+        return np.zeros(0, dtype=bool), frame_length
+    threshold = max(energy_floor_db, float(np.percentile(energy_db, 95)) - dynamic_range_db)
+    mask = (energy_db >= threshold) & (zcr <= max_zcr)
+    hangover = int(hangover_ms / frame_ms)
+    if hangover and mask.any():
+        # Dilate: a frame is speech if any frame within `hangover` of it is
+        mask = np.convolve(mask, np.ones(2 * hangover + 1), mode="same") > 0
+    return mask, frame_length
+
+
+def window_speech_ratios(
+    waveform: np.ndarray,
+    starts: Sequence[int],
+    window: int,
+    sample_rate: int,
+    **vad_options,
+) -> Tuple[np.ndarray, float]:
+    """
+    ``(ratios, speech_seconds)``: the fraction of speech frames in each window
+    starting at ``starts`` (windows past the end of the clip only count the
+    clip's frames) and the total speech duration of the clip.
+    """
+    mask, frame_length = speech_frames(waveform, sample_rate, **vad_options)
+    counts = np.concatenate([[0], np.cumsum(mask)])
+    starts = np.asarray(starts, dtype=np.int64)
+    first = np.minimum(starts // frame_length, len(mask))
+    last = np.minimum((starts + window) // frame_length, len(mask))
+    frames = last - first
+    ratios = np.where(frames > 0, (counts[last] - counts[first]) / np.maximum(frames, 1), 1.0)
+    return ratios, float(mask.sum() * frame_length / sample_rate)
+
+
+def speech_windows(ratios: np.ndarray, min_speech_ratio: float = 0.1) -> np.ndarray:
+    """
+    Boolean keep-mask over windows: those with at least ``min_speech_ratio``
+    speech. If none qualifies the most speech-like window is kept, so a clip
+    always gets a score.
+    """
+    ratios = np.asarray(ratios, dtype=np.float64)
+    keep = ratios >= min_speech_ratio
+    if len(keep) and not keep.any():
+        keep[int(np.argmax(ratios))] = True
+    return keep
@@ -0,0 +1,88 @@
+"""
+Frame sampling for video deepfake analysis.
+
+Seeking with ``cap.set(CAP_PROP_POS_FRAMES, idx)`` makes the decoder restart from
+the previous keyframe for every sample, so on long-GOP H.264 files ten samples
+can cost close to a full decode. ``read_frames_sequential`` instead walks the
+stream once: ``grab()`` advances past frames we don't need (demux + decode, no
+colour conversion or copy) and ``retrieve()`` is only called on the targets.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+
+def sample_frame_indices(total_frames: int, count: int) -> List[int]:
+    """Evenly spaced frame indices covering the whole clip."""
+    if total_frames <= 0 or count <= 0:
+        return []
+    return [int(i) for i in np.linspace(0, total_frames - 1, min(count, total_frames), dtype=int)]
+
+
+def downscale_frame(frame: np.ndarray, target_size: int) -> np.ndarray:
+    """Shrink a frame so its shorter side is ``target_size`` (never upscales)."""
+    height, width = frame.shape[:2]
+    shorter = min(height, width)
+    if shorter <= target_size:
+        return frame
+    scale = target_size / shorter
+    new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA)
+
+
+def read_frames_sequential(
+    cap: "cv2.VideoCapture",
+    indices: Sequence[int],
+    target_size: Optional[int] = None,
+) -> Dict[int, np.ndarray]:
+    """
+    Decode the requested frames in a single forward pass over the stream.
+
+    Args:
+        cap: An opened capture positioned at the first frame.
+        indices: Frame indices to keep (any order, duplicates allowed).
+        target_size: If set, downscale kept frames toward this size at decode time.
+
+    Returns:
+        Mapping of frame index to RGB frame for every index that could be decoded.
+    """
+    wanted = sorted(set(int(i) for i in indices if i >= 0))
+    frames: Dict[int, np.ndarray] = {}
+    if not wanted:
+        return frames
+
+    position = 0
+    for target in wanted:
+        while position < target:
+            if not cap.grab():
+                return frames
+            position += 1
+        if not cap.grab():
+            return frames
+        position += 1
+        ret, frame = cap.retrieve()
+        if not ret:
+            continue
+        if target_size:
+            frame = downscale_frame(frame, target_size)
+        frames[target] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return frames
+
+
+def read_frames_seek(
+    cap: "cv2.VideoCapture",
+    indices: Sequence[int],
+    target_size: Optional[int] = None,
+) -> Dict[int, np.ndarray]:
+    """Seek-per-frame reference implementation (kept for benchmarking)."""
+    frames: Dict[int, np.ndarray] = {}
+    for target in indices:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(target))
+        ret, frame = cap.read()
+        if not ret:
+            continue
+        if target_size:
+            frame = downscale_frame(frame, target_size)
+        frames[int(target)] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return frames
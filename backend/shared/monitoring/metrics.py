@@ -0,0 +1,67 @@
+"""
+Prometheus metrics for VeriFy AI inference services.
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+# Micro-batching
+INFERENCE_BATCH_SIZE = Histogram(
+    "inference_batch_size",
+    "Number of requests coalesced into one forward pass",
+    ["model"],
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+INFERENCE_QUEUE_WAIT = Histogram(
+    "inference_queue_wait_seconds",
+    "Time a request waited in the batching queue before its forward pass started",
+    ["model"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# Result caches
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache, kind, tier and outcome",
+    ["cache", "kind", "tier", "result"],
+)
+CACHE_INVALIDATIONS = Counter(
+    "cache_invalidated_entries_total",
+    "Entries dropped by explicit invalidation (e.g. model upgrade)",
+    ["cache", "kind"],
+)
+
+# Text fact-checking pipeline
+TEXT_STAGE_DURATION = Histogram(
+    "text_pipeline_stage_seconds",
+    "Time spent in each check_text stage",
+    ["stage"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+TEXT_PIPELINE_EXITS = Counter(
+    "text_pipeline_exits_total",
+    "Stage at which check_text reached its verdict",
+    ["stage"],
+)
+
+# Model registry
+MODEL_RESIDENT_BYTES = Gauge(
+    "model_resident_bytes",
+    "Resident memory charged to each loaded model (0 when unloaded)",
+    ["model"],
+)
+MODEL_LOADS = Counter(
+    "model_loads_total",
+    "Model loads by model and result",
+    ["model", "result"],
+)
+MODEL_EVICTIONS = Counter(
+    "model_evictions_total",
+    "Models unloaded to stay within the memory budget",
+    ["model"],
+)
+
+# Voice detector
+VOICE_WINDOWS = Counter(
+    "voice_windows_total",
+    "check_voice 4 s windows sent to the model (scored) or dropped by voice-activity detection (skipped)",
+    ["outcome"],
+)
@@ -0,0 +1,6 @@
+"""
+Domain reputation for VeriFy AI (shared by check_url, check_text and the extension).
+"""
+from .index import DEFAULT_DOMAINS_FILE, DomainReputationIndex, split_url
+
+__all__ = ["DEFAULT_DOMAINS_FILE", "DomainReputationIndex", "split_url"]
@@ -0,0 +1,139 @@
+"""
+Domain reputation index backed by a versioned data file (``domains.json``).
+
+Entries are registrable domains (``cdc.gov``), bare suffixes (``gov``) or
+domain + path prefixes (``reuters.com/fact-check``), each with a list of labels
+(``fake``, ``trusted``, ``fact_checker``, ``authority``). A lookup walks the
+host's label suffixes (``www.cdc.gov`` -> ``www.cdc.gov``, ``cdc.gov``,
+``gov``) with one hash probe each, so its cost depends on the number of labels
+in the host, not on the number of domains in the index.
+
+The file also carries a changelog of per-version ``set`` / ``removed`` deltas
+from ``base_version`` onward, which ``snapshot(since=...)`` folds into the
+delta a client (the Chrome extension) needs to catch up.
+"""
+import json
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_DOMAINS_FILE = Path(__file__).with_name("domains.json")
+
+NO_LABELS: FrozenSet[str] = frozenset()
+
+
+def split_url(url: str) -> Tuple[str, str]:
+    """(host, path) for a URL or bare domain, lowercased, without port, userinfo or trailing dot."""
+    url = url.strip().lower()
+    if "//" not in url:
+        url = "//" + url
+    parts = urlsplit(url)
+    host = (parts.hostname or "").rstrip(".")
+    return host, parts.path or "/"
+
+
+def group_by_label(domains: Dict[str, Iterable[str]]) -> Dict[str, List[str]]:
+    """``{domain: labels}`` -> ``{label: [domains]}`` (the compact wire format)."""
+    grouped: Dict[str, List[str]] = {}
+    for domain, labels in domains.items():
+        for label in labels:
+            grouped.setdefault(label, []).append(domain)
+    return {label: sorted(members) for label, members in sorted(grouped.items())}
+
+
+class DomainReputationIndex:
+    """Suffix-aware hash index over labelled domains with versioned snapshots."""
+
+    def __init__(
+        self,
+        domains: Dict[str, Iterable[str]],
+        version: int = 1,
+        base_version: Optional[int] = None,
+        changelog: Optional[List[dict]] = None,
+    ):
+        self.version = version
+        self.base_version = base_version if base_version is not None else version
+        self.changelog = sorted(changelog or [], key=lambda entry: entry["version"])
+        self.domains: Dict[str, FrozenSet[str]] = {}
+        self._hosts: Dict[str, FrozenSet[str]] = {}
+        self._paths: Dict[str, List[Tuple[str, FrozenSet[str]]]] = {}
+        for entry, labels in domains.items():
+            self._add(entry, frozenset(labels))
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "DomainReputationIndex":
+        with open(path or DEFAULT_DOMAINS_FILE, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            data["domains"],
+            version=data["version"],
+            base_version=data.get("base_version"),
+            changelog=data.get("changelog"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+    def _add(self, entry: str, labels: FrozenSet[str]) -> None:
+        key = entry.strip().lower().strip("/")
+        self.domains[key] = labels
+        host, _, path = key.partition("/")
+        if path:
+            prefixes = self._paths.setdefault(host, [])
+            prefixes.append(("/" + path, labels))
+            prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+        else:
+            self._hosts[host] = labels
+
+    def lookup(self, url: str) -> FrozenSet[str]:
+        """Union of the labels of every entry covering ``url`` (a URL or bare host)."""
+        host, path = split_url(url)
+        if not host:
+            return NO_LABELS
+        labels = NO_LABELS
+        suffix = host
+        while True:
+            found = self._hosts.get(suffix)
+            if found:
+                labels = labels | found
+            for prefix, path_labels in self._paths.get(suffix, ()):
+                if path.startswith(prefix):
+                    labels = labels | path_labels
+            dot = suffix.find(".")
+            if dot == -1:
+                return labels
+            suffix = suffix[dot + 1:]
+
+    def has(self, url: str, label: str) -> bool:
+        return label in self.lookup(url)
+
+    def snapshot(self, since: Optional[int] = None) -> dict:
+        """
+        Full snapshot, or the delta from version ``since`` when the changelog covers it.
+
+        Full: ``{"version", "full": true, "labels": {label: [domains]}}``.
+        Delta: ``{"version", "full": false, "since", "labels": {...}, "removed": [...]}``
+        where ``labels`` lists the complete current labels of every changed
+        domain; clients drop ``removed`` and the changed domains, then add.
+        """
+        if since is None or since < self.base_version or since > self.version:
+            return {"version": self.version, "full": True, "labels": group_by_label(self.domains)}
+
+        changed, removed = set(), set()
+        for entry in self.changelog:
+            if entry["version"] <= since:
+                continue
+            for domain in entry.get("set", {}):
+                changed.add(domain)
+                removed.discard(domain)
+            for domain in entry.get("removed", []):
+                removed.add(domain)
+                changed.discard(domain)
+        current = {domain: self.domains[domain] for domain in changed if domain in self.domains}
+        return {
+            "version": self.version,
+            "full": False,
+            "since": since,
+            "labels": group_by_label(current),
+            "removed": sorted(removed),
+        }
@@ -0,0 +1,6 @@
+"""
+Text processing utilities for VeriFy AI.
+"""
+from .matcher import AHOCORASICK_AVAILABLE, PatternMatcher
+
+__all__ = ["AHOCORASICK_AVAILABLE", "PatternMatcher"]
@@ -0,0 +1,38 @@
+"""
+Indicator phrases used by check_text to score Tavily sources.
+
+Compiled into a matcher once at import, so scoring a source is a single pass
+over its text. Source URLs are classified by the domain reputation index
+(``shared.reputation``).
+"""
+from .matcher import PatternMatcher
+
+# Enhanced debunking/fact-check indicators (MORE SENSITIVE)
+DEBUNK_PATTERNS = [
+    # Strong debunking
+    'false', 'fake', 'myth', 'debunk', 'incorrect', 'wrong', 'misleading', 'untrue',
+    'not true', 'no evidence', 'conspiracy theory', 'hoax', 'disproven', 'refuted',
+    'fact check: false', 'claim is false', 'this is false', 'misinformation',
+    'lacks evidence', 'unsubstantiated', 'baseless', 'fabricated', 'discredited',
+    # Context clues
+    'despite claims', 'contrary to', 'in reality', 'actually', 'truth is',
+    'scientific consensus', 'studies show', 'experts say', 'research shows',
+    'no scientific evidence', 'no proof', 'no support', 'widely debunked',
+    # Additional strong indicators
+    'has been debunked', 'thoroughly debunked', 'completely false', 'entirely false',
+    'no link', 'no connection', 'does not cause', 'study finds no', 'experts reject',
+    'pseudoscience', 'anti-science', 'against science', 'contradicts science'
+]
+
+SUPPORT_PATTERNS = [
+    # Strong support
+    'confirmed', 'verified', 'true', 'accurate', 'correct', 'factual', 'legitimate',
+    'proven', 'established', 'documented', 'official', 'evidence shows',
+    'studies confirm', 'research confirms', 'experts confirm', 'science shows',
+    'peer-reviewed', 'published in', 'according to', 'data shows',
+    # Authoritative sources
+    'cdc', 'who', 'nih', 'fda', 'reuters', 'ap news', 'bbc', 'scientific american',
+    'nature', 'science journal', 'government', 'university'
+]
+
+SOURCE_TEXT_MATCHER = PatternMatcher({"debunk": DEBUNK_PATTERNS, "support": SUPPORT_PATTERNS})
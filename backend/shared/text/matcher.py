@@ -0,0 +1,81 @@
+"""
+Precompiled multi-pattern substring matcher.
+
+Built once at import from named groups of literal patterns (e.g. debunk and
+support phrases). One Aho-Corasick pass over a text yields per-pattern hit
+counts for every group at once, instead of one ``pattern in text`` scan per
+pattern.
+
+The automaton comes from ``pyahocorasick`` (C extension). Without it the
+matcher falls back to per-pattern ``str.find`` scans, which in CPython are
+faster than a pure-Python automaton for pattern sets this small; both
+backends return identical results.
+"""
+from typing import Dict, Iterable, List, Mapping
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+def _count_overlapping(text: str, pattern: str) -> int:
+    count = 0
+    start = text.find(pattern)
+    while start != -1:
+        count += 1
+        start = text.find(pattern, start + 1)
+    return count
+
+
+class PatternMatcher:
+    """Named groups of literal patterns matched in a single pass."""
+
+    def __init__(self, groups: Mapping[str, Iterable[str]], use_automaton: bool = True):
+        """
+        Args:
+            groups: Group name -> patterns. Matching is case-sensitive; lowercase
+                both the patterns and the text for case-insensitive scoring.
+            use_automaton: Use pyahocorasick when installed.
+        """
+        self.groups: Dict[str, tuple] = {name: tuple(dict.fromkeys(patterns)) for name, patterns in groups.items()}
+        self._pattern_groups: Dict[str, List[str]] = {}
+        for name, patterns in self.groups.items():
+            for pattern in patterns:
+                self._pattern_groups.setdefault(pattern, []).append(name)
+        self.patterns: List[str] = list(self._pattern_groups)
+        self._automaton = None
+        if use_automaton and AHOCORASICK_AVAILABLE and self.patterns:
+            automaton = ahocorasick.Automaton()
+            for pattern in self.patterns:
+                automaton.add_word(pattern, pattern)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    @property
+    def backend(self) -> str:
+        return "aho-corasick" if self._automaton is not None else "find"
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Hit count (overlapping occurrences) for every pattern present in ``text``."""
+        if self._automaton is not None:
+            hits: Dict[str, int] = {}
+            for _, pattern in self._automaton.iter(text):
+                hits[pattern] = hits.get(pattern, 0) + 1
+            return hits
+        return {pattern: _count_overlapping(text, pattern) for pattern in self.patterns if pattern in text}
+
+    def present(self, text: str) -> Iterable[str]:
+        """Distinct patterns occurring in ``text``."""
+        if self._automaton is not None:
+            return {pattern for _, pattern in self._automaton.iter(text)}
+        return [pattern for pattern in self.patterns if pattern in text]
+
+    def scores(self, text: str) -> Dict[str, int]:
+        """Number of distinct patterns of each group present in ``text``."""
+        scores = dict.fromkeys(self.groups, 0)
+        for pattern in self.present(text):
+            for name in self._pattern_groups[pattern]:
+                scores[name] += 1
+        return scores
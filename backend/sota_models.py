@@ -0,0 +1,649 @@
+"""
+SOTA detector definitions for ai_server_sota.
+
+Model architectures, their HuggingFace loaders and warmups, plus the tensor
+code that scores inputs with them. Everything torch/timm/torchvision lives
+here so that importing the server stays cheap: the registry imports this
+module on the first model load.
+
+With MODEL_ARTIFACT_DIR set, each loader first looks for a local artifact
+baked by prepare_model_artifacts.py and memory-maps its weights instead of
+downloading and re-loading the HuggingFace checkpoint.
+"""
+
+import os
+import re
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+import torch
+import torch.nn as nn
+from huggingface_hub import hf_hub_download
+
+from shared.config import settings
+from shared.inference.artifacts import build_module, read_artifact, verify_artifact, write_artifact
+from shared.inference.onnx_backend import onnx_or_torch
+from shared.inference.optimize import COMPILE, EAGER, FREEZE, optimize_model, strip_dropout
+from shared.inference.quantization import NONE, quantize_model
+
+try:
+    import timm
+    print("✅ timm library imported")
+except ImportError:
+    print("❌ timm not found. Installing...")
+    os.system("pip install timm")
+    import timm
+
+# Use torchvision transforms instead of albumentations to avoid scipy issues
+from torchvision import transforms
+print("✅ torchvision transforms imported")
+
+
+@dataclass
+class LoadedDetector:
+    """A detector model plus the preprocessing it expects"""
+    model: Any
+    preprocess: Any = None  # torchvision transform or Wav2Vec2 feature extractor
+    input_size: int = 0
+    quantization: str = NONE  # int8 mode actually applied (see quantize_detector)
+    backend: str = "torch"  # "onnx" when an ORT session replaced the torch module
+    optimization: str = NONE  # graph optimization level actually applied (see optimize_detector)
+
+
+# Where each detector comes from (recorded in artifact manifests)
+MODEL_SOURCES = {
+    "image": {"repo_id": "Arko007/deepfake-image-detector", "filename": "pytorch_model.bin"},
+    "video": {"repo_id": "Arko007/deepfake-detector-dfd-sota", "filename": "pytorch_model.bin"},
+    "voice": {"repo_id": "koyelog/deepfake-voice-detector-sota", "filename": "pytorch_model.pth"},
+    "text": {"repo_id": "hamzab/roberta-fake-news-classification"},
+}
+WAV2VEC2_BASE = "facebook/wav2vec2-base"
+
+
+def local_artifact(name: str) -> Optional[Path]:
+    """Artifact directory for `name`, if MODEL_ARTIFACT_DIR is set and holds a complete one"""
+    if not settings.model_artifact_dir or not Path(settings.model_artifact_dir).is_dir():
+        return None  # artifacts disabled (the image's default dir only exists when they were baked)
+    directory = Path(settings.model_artifact_dir) / name
+    if not (directory / "manifest.json").exists():
+        print(f"⚠️ No local artifact for {name} in {settings.model_artifact_dir}, loading from HuggingFace")
+        return None
+    return directory
+
+
+def frame_transform(size: int):
+    """Resize + ImageNet normalisation used by the image and video detectors"""
+    return transforms.Compose([
+        transforms.Resize((size, size)),
+        transforms.ToTensor(),
+        transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
+    ])
+
+
+# ============================================
+# Custom Model Architecture for Image Detection
+# ============================================
+
+class DeepfakeImageDetector(nn.Module):
+    """Custom EfficientNetV2-S model for deepfake image detection"""
+    def __init__(self, model_name='tf_efficientnetv2_s', pretrained=False):
+        super().__init__()
+        self.backbone_name = model_name
+        self.backbone = timm.create_model(model_name, pretrained=pretrained, num_classes=0)
+        num_features = self.backbone.num_features
+        # Match the actual checkpoint structure with more layers
+        self.classifier = nn.Sequential(
+            nn.Linear(num_features, 1024),
+            nn.BatchNorm1d(1024),
+            nn.ReLU(),
+            nn.Dropout(0.3),
+            nn.Linear(1024, 512),
+            nn.BatchNorm1d(512),
+            nn.ReLU(),
+            nn.Dropout(0.3),
+            nn.Linear(512, 256),
+            nn.BatchNorm1d(256),
+            nn.ReLU(),
+            nn.Dropout(0.3),
+            nn.Linear(256, 1)
+        )
+    
+    def forward(self, x):
+        features = self.backbone(x)
+        return self.classifier(features)
+
+
+class DeepfakeVideoDetector(nn.Module):
+    """Custom Xception model for deepfake video detection"""
+    def __init__(self, model_name='xception', pretrained=False):
+        super().__init__()
+        # Try to use xception from timm, fallback to efficientnet
+        try:
+            self.backbone = timm.create_model(model_name, pretrained=pretrained, num_classes=0)
+            self.backbone_name = model_name
+        except:
+            print(f"⚠️ {model_name} not found, using efficientnetv2_m")
+            self.backbone = timm.create_model('tf_efficientnetv2_m', pretrained=pretrained, num_classes=0)
+            self.backbone_name = 'tf_efficientnetv2_m'
+        
+        num_features = self.backbone.num_features
+        self.classifier = nn.Sequential(
+            nn.Dropout(0.4),
+            nn.Linear(num_features, 512),
+            nn.ReLU(),
+            nn.Dropout(0.3),
+            nn.Linear(512, 1)
+        )
+    
+    def forward(self, x):
+        features = self.backbone(x)
+        return self.classifier(features)
+
+
+# ============================================
+# Load Image Deepfake Detector (EfficientNetV2-S)
+# ============================================
+
+def load_frame_artifact(name: str, directory: Path, model_cls) -> LoadedDetector:
+    """Image/video detector from a local artifact (meta-device build, mmap-backed weights)"""
+    state_dict, config = read_artifact(directory, verify_checksums=settings.model_artifact_verify)
+    model = build_module(lambda: model_cls(model_name=config["backbone"], pretrained=False), state_dict)
+    size = config["input_size"]
+    print(f"✅ {name.title()} Detector: LOADED from artifact {directory} (mmap)")
+    print(f"   - Input size: {size}x{size}")
+    print(f"   - Backbone: {config['backbone']}")
+    return LoadedDetector(model, frame_transform(size), size)
+
+
+def load_image_detector(use_artifact: bool = True) -> LoadedDetector:
+    """Build the EfficientNetV2-S image detector from a local artifact or HuggingFace"""
+    print("\n🖼️ Loading Image Deepfake Detector (EfficientNetV2-S)...")
+    directory = local_artifact("image") if use_artifact else None
+    if directory:
+        return load_frame_artifact("image", directory, DeepfakeImageDetector)
+    
+    # Download model files from HuggingFace
+    model_path = hf_hub_download(
+        repo_id="Arko007/deepfake-image-detector",
+        filename="pytorch_model.bin",
+        token=os.getenv("HUGGINGFACE_TOKEN")
+    )
+    config_path = hf_hub_download(
+        repo_id="Arko007/deepfake-image-detector",
+        filename="config.json",
+        token=os.getenv("HUGGINGFACE_TOKEN")
+    )
+    
+    # Load config
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    
+    # Create model
+    model = DeepfakeImageDetector(
+        model_name=config.get('model_name', 'tf_efficientnetv2_s'),
+        pretrained=False
+    )
+    
+    # Load checkpoint (use strict=False to handle architecture differences)
+    checkpoint = torch.load(model_path, map_location='cpu')
+    model.load_state_dict(checkpoint, strict=False)
+    model.eval()
+    
+    # Create transform (380x380 as per model card)
+    image_size = config.get('image_size', 380)
+    transform = frame_transform(image_size)
+    
+    print(f"✅ Image Detector: LOADED (EfficientNetV2-S, 89.5MB, AUC 0.9986)")
+    print(f"   - Input size: {image_size}x{image_size}")
+    print(f"   - Backbone: {config.get('model_name', 'tf_efficientnetv2_s')}")
+    return LoadedDetector(model, transform, image_size)
+
+
+# ============================================
+# Load Video Deepfake Detector (Xception/EfficientNetV2-M)
+# ============================================
+
+def load_video_detector(use_artifact: bool = True) -> LoadedDetector:
+    """Build the DFD-SOTA video frame detector from a local artifact or HuggingFace"""
+    print("\n🎥 Loading Video Deepfake Detector (DFD-SOTA)...")
+    directory = local_artifact("video") if use_artifact else None
+    if directory:
+        return load_frame_artifact("video", directory, DeepfakeVideoDetector)
+    
+    # Download model files from HuggingFace
+    model_path = hf_hub_download(
+        repo_id="Arko007/deepfake-detector-dfd-sota",
+        filename="pytorch_model.bin",
+        token=os.getenv("HUGGINGFACE_TOKEN")
+    )
+    config_path = hf_hub_download(
+        repo_id="Arko007/deepfake-detector-dfd-sota",
+        filename="config.json",
+        token=os.getenv("HUGGINGFACE_TOKEN")
+    )
+    
+    # Load config
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    
+    # Create model
+    model = DeepfakeVideoDetector(
+        model_name=config.get('model_name', 'xception'),
+        pretrained=False
+    )
+    
+    # Load checkpoint (handle nested structure)
+    checkpoint = torch.load(model_path, map_location='cpu')
+    
+    # Check if checkpoint has nested structure
+    if 'model_state_dict' in checkpoint:
+        state_dict = checkpoint['model_state_dict']
+    else:
+        state_dict = checkpoint
+    
+    model.load_state_dict(state_dict, strict=False)
+    model.eval()
+    
+    # Create transform
+    video_size = config.get('image_size', 299)
+    transform = frame_transform(video_size)
+    
+    print(f"✅ Video Detector: LOADED (Xception/EfficientNetV2-M, 1.28GB, SOTA)")
+    print(f"   - Input size: {video_size}x{video_size}")
+    print(f"   - Backbone: {config.get('model_name', 'xception')}")
+    return LoadedDetector(model, transform, video_size)
+
+
+def warmup_frame_detector(detector: LoadedDetector) -> None:
+    """One forward pass on a blank frame (image and video detectors)"""
+    with torch.inference_mode():
+        detector.model(torch.zeros(1, 3, detector.input_size, detector.input_size))
+
+
+# ============================================
+# Load Voice Deepfake Detector (SOTA)
+# ============================================
+
+class DeepfakeVoiceDetector(nn.Module):
+    """
+    SOTA Voice Deepfake Detector with Wav2Vec2 + BiGRU + Multi-Head Attention
+    Architecture from koyelog/deepfake-voice-detector-sota
+    """
+    def __init__(self, wav2vec2_config=None):
+        """
+        Args:
+            wav2vec2_config: Build the Wav2Vec2 encoder from this config without
+                loading its pretrained weights (they come from an artifact).
+        """
+        super().__init__()
+        from transformers import Wav2Vec2Model
+        
+        # Wav2Vec2 feature extractor (frozen CNN layers)
+        if wav2vec2_config is None:
+            self.wav2vec2 = Wav2Vec2Model.from_pretrained(WAV2VEC2_BASE)
+        else:
+            self.wav2vec2 = Wav2Vec2Model(wav2vec2_config)
+        
+        # Freeze CNN feature extractor
+        for param in self.wav2vec2.feature_extractor.parameters():
+            param.requires_grad = False
+        
+        # BiGRU: 2 layers, 256 hidden units per direction (512 total)
+        self.bigru = nn.GRU(
+            input_size=768,  # wav2vec2 output dimension
+            hidden_size=256,
+            num_layers=2,
+            batch_first=True,
+            bidirectional=True,
+            dropout=0.3
+        )
+        
+        # Multi-Head Attention: 8 heads, 512-dimensional embeddings
+        self.attention = nn.MultiheadAttention(
+            embed_dim=512,
+            num_heads=8,
+            dropout=0.2,
+            batch_first=True
+        )
+        
+        # Classification head
+        self.classifier = nn.Sequential(
+            nn.Linear(512, 512),
+            nn.ReLU(),
+            nn.BatchNorm1d(512),
+            nn.Dropout(0.4),
+            nn.Linear(512, 128),
+            nn.ReLU(),
+            nn.BatchNorm1d(128),
+            nn.Dropout(0.3),
+            nn.Linear(128, 1)
+        )
+    
+    def forward(self, input_values):
+        # Extract features with Wav2Vec2
+        wav2vec_outputs = self.wav2vec2(input_values).last_hidden_state
+        
+        # BiGRU temporal modeling
+        gru_output, _ = self.bigru(wav2vec_outputs)
+        
+        # Multi-head attention (self-attention)
+        attn_output, _ = self.attention(gru_output, gru_output, gru_output)
+        
+        # Global average pooling over time dimension
+        pooled = torch.mean(attn_output, dim=1)
+        
+        # Classification
+        logits = self.classifier(pooled)
+        return logits
+
+
+def load_voice_detector(use_artifact: bool = True) -> LoadedDetector:
+    """Build the SOTA voice detector and its Wav2Vec2 feature extractor from a local artifact or HuggingFace"""
+    print("\n🎤 Loading SOTA Voice Deepfake Detector...")
+    from transformers import Wav2Vec2Config, Wav2Vec2FeatureExtractor
+    
+    directory = local_artifact("voice") if use_artifact else None
+    if directory:
+        state_dict, _ = read_artifact(directory, verify_checksums=settings.model_artifact_verify)
+        wav2vec2_config = Wav2Vec2Config.from_pretrained(directory / "wav2vec2")
+        model = build_module(lambda: DeepfakeVoiceDetector(wav2vec2_config), state_dict)
+        feature_extractor = Wav2Vec2FeatureExtractor.from_pretrained(directory / "wav2vec2")
+        print(f"✅ Voice Detector: LOADED from artifact {directory} (mmap)")
+        return LoadedDetector(model, feature_extractor, input_size=4 * 16000)
+    
+    # Download model checkpoint from HuggingFace
+    model_path = hf_hub_download(
+        repo_id="koyelog/deepfake-voice-detector-sota",
+        filename="pytorch_model.pth",
+        token=os.getenv("HUGGINGFACE_TOKEN")
+    )
+    
+    # Initialize model
+    model = DeepfakeVoiceDetector()
+    
+    # Load checkpoint
+    checkpoint = torch.load(model_path, map_location='cpu')
+    
+    # Handle different checkpoint formats
+    if isinstance(checkpoint, dict):
+        if 'model_state_dict' in checkpoint:
+            state_dict = checkpoint['model_state_dict']
+        elif 'state_dict' in checkpoint:
+            state_dict = checkpoint['state_dict']
+        else:
+            state_dict = checkpoint
+    else:
+        state_dict = checkpoint
+    
+    model.load_state_dict(state_dict, strict=False)
+    model.eval()
+    
+    # Initialize feature extractor
+    feature_extractor = Wav2Vec2FeatureExtractor.from_pretrained(WAV2VEC2_BASE)
+    
+    print("✅ Voice Detector: LOADED (SOTA - Wav2Vec2 + BiGRU + Attention, 98.5M params)")
+    print("   - Architecture: Wav2Vec2 + BiGRU(2 layers) + 8-head Attention")
+    print("   - Performance: 95-97% accuracy on validation")
+    print("   - Input: 4-second clips at 16 kHz")
+    return LoadedDetector(model, feature_extractor, input_size=4 * 16000)  # samples per clip
+
+
+def warmup_voice_detector(detector: LoadedDetector) -> None:
+    """One forward pass on a silent 4-second clip"""
+    with torch.inference_mode():
+        detector.model(torch.zeros(1, detector.input_size))
+
+
+# ============================================
+# Load Text Fake News Detector (RoBERTa)
+# ============================================
+
+def load_text_detector(use_artifact: bool = True) -> LoadedDetector:
+    """Build the RoBERTa fake news pipeline from a local artifact or HuggingFace"""
+    print("\n📚 Loading Text Fake News Detector (RoBERTa)...")
+    from transformers import pipeline
+    source = MODEL_SOURCES["text"]["repo_id"]
+    directory = local_artifact("text") if use_artifact else None
+    if directory:
+        verify_artifact(directory, checksums=settings.model_artifact_verify)
+        source = str(directory / "hf")  # safetensors weights, memory-mapped by transformers
+    classifier = pipeline(
+        "text-classification",
+        model=source,
+        tokenizer=source,
+        framework="pt"
+    )
+    print("✅ Text Detector (RoBERTa): LOADED (500MB, 85-90% accuracy)")
+    return LoadedDetector(classifier)
+
+
+def warmup_text_detector(detector: LoadedDetector) -> None:
+    detector.model("Warmup claim for the fake news classifier.")
+
+
+# ============================================
+# INT8 Quantization (MODEL_QUANTIZATION)
+# ============================================
+
+CALIBRATION_IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png")
+CALIBRATION_VIDEO_SUFFIXES = (".mp4", ".avi", ".mov", ".webm")
+
+
+def calibration_batches(detector: LoadedDetector, directory: str, batch_size: int = 4, max_items: int = 32) -> List[torch.Tensor]:
+    """
+    Preprocessed image/video-frame batches for static quantization, read from
+    `directory` (images plus a few evenly spaced frames per video).
+    """
+    from PIL import Image
+    import cv2
+    
+    images = []
+    paths = sorted(Path(directory).glob("*")) if directory and Path(directory).is_dir() else []
+    for path in paths:
+        suffix = path.suffix.lower()
+        if suffix in CALIBRATION_IMAGE_SUFFIXES:
+            images.append(Image.open(path).convert('RGB'))
+        elif suffix in CALIBRATION_VIDEO_SUFFIXES:
+            cap = cv2.VideoCapture(str(path))
+            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            for index in np.linspace(0, max(total - 1, 0), num=4, dtype=int):
+                cap.set(cv2.CAP_PROP_POS_FRAMES, int(index))
+                ok, frame = cap.read()
+                if ok:
+                    images.append(Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)))
+            cap.release()
+        if len(images) >= max_items:
+            break
+    tensors = [detector.preprocess(image) for image in images[:max_items]]
+    return [torch.stack(tensors[i:i + batch_size]) for i in range(0, len(tensors), batch_size)]
+
+
+def quantize_detector(name: str, detector: LoadedDetector, mode: str) -> LoadedDetector:
+    """
+    Quantize a loaded detector in place. Image/video: dynamic int8 heads, or
+    static int8 end to end calibrated on MODEL_QUANTIZATION_CALIBRATION_DIR.
+    Voice: dynamic int8 Wav2Vec2 + BiGRU + heads. Text: dynamic int8 RoBERTa.
+    Static quantization of the transformer models falls back to dynamic.
+    """
+    if mode == NONE:
+        return detector
+    if name == "text":
+        # Quantize the pipeline's underlying transformers model
+        detector.model.model, detector.quantization = quantize_model(detector.model.model, mode)
+    else:
+        batches = []
+        if mode == "static" and name in ("image", "video"):
+            batches = calibration_batches(detector, settings.model_quantization_calibration_dir)
+        detector.model, detector.quantization = quantize_model(detector.model, mode, batches)
+    print(f"🔢 {name.title()} Detector: INT8 {detector.quantization} quantization applied")
+    return detector
+
+
+# ============================================
+# ONNX Runtime Backend (MODEL_BACKENDS)
+# ============================================
+
+ONNX_MODELS = ("image", "video")
+
+
+def onnx_export_path(name: str, input_size: int) -> Path:
+    """Cached export location, keyed on the model version so upgrades re-export"""
+    version = re.sub(r"[^A-Za-z0-9_.-]+", "_", settings.model_versions.get(name, name))
+    return Path(settings.onnx_cache_dir) / f"{name}-{version}-{input_size}.onnx"
+
+
+def use_onnx_backend(name: str, detector: LoadedDetector) -> LoadedDetector:
+    """Swap the torch module for an ORT session when export and logit parity succeed"""
+    if name not in ONNX_MODELS:
+        print(f"⚠️ ONNX backend is only available for {', '.join(ONNX_MODELS)}; {name} stays on torch")
+        return detector
+    detector.model, detector.backend = onnx_or_torch(
+        detector.model,
+        onnx_export_path(name, detector.input_size),
+        detector.input_size,
+        intra_op_threads=settings.onnx_intra_op_threads or torch.get_num_threads(),
+        tolerance=settings.onnx_parity_tolerance,
+    )
+    if detector.backend == "onnx":
+        print(f"⚡ {name.title()} Detector: running on ONNX Runtime (CPU)")
+    return detector
+
+
+# ============================================
+# Graph Optimization (MODEL_OPTIMIZATION)
+# ============================================
+
+def optimization_example(name: str, detector: LoadedDetector) -> torch.Tensor:
+    """Seeded probe batch for tracing / compiling and the equivalence check"""
+    generator = torch.Generator().manual_seed(0)
+    if name == "voice":
+        return 0.1 * torch.randn(2, detector.input_size, generator=generator)
+    return torch.rand(2, 3, detector.input_size, detector.input_size, generator=generator)
+
+
+def optimize_detector(name: str, detector: LoadedDetector, level: str) -> LoadedDetector:
+    """
+    Apply a graph optimization level in place. Image/video/voice: BN folding,
+    dropout stripping (+ channels_last for the CNNs), optionally frozen or
+    compiled. Text: dropout stripping only (the HF pipeline can't be traced).
+    """
+    if level == NONE:
+        return detector
+    if name == "text":
+        if level != EAGER:
+            print(f"⚠️ MODEL_OPTIMIZATION={level} is not supported for text, using eager")
+        strip_dropout(detector.model.model)
+        detector.optimization = EAGER
+    else:
+        detector.model, detector.optimization = optimize_model(
+            detector.model,
+            level,
+            optimization_example(name, detector),
+            channels_last=name in ("image", "video"),
+        )
+    print(f"🛠️ {name.title()} Detector: {detector.optimization} graph optimizations applied")
+    return detector
+
+
+def load_detector(name: str) -> LoadedDetector:
+    """
+    Load `name` (local artifact or HuggingFace) with its MODEL_OPTIMIZATION level,
+    on its MODEL_BACKENDS backend, with its MODEL_QUANTIZATION mode
+    """
+    detector = LOADERS[name]()
+    optimization = settings.model_optimization.get(name, NONE)
+    on_onnx = settings.model_backends.get(name, "torch") == "onnx"
+    if optimization in (FREEZE, COMPILE) and (on_onnx or settings.model_quantization.get(name, NONE) != NONE):
+        print(f"⚠️ MODEL_OPTIMIZATION={optimization} for {name} needs the fp32 torch backend, using eager")
+        optimization = EAGER
+    # Eager passes rewrite the module before it is exported or quantized
+    detector = optimize_detector(name, detector, optimization)
+    if on_onnx:
+        detector = use_onnx_backend(name, detector)
+        if detector.backend == "onnx":
+            if settings.model_quantization.get(name, NONE) != NONE:
+                print(f"⚠️ MODEL_QUANTIZATION for {name} ignored: it applies to the torch backend only")
+            return detector
+    return quantize_detector(name, detector, settings.model_quantization.get(name, NONE))
+
+
+# ============================================
+# Local Artifacts (prepare_model_artifacts.py)
+# ============================================
+
+LOADERS = {
+    "image": load_image_detector,
+    "video": load_video_detector,
+    "voice": load_voice_detector,
+    "text": load_text_detector,
+}
+WARMUPS = {
+    "image": warmup_frame_detector,
+    "video": warmup_frame_detector,
+    "voice": warmup_voice_detector,
+    "text": warmup_text_detector,
+}
+
+
+def export_artifact(name: str, detector: LoadedDetector, directory: Path) -> dict:
+    """Bake a loaded detector into `directory` (weights, config, checksum manifest)"""
+    directory = Path(directory)
+    source = MODEL_SOURCES[name]
+    if name in ("image", "video"):
+        config = {"backbone": detector.model.backbone_name, "input_size": detector.input_size}
+        return write_artifact(directory, detector.model.state_dict(), config, source=source)
+    if name == "voice":
+        # Encoder config + feature extractor make the artifact loadable offline
+        detector.model.wav2vec2.config.save_pretrained(directory / "wav2vec2")
+        detector.preprocess.save_pretrained(directory / "wav2vec2")
+        return write_artifact(directory, detector.model.state_dict(), {"input_size": detector.input_size}, source=source)
+    if name == "text":
+        detector.model.save_pretrained(directory / "hf", safe_serialization=True)
+        return write_artifact(directory, None, {"task": "text-classification"}, source=source)
+    raise ValueError(f"Unknown model '{name}'")
+
+
+# ============================================
+# Scoring
+# ============================================
+
+def predict_fake_probs(model: nn.Module, tensors: List[torch.Tensor], chunk_size: int = 0) -> List[float]:
+    """P(fake) per preprocessed (3, H, W) tensor, in batched forward passes of at most chunk_size"""
+    chunk_size = chunk_size or len(tensors)
+    probs = []
+    with torch.inference_mode():
+        for start in range(0, len(tensors), chunk_size):
+            batch = torch.stack(tensors[start:start + chunk_size])
+            logits = model(batch)
+            probs.extend(torch.sigmoid(logits).view(-1).tolist())
+    return probs
+
+
+def predict_voice_fake_probs(
+    detector: LoadedDetector,
+    windows: Sequence[np.ndarray],
+    sampling_rate: int = 16000,
+    batch_size: int = 0,
+) -> List[float]:
+    """P(fake) per fixed-length 16 kHz clip, in batched forward passes of at most batch_size"""
+    batch_size = batch_size or len(windows)
+    probs = []
+    with torch.inference_mode():
+        for start in range(0, len(windows), batch_size):
+            # Wav2Vec2 features are normalized per clip, so batching doesn't change any score
+            input_values = detector.preprocess(
+                list(windows[start:start + batch_size]),
+                sampling_rate=sampling_rate,
+                return_tensors="pt"
+            ).input_values
+            logits = detector.model(input_values)
+            probs.extend(torch.sigmoid(logits).view(-1).tolist())
+    return probs
+
+
+def predict_voice_fake_prob(detector: LoadedDetector, waveform: np.ndarray, sampling_rate: int = 16000) -> float:
+    """P(fake) for one fixed-length 16 kHz clip"""
+    return predict_voice_fake_probs(detector, [waveform], sampling_rate)[0]
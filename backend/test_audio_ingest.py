@@ -0,0 +1,151 @@
+"""
+Audio Ingest Test (offline)
+Checks that decode_audio matches librosa on in-memory WAV/FLAC uploads,
+downmixes stereo as an average, reuses the cached resampling filter,
+demuxes the audio track of video uploads and reports undecodable uploads as
+AudioDecodeError.
+"""
+import io
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+from shared.media import AudioDecodeError, MediaInput, audio_mime_type, decode_audio, demux_audio, resample
+from shared.media.audio import resample_filter
+
+SR = 16000
+
+
+def tone(duration, sample_rate, channels=1):
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    mono = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.1 * np.sin(2 * np.pi * 1330 * t)
+    return np.stack([mono * (1 - 0.2 * c) for c in range(channels)], axis=1).astype(np.float32)
+
+
+def encoded(audio, sample_rate, fmt="WAV", subtype="PCM_16"):
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, sample_rate, format=fmt, subtype=subtype)
+    return buffer.getvalue()
+
+
+def decode(data, suffix, ffmpeg=None):
+    media = MediaInput(data, suffix=suffix)
+    try:
+        return decode_audio(media, SR, ffmpeg=ffmpeg)
+    finally:
+        media.close()
+
+
+def test_matches_librosa():
+    import librosa
+
+    for fmt, suffix in (("WAV", ".wav"), ("FLAC", ".flac")):
+        data = encoded(tone(3, 44100, channels=2), 44100, fmt)
+        reference, _ = librosa.load(io.BytesIO(data), sr=SR, mono=True)
+        waveform = decode(data, suffix)
+        assert waveform.dtype == np.float32 and waveform.ndim == 1
+        assert len(waveform) == len(reference)
+        assert np.abs(waveform - reference).max() < 1e-4
+
+
+def test_stereo_downmix_is_average():
+    stereo = tone(1, SR, channels=2)
+    waveform = decode(encoded(stereo, SR, subtype="FLOAT"), ".wav")  # no resampling at the model rate
+    assert np.allclose(waveform, stereo.mean(axis=1), atol=1e-6)
+
+
+def test_resample_filter_cached():
+    resample_filter.cache_clear()
+    signal = tone(1, 48000)[:, 0]
+    from scipy.signal import resample_poly
+
+    for _ in range(3):
+        cached = resample_poly(signal, 1, 3, window=resample_filter(1, 3))
+    assert resample_filter.cache_info().hits == 2
+    assert np.allclose(cached, resample_poly(signal, 1, 3), atol=1e-6)  # same filter scipy designs
+    assert len(resample(signal, 48000, SR)) == SR
+    assert resample(signal, 48000, 48000) is signal
+
+
+def test_ffmpeg_decode():
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        print("   skipped: ffmpeg not installed")
+        return
+    stereo = tone(2, 48000, channels=2)
+    data = encoded(stereo, 48000)
+    from shared.media.audio import decode_with_ffmpeg
+
+    for suffix in (".wav", ".m4a"):  # piped from memory / read from the upload's path
+        media = MediaInput(data, suffix=suffix)
+        try:
+            waveform = decode_with_ffmpeg(media, SR, ffmpeg)
+        finally:
+            media.close()
+        reference = decode(data, ".wav")
+        assert abs(len(waveform) - len(reference)) <= 1
+        n = min(len(waveform), len(reference))
+        assert np.abs(waveform[:n] - reference[:n]).max() < 2e-2  # different resampler, same loudness
+
+
+def test_demux_video_audio_track():
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        print("   skipped: ffmpeg not installed")
+        return
+    video = ["-f", "lavfi", "-i", "testsrc=size=160x120:rate=25:duration=3"]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, audio_args in (("with_audio", ["-f", "lavfi", "-i", "sine=frequency=440:duration=3"]), ("silent", [])):
+            path = f"{tmp}/{name}.mp4"
+            subprocess.run([ffmpeg, "-v", "error", *video, *audio_args, "-pix_fmt", "yuv420p", path], check=True)
+            media = MediaInput(open(path, "rb").read(), suffix=".mp4")
+            try:
+                waveform = demux_audio(media, SR, ffmpeg)
+            finally:
+                media.close()
+            if name == "silent":
+                assert waveform is None  # no audio track
+            else:
+                assert waveform.dtype == np.float32 and abs(len(waveform) - 3 * SR) < SR // 10
+                assert abs(np.sqrt(np.mean(waveform ** 2)) - 0.125 / np.sqrt(2)) < 0.01  # lavfi sine is 1/8 amplitude
+
+
+def test_mime_type_from_container():
+    audio = tone(0.1, SR)
+    assert audio_mime_type(encoded(audio, SR)) == "audio/wav"
+    assert audio_mime_type(encoded(audio, SR, "FLAC")) == "audio/flac"
+    assert audio_mime_type(encoded(audio, SR, "OGG", "VORBIS")) == "audio/ogg"
+    assert audio_mime_type(b"ID3\x04\x00" + b"\0" * 20) == "audio/mp3"
+    assert audio_mime_type(b"\xff\xfb\x90\x64" + b"\0" * 20) == "audio/mp3"  # MPEG-1 layer III frame
+    assert audio_mime_type(b"\xff\xf1\x50\x80" + b"\0" * 20) == "audio/aac"  # ADTS
+    assert audio_mime_type(b"\0\0\0\x20ftypM4A " + b"\0" * 20) == "audio/mp4"
+    assert audio_mime_type(b"unknown bytes", default="audio/wav") == "audio/wav"
+
+
+def test_undecodable_upload():
+    try:
+        decode(b"definitely not audio" * 100, ".wav")
+        assert False, "expected AudioDecodeError"
+    except AudioDecodeError:
+        pass
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("AUDIO INGEST TEST")
+    print("=" * 60)
+    for test in (
+        test_matches_librosa,
+        test_stereo_downmix_is_average,
+        test_resample_filter_cached,
+        test_ffmpeg_decode,
+        test_demux_video_audio_track,
+        test_mime_type_from_container,
+        test_undecodable_upload,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
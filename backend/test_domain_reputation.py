@@ -0,0 +1,69 @@
+"""
+Domain Reputation Index Test (offline)
+Checks suffix/path lookups, snapshot deltas and lookup cost at scale.
+"""
+import time
+
+from shared.reputation import DomainReputationIndex
+
+
+def test_bundled_index_lookups():
+    index = DomainReputationIndex.load()
+    assert "fake" in index.lookup("https://www.naturalnews.com/2024/article.html")
+    assert index.lookup("pubmed.ncbi.nlm.nih.gov") >= {"trusted", "authority"}
+    assert index.has("https://www.reuters.com/fact-check/some-claim", "fact_checker")
+    assert not index.has("https://www.reuters.com/world/", "fact_checker")
+    assert index.has("https://www.usda.gov/topics", "authority")  # bare "gov" suffix entry
+    # Suffix matching, not substring matching
+    assert not index.lookup("https://notcdc.gov.example.net/")
+    assert not index.lookup("https://snopes-archive.net/")
+    assert not index.lookup("")
+
+
+def test_snapshot_deltas():
+    changelog = [
+        {"version": 2, "set": {"a.com": ["fake"], "b.com": ["trusted"]}, "removed": []},
+        {"version": 3, "set": {"c.com": ["fake"]}, "removed": ["b.com", "old.com"]},
+    ]
+    index = DomainReputationIndex(
+        {"a.com": ["fake"], "c.com": ["fake"], "d.com": ["trusted"]},
+        version=3, base_version=1, changelog=changelog,
+    )
+    full = index.snapshot()
+    assert full["full"] and full["labels"] == {"fake": ["a.com", "c.com"], "trusted": ["d.com"]}
+
+    delta = index.snapshot(since=1)
+    assert not delta["full"]
+    assert delta["labels"] == {"fake": ["a.com", "c.com"]}
+    assert delta["removed"] == ["b.com", "old.com"]
+
+    assert index.snapshot(since=2)["labels"] == {"fake": ["c.com"]}
+    assert index.snapshot(since=3) == {"version": 3, "full": False, "since": 3, "labels": {}, "removed": []}
+    assert index.snapshot(since=0)["full"]  # older than the changelog
+
+
+def test_lookup_cost_independent_of_size():
+    def time_lookups(index, repeats=20000):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            index.lookup("https://news.sub.example-site-123.com/path")
+        return time.perf_counter() - start
+
+    small = DomainReputationIndex({f"site-{i}.com": ["fake"] for i in range(100)})
+    large = DomainReputationIndex({f"site-{i}.com": ["fake"] for i in range(300000)})
+    assert large.has("https://www.site-299999.com/", "fake")
+    assert time_lookups(large) < time_lookups(small) * 3
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("DOMAIN REPUTATION TEST")
+    print("=" * 60)
+    for test in (
+        test_bundled_index_lookups,
+        test_snapshot_deltas,
+        test_lookup_cost_independent_of_size,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
@@ -0,0 +1,146 @@
+"""
+External Clients Test (offline)
+Runs the async Tavily and Gemini clients against the local stand-in server.
+"""
+import asyncio
+import json
+
+import httpx
+
+from shared.clients import GeminiClient, ServiceError, ServiceTimeout, TavilySearchClient, blob_part
+from shared.clients.gemini import MAX_INLINE_BYTES
+from shared.clients.stub_server import create_stub_app
+
+
+def stub(**options):
+    app = create_stub_app(**options)
+    return app, httpx.ASGITransport(app=app)
+
+
+def test_tavily_search():
+    async def run():
+        app, transport = stub()
+        client = TavilySearchClient("test-key", base_url="http://stub", transport=transport)
+        result = await client.search("verify: water is H2O", max_results=3, search_depth="advanced")
+        assert len(result["results"]) == 3
+        assert app.state.requests[0][1]["search_depth"] == "advanced"
+        await client.aclose()
+    asyncio.run(run())
+
+
+def test_gemini_generate_with_inline_media():
+    async def run():
+        app, transport = stub(verdict={"is_fake": False, "confidence": 0.8, "reasoning": "ok"})
+        client = GeminiClient("test-key", base_url="http://stub", transport=transport)
+        text = await client.generate(["Is this real?", blob_part(b"\xff\xd8fake-jpeg", "image/jpeg")])
+        assert json.loads(text.replace("```json", "").replace("```", ""))["is_fake"] is False
+        parts = app.state.requests[0][1]["contents"][0]["parts"]
+        assert parts[0] == {"text": "Is this real?"}
+        assert parts[1]["inline_data"]["mime_type"] == "image/jpeg"
+        await client.aclose()
+    asyncio.run(run())
+
+
+def test_gemini_large_media_goes_through_file_api():
+    async def run():
+        app, transport = stub()
+        client = GeminiClient("test-key", base_url="http://stub", transport=transport)
+        part, uploaded = await client.media_part(b"x" * 1000, "audio/wav")
+        assert uploaded is None and "inline_data" in part
+
+        data = b"\0" * (MAX_INLINE_BYTES + 1)  # e.g. a 15 MB voice note (uploads are capped at 20 MB)
+        part, uploaded = await client.media_part(data, "audio/mp3", timeout=5)
+        assert uploaded["state"] == "ACTIVE"  # waited out PROCESSING
+        assert part == {"file_data": {"mime_type": "audio/mp3", "file_uri": uploaded["uri"]}}
+        assert ("gemini-upload", {"file": uploaded["name"].split("/")[1], "bytes": len(data)}) in app.state.requests
+        await client.generate(["Is this voice real?", part])
+        assert app.state.requests[-1][1]["contents"][0]["parts"][1] == part
+        await client.delete_file(uploaded)
+        assert not app.state.files
+        await client.aclose()
+    asyncio.run(run())
+
+
+def test_gemini_upload_deadline():
+    async def run():
+        data = b"\0" * (MAX_INLINE_BYTES + 1)
+        for file_state, error in (("PROCESSING", ServiceTimeout), ("FAILED", ServiceError)):
+            app, transport = stub(file_state=file_state)  # PROCESSING: never becomes ACTIVE
+            client = GeminiClient("test-key", base_url="http://stub", transport=transport)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            try:
+                await client.media_part(data, "audio/mp3", timeout=3)
+                raise AssertionError(f"expected {error.__name__} for a {file_state} upload")
+            except error as e:
+                assert type(e) is error  # FAILED is an error, not a timeout
+            assert loop.time() - start < 4  # bounded by the deadline, not by the file
+            assert not app.state.files  # the unusable upload was deleted
+            await client.aclose()
+    asyncio.run(run())
+
+
+def test_timeout_and_http_errors():
+    async def run():
+        _, transport = stub(delay_seconds=1.0)
+        client = TavilySearchClient("test-key", base_url="http://stub", transport=transport, timeout_seconds=0.05)
+        try:
+            await client.search("slow query")
+            raise AssertionError("expected a timeout")
+        except ServiceTimeout:
+            pass
+        assert client.in_flight == 0
+        await client.aclose()
+
+        _, transport = stub()
+        client = TavilySearchClient("test-key", base_url="http://stub", transport=transport)
+        try:
+            await client.search("")
+            raise AssertionError("expected an HTTP error")
+        except ServiceError as e:
+            assert e.status_code == 400
+        await client.aclose()
+    asyncio.run(run())
+
+
+def test_concurrency_is_bounded_and_cancellation_frees_slots():
+    async def run():
+        app, transport = stub(delay_seconds=0.05)
+        client = GeminiClient("test-key", base_url="http://stub", transport=transport, max_concurrency=2)
+        peak = 0
+
+        async def watch():
+            nonlocal peak
+            while True:
+                peak = max(peak, client.in_flight)
+                await asyncio.sleep(0.005)
+
+        watcher = asyncio.ensure_future(watch())
+        await asyncio.gather(*[client.generate("claim") for _ in range(6)])
+        assert peak == 2
+
+        pending = asyncio.ensure_future(client.generate("claim"))
+        await asyncio.sleep(0.01)
+        pending.cancel()
+        await asyncio.gather(pending, return_exceptions=True)
+        assert client.in_flight == 0
+        watcher.cancel()
+        await client.aclose()
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("EXTERNAL CLIENTS TEST")
+    print("=" * 60)
+    for test in (
+        test_tavily_search,
+        test_gemini_generate_with_inline_media,
+        test_gemini_large_media_goes_through_file_api,
+        test_gemini_upload_deadline,
+        test_timeout_and_http_errors,
+        test_concurrency_is_bounded_and_cancellation_frees_slots,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
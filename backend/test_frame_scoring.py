@@ -0,0 +1,152 @@
+"""
+Batched Frame Scoring Test (offline)
+Checks with a small stub frame model that score_frame_batch gives every frame
+the score a one-frame forward pass gives it, for any chunk size, and that
+analyze_video_with_sota aggregates those scores exactly like the original
+frame-by-frame loop (majority vote, confidence, analysis text, frame results).
+"""
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("MODEL_BACKGROUND_LOADING", "true")  # don't load the real detectors on import
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+import ai_server_sota as server
+from shared.media import VideoContext, VideoMetadata
+
+SIZE = 32
+TOLERANCE = 1e-6
+
+
+class StubFrameDetector(nn.Module):
+    """Conv + BatchNorm (eval) + linear head: per-frame output, like the real detector"""
+    def __init__(self):
+        super().__init__()
+        torch.manual_seed(0)
+        self.features = nn.Sequential(
+            nn.Conv2d(3, 8, 3, padding=1), nn.BatchNorm2d(8), nn.ReLU(), nn.AdaptiveAvgPool2d(1), nn.Flatten(),
+        )
+        self.head = nn.Linear(8, 1)
+
+    def forward(self, x):
+        # Brightness drives the score so the clip below has FAKE and REAL frames
+        return self.head(self.features(x)) * 0.1 + (x.mean(dim=(1, 2, 3)) - 0.5).unsqueeze(1) * 12
+
+
+def preprocess(image):
+    return torch.from_numpy(np.asarray(image, dtype=np.float32) / 255).permute(2, 0, 1)
+
+
+def register_stub():
+    model = StubFrameDetector().eval()
+    server.model_registry.register(
+        "video", lambda: SimpleNamespace(model=model, preprocess=preprocess, input_size=SIZE)
+    )
+    server.model_registry.get("video")
+    return model
+
+
+def frames(count, seed=0):
+    """Frames of varying brightness, some with P(fake) above 0.5 and some below"""
+    rng = np.random.default_rng(seed)
+    levels = np.linspace(60, 200, count)
+    rng.shuffle(levels)
+    return [
+        np.clip(level + rng.normal(0, 25, (SIZE, SIZE, 3)), 0, 255).astype(np.uint8)
+        for level in levels
+    ]
+
+
+def single_frame_prob(model, tensor):
+    """The original per-frame forward pass"""
+    with torch.no_grad():
+        return torch.sigmoid(model(tensor.unsqueeze(0))).item()
+
+
+def baseline_aggregate(indices, probs):
+    """The original analyze_video_with_sota loop, from per-frame probabilities"""
+    frame_results = []
+    fake_count = 0
+    real_count = 0
+    total_prob = 0
+    for frame_idx, prob_fake in zip(indices, probs):
+        is_fake = prob_fake > 0.5
+        if is_fake:
+            fake_count += 1
+        else:
+            real_count += 1
+        total_prob += prob_fake
+        frame_results.append({
+            "frame": int(frame_idx),
+            "probability_fake": prob_fake,
+            "verdict": "FAKE" if is_fake else "REAL"
+        })
+    avg_prob = total_prob / len(frame_results)
+    is_fake_overall = fake_count > real_count
+    confidence = fake_count / len(frame_results) if is_fake_overall else real_count / len(frame_results)
+    return {
+        "is_fake": is_fake_overall,
+        "confidence": confidence,
+        "verdict": "FAKE" if is_fake_overall else "REAL",
+        "avg_prob": avg_prob,
+        "frames_analyzed": len(frame_results),
+        "fake_frames": fake_count,
+        "real_frames": real_count,
+        "frame_results": frame_results[:5],
+    }
+
+
+def test_batched_scores_equal_per_frame_scores():
+    model = register_stub()
+    tensors = [preprocess(frame) for frame in frames(13)]
+    expected = [single_frame_prob(model, tensor) for tensor in tensors]
+    assert min(expected) < 0.5 < max(expected)
+    for chunk_size in (0, 1, 3, 4, 13, 32):  # 0: the whole clip in one pass
+        batched = server.score_frame_batch(tensors, chunk_size)
+        assert len(batched) == len(expected), chunk_size
+        assert np.allclose(batched, expected, atol=TOLERANCE, rtol=0), chunk_size
+
+
+def test_aggregation_unchanged():
+    model = register_stub()
+    for count, seed in ((10, 0), (7, 1), (16, 2)):
+        clip = frames(count, seed)
+        indices = [idx * 9 for idx in range(count)]
+        metadata = VideoMetadata(frame_count=indices[-1] + 1, fps=25.0, width=SIZE, height=SIZE)
+        decoded = dict(zip(indices, clip))
+        del decoded[indices[2]]  # an undecodable sample is skipped, as before
+        context = VideoContext(None, metadata, decoded)
+
+        result = server.analyze_video_with_sota(context, indices)
+
+        kept = [idx for idx in indices if idx in decoded]
+        expected = baseline_aggregate(kept, [single_frame_prob(model, preprocess(decoded[idx])) for idx in kept])
+        details = result["model_details"]
+        assert result["is_fake"] == expected["is_fake"] and result["verdict"] == expected["verdict"], seed
+        assert result["confidence"] == expected["confidence"]
+        for key in ("frames_analyzed", "fake_frames", "real_frames"):
+            assert details[key] == expected[key], key
+        assert [r["frame"] for r in details["frame_results"]] == [r["frame"] for r in expected["frame_results"]]
+        assert [r["verdict"] for r in details["frame_results"]] == [r["verdict"] for r in expected["frame_results"]]
+        assert np.allclose(
+            [r["probability_fake"] for r in details["frame_results"]],
+            [r["probability_fake"] for r in expected["frame_results"]],
+            atol=TOLERANCE, rtol=0,
+        )
+        assert f"Average deepfake probability: {expected['avg_prob']*100:.1f}%" in result["analysis"]
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("BATCHED FRAME SCORING TEST")
+    print("=" * 60)
+    for test in (
+        test_batched_scores_equal_per_frame_scores,
+        test_aggregation_unchanged,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
@@ -0,0 +1,194 @@
+"""
+Graph Optimization Equivalence Test (offline)
+Checks that BN folding, dropout stripping, channels_last, freeze and compile
+leave detector outputs numerically unchanged, on stand-ins for the detector
+heads and a small CNN (and the real architectures when timm is installed).
+"""
+import copy
+
+import torch
+import torch.nn as nn
+
+from shared.inference.optimize import fold_batchnorm, optimize_model, strip_dropout
+
+TOLERANCE = 1e-4
+
+
+def randomize_batchnorm(model):
+    """Non-trivial running stats / affine params, as in a trained model"""
+    generator = torch.Generator().manual_seed(1)
+    for module in model.modules():
+        if isinstance(module, nn.modules.batchnorm._BatchNorm):
+            n = module.num_features
+            module.running_mean.copy_(torch.randn(n, generator=generator))
+            module.running_var.copy_(torch.rand(n, generator=generator) + 0.5)
+            module.weight.data.copy_(torch.rand(n, generator=generator) + 0.5)
+            module.bias.data.copy_(torch.randn(n, generator=generator))
+    return model
+
+
+def calibrate_batchnorm(model, size):
+    """
+    Running stats measured on random images, as training would leave them.
+    Random stats are fine for shallow stand-ins, but through a deep backbone
+    they blow activations up to ~1e6, where fp32 reordering alone exceeds TOLERANCE.
+    """
+    generator = torch.Generator().manual_seed(1)
+    for module in model.modules():
+        if isinstance(module, nn.modules.batchnorm._BatchNorm):
+            module.reset_running_stats()
+            module.momentum = None  # cumulative average over the calibration batches
+            module.weight.data.copy_(torch.rand(module.num_features, generator=generator) + 0.5)
+            module.bias.data.copy_(0.1 * torch.randn(module.num_features, generator=generator))
+    model.train()
+    with torch.no_grad():
+        for _ in range(2):
+            model(torch.rand(4, 3, size, size, generator=generator))
+    return model.eval()
+
+
+class ImageStandIn(nn.Module):
+    """Conv backbone + the image detector's Linear -> BN -> ReLU -> Dropout head"""
+    def __init__(self):
+        super().__init__()
+        self.backbone = nn.Sequential(
+            nn.Conv2d(3, 16, 3, stride=2, padding=1), nn.BatchNorm2d(16), nn.SiLU(),
+            nn.Conv2d(16, 32, 3, stride=2, padding=1, bias=False), nn.BatchNorm2d(32), nn.SiLU(),
+            nn.AdaptiveAvgPool2d(1), nn.Flatten(),
+        )
+        self.classifier = nn.Sequential(
+            nn.Linear(32, 64), nn.BatchNorm1d(64), nn.ReLU(), nn.Dropout(0.3),
+            nn.Linear(64, 32), nn.BatchNorm1d(32), nn.ReLU(), nn.Dropout(0.3),
+            nn.Linear(32, 1),
+        )
+
+    def forward(self, x):
+        return self.classifier(self.backbone(x))
+
+
+class VoiceHead(nn.Module):
+    """The voice detector's Linear -> ReLU -> BN -> Dropout -> Linear head"""
+    def __init__(self):
+        super().__init__()
+        self.classifier = nn.Sequential(
+            nn.Linear(64, 64), nn.ReLU(), nn.BatchNorm1d(64), nn.Dropout(0.4),
+            nn.Linear(64, 32), nn.ReLU(), nn.BatchNorm1d(32), nn.Dropout(0.3),
+            nn.Linear(32, 1),
+        )
+
+    def forward(self, x):
+        return self.classifier(x)
+
+
+class BatchNormAct(nn.BatchNorm1d):
+    """Like timm's BatchNormAct2d: a BatchNorm subclass that also applies an activation"""
+    def forward(self, x):
+        return torch.relu(super().forward(x))
+
+
+def assert_equivalent(reference, optimized, batch):
+    with torch.no_grad():
+        expected = reference(batch)
+    with torch.inference_mode():
+        actual = optimized(batch)
+    assert actual.shape == expected.shape
+    assert (actual - expected).abs().max().item() < TOLERANCE
+
+
+def count(model, module_type):
+    return sum(type(m) is module_type for m in model.modules())
+
+
+def test_eager_folds_and_strips_image_model():
+    torch.manual_seed(0)
+    reference = randomize_batchnorm(ImageStandIn()).eval()
+    optimized, level = optimize_model(copy.deepcopy(reference), "eager", channels_last=True)
+    assert level == "eager"
+    assert count(optimized, nn.BatchNorm1d) == 0 and count(optimized, nn.BatchNorm2d) == 0
+    assert count(optimized, nn.Dropout) == 0
+    assert optimized.backbone[0].weight.is_contiguous(memory_format=torch.channels_last)
+    assert dict(optimized.named_modules()).keys() == dict(reference.named_modules()).keys()  # no renamed layers
+    for batch_size in (1, 4):
+        assert_equivalent(reference, optimized, torch.rand(batch_size, 3, 32, 32))
+
+
+def test_eager_folds_batchnorm_after_activation():
+    torch.manual_seed(0)
+    reference = randomize_batchnorm(VoiceHead()).eval()
+    optimized = copy.deepcopy(reference)
+    assert fold_batchnorm(optimized) == 2
+    assert strip_dropout(optimized) == 2
+    assert count(optimized, nn.BatchNorm1d) == 0
+    assert_equivalent(reference, optimized, torch.randn(5, 64))
+
+
+def test_batchnorm_subclasses_not_folded():
+    model = nn.Sequential(nn.Linear(8, 8), BatchNormAct(8), nn.Linear(8, 1)).eval()
+    assert fold_batchnorm(model) == 0
+    assert isinstance(model[1], BatchNormAct)
+
+
+def test_freeze_and_compile_match_eager():
+    torch.manual_seed(0)
+    reference = randomize_batchnorm(ImageStandIn()).eval()
+    example = torch.rand(2, 3, 32, 32)
+    frozen, level = optimize_model(copy.deepcopy(reference), "freeze", example, channels_last=True)
+    assert level == "freeze" and isinstance(frozen, torch.jit.ScriptModule)
+    for batch_size in (1, 3, 8):  # traced at batch 2, batch axis stays dynamic
+        assert_equivalent(reference, frozen, torch.rand(batch_size, 3, 32, 32))
+
+    compiled, level = optimize_model(copy.deepcopy(reference), "compile", example)
+    if level == "compile":
+        assert_equivalent(reference, compiled, torch.rand(3, 3, 32, 32))
+    else:
+        print("   torch.compile unavailable here, fell back to eager")
+
+
+def test_falls_back_to_eager():
+    class Untraceable(ImageStandIn):
+        def forward(self, x):
+            return {"logits": super().forward(x)}  # dict outputs are rejected by torch.jit.trace
+
+    reference = randomize_batchnorm(Untraceable()).eval()
+    optimized, level = optimize_model(copy.deepcopy(reference), "freeze", torch.rand(2, 3, 32, 32))
+    assert level == "eager" and isinstance(optimized, Untraceable)
+    _, level = optimize_model(copy.deepcopy(reference), "freeze")  # no example input
+    assert level == "eager"
+    model = ImageStandIn()
+    assert optimize_model(model, "none") == (model, "none")
+    try:
+        optimize_model(model, "turbo")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_sota_architectures_equivalent():
+    try:
+        from sota_models import DeepfakeImageDetector, DeepfakeVideoDetector
+    except ImportError as e:
+        print(f"   skipped: {e}")
+        return
+    torch.manual_seed(0)
+    for cls, size in ((DeepfakeImageDetector, 224), (DeepfakeVideoDetector, 224)):
+        reference = calibrate_batchnorm(cls(pretrained=False), size)
+        example = torch.rand(2, 3, size, size)
+        frozen, _ = optimize_model(copy.deepcopy(reference), "freeze", example, channels_last=True)
+        assert_equivalent(reference, frozen, torch.rand(3, 3, size, size))
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("GRAPH OPTIMIZATION EQUIVALENCE TEST")
+    print("=" * 60)
+    for test in (
+        test_eager_folds_and_strips_image_model,
+        test_eager_folds_batchnorm_after_activation,
+        test_batchnorm_subclasses_not_folded,
+        test_freeze_and_compile_match_eager,
+        test_falls_back_to_eager,
+        test_sota_architectures_equivalent,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
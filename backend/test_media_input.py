@@ -0,0 +1,147 @@
+"""
+Media Input Test (offline)
+Checks that MediaInput materialises an upload once, that OpenCV can read its
+path while it is open, and that close() / the context manager release the
+memfd or delete the temp file it was written to.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+import shared.media.input as media_input
+from shared.media import MediaInput
+
+
+def video_bytes(frame_count=10):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clip.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25.0, (64, 48))
+        for index in range(frame_count):
+            writer.write(np.full((48, 64, 3), index * 20, dtype=np.uint8))
+        writer.release()
+        with open(path, "rb") as f:
+            return f.read()
+
+
+def png_bytes():
+    ok, encoded = cv2.imencode(".png", np.arange(48 * 64 * 3, dtype=np.uint8).reshape(48, 64, 3))
+    assert ok
+    return encoded.tobytes()
+
+
+def assert_readable_by_cv2(path, frame_count):
+    cap = cv2.VideoCapture(path)
+    try:
+        assert cap.isOpened(), path
+        assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == frame_count
+        ok, frame = cap.read()
+        assert ok and frame.shape == (48, 64, 3)
+    finally:
+        cap.release()
+
+
+@contextmanager
+def without_memfd(tmpfs_dir):
+    """Force the temp-file fallback, writing to `tmpfs_dir` instead of /dev/shm"""
+    memfd_create = getattr(os, "memfd_create", None)
+    original_dir = media_input._TMPFS_DIR
+    if memfd_create is not None:
+        del os.memfd_create
+    media_input._TMPFS_DIR = tmpfs_dir
+    try:
+        yield
+    finally:
+        media_input._TMPFS_DIR = original_dir
+        if memfd_create is not None:
+            os.memfd_create = memfd_create
+
+
+def test_memfd_released_on_close():
+    if not hasattr(os, "memfd_create"):
+        print("   skipped: no memfd_create on this platform")
+        return
+    media = MediaInput(video_bytes(), suffix=".avi")
+    path = media.path()
+    assert path.startswith("/proc/self/fd/") and media.path() == path  # materialised once
+    (fd,) = media.inheritable_fds()
+    assert_readable_by_cv2(path, 10)
+    media.close()
+    try:
+        os.fstat(fd)
+        assert False, "memfd still open after close()"
+    except OSError:
+        pass
+    assert media.inheritable_fds() == ()
+    media.close()  # idempotent
+
+
+def test_memfd_released_by_context_manager():
+    if not hasattr(os, "memfd_create"):
+        print("   skipped: no memfd_create on this platform")
+        return
+    data = png_bytes()
+    with MediaInput(data, suffix=".png") as media:
+        image = cv2.imread(media.path())
+        assert image is not None and image.shape == (48, 64, 3)
+        (fd,) = media.inheritable_fds()
+        with open(media.path(), "rb") as f:
+            assert f.read() == data
+    try:
+        os.fstat(fd)
+        assert False, "memfd still open after the with block"
+    except OSError:
+        pass
+
+
+def test_temp_file_deleted_on_close():
+    with tempfile.TemporaryDirectory() as tmp, without_memfd(tmp):
+        media = MediaInput(video_bytes(), suffix=".avi")
+        path = media.path()
+        assert os.path.dirname(path) == tmp and path.endswith(".avi")
+        assert media.inheritable_fds() == ()
+        assert_readable_by_cv2(path, 10)
+        media.close()
+        assert not os.path.exists(path)
+
+        with MediaInput(video_bytes(5), suffix=".avi") as media:
+            path = media.path()
+            assert_readable_by_cv2(path, 5)
+        assert not os.path.exists(path)
+        assert os.listdir(tmp) == []
+
+
+def test_temp_file_deleted_when_request_fails():
+    with tempfile.TemporaryDirectory() as tmp, without_memfd(tmp):
+        try:
+            with MediaInput(png_bytes(), suffix=".png") as media:
+                media.path()
+                raise RuntimeError("model failed")
+        except RuntimeError:
+            pass
+        assert os.listdir(tmp) == []
+
+
+def test_close_without_path_is_noop():
+    media = MediaInput(b"bytes that never hit the filesystem")
+    assert media.buffer().read() == media.data and len(media) == len(media.data)
+    media.close()
+    assert media.inheritable_fds() == ()
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("MEDIA INPUT TEST")
+    print("=" * 60)
+    for test in (
+        test_memfd_released_on_close,
+        test_memfd_released_by_context_manager,
+        test_temp_file_deleted_on_close,
+        test_temp_file_deleted_when_request_fails,
+        test_close_without_path_is_noop,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
@@ -0,0 +1,128 @@
+"""
+Micro-Batcher Test (offline)
+Checks that MicroBatcher coalesces concurrent submits up to max_batch_size,
+flushes a partial batch after max_wait_ms, hands a model exception to every
+caller of the batch, skips callers that were cancelled while queued and runs
+its batches under the InferenceExecutor's per-modality limit.
+"""
+import asyncio
+import threading
+import time
+
+from shared.inference import InferenceExecutor, MicroBatcher
+
+
+def recording_batch_fn(batches):
+    def batch_fn(items):
+        batches.append(list(items))
+        return [item * 10 for item in items]
+    return batch_fn
+
+
+def test_coalesces_up_to_max_batch_size():
+    batches = []
+    batcher = MicroBatcher("image", recording_batch_fn(batches), max_batch_size=4, max_wait_ms=200)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    assert asyncio.run(run()) == [i * 10 for i in range(10)]  # each caller gets its own result
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert sorted(item for batch in batches for item in batch) == list(range(10))
+
+
+def test_partial_batch_flushed_after_max_wait():
+    batches = []
+    batcher = MicroBatcher("image", recording_batch_fn(batches), max_batch_size=16, max_wait_ms=50)
+
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(run())
+    assert results == [0, 10, 20]
+    assert batches == [[0, 1, 2]]
+    assert 0.045 <= elapsed < 0.5, elapsed
+
+
+def test_model_exception_reaches_every_caller():
+    calls = []
+
+    def failing(items):
+        calls.append(len(items))
+        raise ValueError("CUDA out of memory")
+
+    batcher = MicroBatcher("image", failing, max_batch_size=8, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert calls == [5]
+    assert all(isinstance(result, ValueError) and str(result) == "CUDA out of memory" for result in results)
+
+    wrong_length = MicroBatcher("image", lambda items: items[:1], max_batch_size=8, max_wait_ms=20)
+
+    async def run_wrong_length():
+        return await asyncio.gather(*(wrong_length.submit(i) for i in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(run_wrong_length()))
+
+
+def test_cancelled_callers_skipped():
+    batches = []
+    batcher = MicroBatcher("image", recording_batch_fn(batches), max_batch_size=8, max_wait_ms=100)
+
+    async def run():
+        tasks = [asyncio.create_task(batcher.submit(i)) for i in range(4)]
+        await asyncio.sleep(0.01)  # all queued, batch still waiting for company
+        tasks[1].cancel()
+        tasks[2].cancel()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert batches == [[0, 3]]
+    assert results[0] == 0 and results[3] == 30
+    assert all(isinstance(result, asyncio.CancelledError) for result in results[1:3])
+
+
+def test_batches_respect_modality_limit():
+    executor = InferenceExecutor(model_workers=2, modality_limits={"image": 1})
+    batches = []
+    batcher = MicroBatcher("image", recording_batch_fn(batches), max_batch_size=4, max_wait_ms=1, executor=executor)
+    release = threading.Event()
+
+    async def run():
+        # A single-image forward pass holds the only "image" slot; a model worker is still free
+        busy = asyncio.create_task(executor.run_model("image", release.wait, 5))
+        await asyncio.sleep(0.05)
+        submitted = asyncio.create_task(batcher.submit(1))
+        await asyncio.sleep(0.2)
+        assert batches == [] and not submitted.done()  # waiting for the slot, not the pool
+        release.set()
+        await busy
+        return await submitted
+
+    try:
+        assert asyncio.run(run()) == 10
+        assert batches == [[1]]
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("MICRO-BATCHER TEST")
+    print("=" * 60)
+    for test in (
+        test_coalesces_up_to_max_batch_size,
+        test_partial_batch_flushed_after_max_wait,
+        test_model_exception_reaches_every_caller,
+        test_cancelled_callers_skipped,
+        test_batches_respect_modality_limit,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
@@ -0,0 +1,155 @@
+"""
+Model Artifact Test (offline)
+Checks artifact round trips, manifest verification, meta-device builds over
+mmap-backed weights, the fallback for non-persistent buffers and which
+MODEL_ARTIFACT_DIR layouts the loaders pick artifacts up from.
+"""
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+
+from shared.inference import ArtifactError, build_module, read_artifact, verify_artifact, write_artifact
+
+
+def make_model():
+    return nn.Sequential(nn.Linear(16, 32), nn.BatchNorm1d(32), nn.ReLU(), nn.Linear(32, 1))
+
+
+class WithNonPersistentBuffer(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.linear = nn.Linear(4, 1)
+        self.register_buffer("scale", torch.full((1,), 2.0), persistent=False)
+
+    def forward(self, x):
+        return self.linear(x) * self.scale
+
+
+def test_round_trip_matches_original():
+    torch.manual_seed(0)
+    original = make_model().eval()
+    inputs = torch.randn(4, 16)
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = write_artifact(Path(tmp), original.state_dict(), {"hidden": 32}, source={"repo_id": "local/test"})
+        assert set(manifest["files"]) == {"weights.pt", "config.json"}
+        assert manifest["source"]["repo_id"] == "local/test"
+
+        state_dict, config = read_artifact(Path(tmp), verify_checksums=True)
+        assert config == {"hidden": 32}
+        rebuilt = build_module(make_model, state_dict)
+        assert not any(p.is_meta for p in rebuilt.parameters())
+        assert not rebuilt.training
+        with torch.no_grad():
+            assert torch.equal(original(inputs), rebuilt(inputs))
+
+
+def test_manifest_detects_corruption():
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_artifact(directory, make_model().state_dict(), {})
+        verify_artifact(directory, checksums=True)
+
+        # Same size, different bytes: only the checksum pass catches it
+        weights = directory / "weights.pt"
+        data = bytearray(weights.read_bytes())
+        data[-100] ^= 0xFF
+        weights.write_bytes(bytes(data))
+        verify_artifact(directory)
+        try:
+            verify_artifact(directory, checksums=True)
+            assert False, "expected a checksum mismatch"
+        except ArtifactError:
+            pass
+
+        # Truncation is caught by the size check alone
+        weights.write_bytes(bytes(data[:-10]))
+        try:
+            verify_artifact(directory)
+            assert False, "expected a size mismatch"
+        except ArtifactError:
+            pass
+
+        # No manifest = incomplete artifact
+        (directory / "manifest.json").unlink()
+        try:
+            read_artifact(directory)
+            assert False, "expected a missing manifest error"
+        except ArtifactError:
+            pass
+
+
+def test_manifest_covers_extra_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        (directory / "hf").mkdir()
+        (directory / "hf" / "tokenizer.json").write_text(json.dumps({"vocab": []}))
+        manifest = write_artifact(directory, None, {"task": "text-classification"})
+        assert set(manifest["files"]) == {"config.json", "hf/tokenizer.json"}
+        verify_artifact(directory, checksums=True)
+
+
+def test_non_persistent_buffers_fall_back_to_cpu_build():
+    original = WithNonPersistentBuffer().eval()
+    with tempfile.TemporaryDirectory() as tmp:
+        write_artifact(Path(tmp), original.state_dict(), {})
+        state_dict, _ = read_artifact(Path(tmp))
+        rebuilt = build_module(WithNonPersistentBuffer, state_dict)
+        assert not rebuilt.scale.is_meta
+        x = torch.ones(1, 4)
+        with torch.no_grad():
+            assert torch.equal(original(x), rebuilt(x))
+
+
+def test_artifact_dir_lookup():
+    try:
+        import sota_models
+    except ImportError as e:
+        print(f"   skipped: {e}")
+        return
+    from shared.config import settings
+
+    original = settings.model_artifact_dir
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_artifact(Path(tmp) / "image", make_model().state_dict(), {})
+            cases = (
+                ("", None, False),  # unset
+                (f"{tmp}/missing", None, False),  # e.g. the image default without baked artifacts
+                (tmp, Path(tmp) / "image", False),
+            )
+            for directory, expected, warns in cases:
+                settings.model_artifact_dir = directory
+                output = io.StringIO()
+                with redirect_stdout(output):
+                    assert sota_models.local_artifact("image") == expected, directory
+                assert ("No local artifact" in output.getvalue()) == warns, directory
+
+            # A baked directory without this model's artifact is worth a warning
+            settings.model_artifact_dir = tmp
+            output = io.StringIO()
+            with redirect_stdout(output):
+                assert sota_models.local_artifact("voice") is None
+            assert "No local artifact for voice" in output.getvalue()
+    finally:
+        settings.model_artifact_dir = original
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("MODEL ARTIFACT TEST")
+    print("=" * 60)
+    for test in (
+        test_round_trip_matches_original,
+        test_manifest_detects_corruption,
+        test_manifest_covers_extra_files,
+        test_non_persistent_buffers_fall_back_to_cpu_build,
+        test_artifact_dir_lookup,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
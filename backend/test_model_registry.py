@@ -0,0 +1,130 @@
+"""
+Model Registry Test (offline)
+Checks single-flight loading, warmup, failure handling and LRU eviction under
+a memory budget, using small torch models in place of the real detectors.
+"""
+import threading
+import time
+
+import torch
+import torch.nn as nn
+
+from shared.inference import ModelRegistry
+
+
+def make_loader(calls, name, params=1_000_000, delay=0.0):
+    def load():
+        calls.append(name)
+        time.sleep(delay)
+        return nn.Linear(params // 1000, 1000, bias=False)  # ~4 MB of float32 weights per million params
+    return load
+
+
+def test_single_flight_loading():
+    calls, warmups = [], []
+    registry = ModelRegistry()
+    registry.register("voice", make_loader(calls, "voice", delay=0.2), warmup=lambda model: warmups.append(model))
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("voice"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["voice"]
+    assert len(warmups) == 1
+    assert all(model is results[0] for model in results)
+    status = registry.status()["voice"]
+    assert status["state"] == "ready" and status["loads"] == 1
+    assert status["memory_mb"] >= 3.5  # at least the weights are charged
+
+
+def test_failed_load_is_reported_and_retried():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("download failed")
+        return nn.Linear(4, 1)
+
+    registry = ModelRegistry()
+    registry.register("text", flaky)
+    try:
+        registry.get("text")
+        assert False, "expected the load error to propagate"
+    except RuntimeError:
+        pass
+    assert registry.state("text") == "failed"
+    assert registry.status()["text"]["error"] == "download failed"
+    assert isinstance(registry.get("text"), nn.Linear)
+    assert registry.state("text") == "ready"
+
+
+def test_lru_eviction_respects_budget_and_in_use():
+    calls = []
+    registry = ModelRegistry(memory_budget_mb=10, warmup=False)
+    for name in ("image", "video", "voice"):
+        registry.register(name, make_loader(calls, name))  # ~4 MB each
+
+    registry.get("image")
+    registry.get("video")
+    registry.get("image")  # video is now least recently used
+    registry.get("voice")
+    assert registry.is_loaded("image") and registry.is_loaded("voice")
+    assert registry.state("video") == "unloaded"
+    assert registry.resident_bytes() <= 10 * 2**20
+
+    # A model held by use() is never evicted, even if it is the LRU one
+    with registry.use("image"):
+        time.sleep(0.01)
+        registry.get("voice")
+        registry.get("video")
+        assert registry.is_loaded("image")
+    assert registry.state("voice") == "unloaded"
+
+    # Evicted models reload transparently on next use
+    registry.get("voice")
+    assert calls.count("voice") == 2
+
+
+def test_warmup_runs_forward_pass():
+    registry = ModelRegistry()
+    seen = []
+    registry.register(
+        "image",
+        lambda: nn.Conv2d(3, 4, 3),
+        warmup=lambda model: seen.append(model(torch.zeros(1, 3, 8, 8)).shape),
+    )
+    registry.get("image")
+    assert seen == [torch.Size([1, 4, 6, 6])]
+    assert registry.status()["image"]["warmup_seconds"] >= 0
+
+
+def test_deferred_warmup_of_loaded_models():
+    """Preload without warmup (prefork master), warm up later (each forked worker)"""
+    registry = ModelRegistry(warmup=False)
+    seen = []
+    registry.register("image", lambda: nn.Conv2d(3, 4, 3), warmup=lambda model: seen.append("image"))
+    registry.register("voice", lambda: nn.Linear(4, 1), warmup=lambda model: seen.append("voice"))
+    registry.get("image")
+    assert seen == []
+    registry.warmup_loaded()
+    assert seen == ["image"]  # voice isn't loaded
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("MODEL REGISTRY TEST")
+    print("=" * 60)
+    for test in (
+        test_single_flight_loading,
+        test_failed_load_is_reported_and_retried,
+        test_lru_eviction_respects_budget_and_in_use,
+        test_warmup_runs_forward_pass,
+        test_deferred_warmup_of_loaded_models,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
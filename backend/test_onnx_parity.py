@@ -0,0 +1,133 @@
+"""
+ONNX Backend Parity Test (offline)
+Checks that ONNX Runtime logits match eager torch across batch sizes, that
+cached exports are reused or replaced, that failures fall back to torch and
+that prefork workers rebuild inherited sessions with their own thread count.
+Uses the real detector architectures (random weights) when timm is installed.
+"""
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import torch
+import torch.nn as nn
+
+from shared.inference.onnx_backend import ONNXRUNTIME_AVAILABLE, OnnxModel, export_onnx, onnx_or_torch
+
+TOLERANCE = 1e-4
+
+
+class SmallDetector(nn.Module):
+    """Conv backbone + BatchNorm1d/Dropout head, shaped like the SOTA detectors"""
+    def __init__(self):
+        super().__init__()
+        self.backbone = nn.Sequential(
+            nn.Conv2d(3, 16, 3, stride=2, padding=1), nn.BatchNorm2d(16), nn.SiLU(),
+            nn.Conv2d(16, 32, 3, stride=2, padding=1), nn.BatchNorm2d(32), nn.SiLU(),
+            nn.AdaptiveAvgPool2d(1), nn.Flatten(),
+        )
+        self.classifier = nn.Sequential(
+            nn.Linear(32, 64), nn.BatchNorm1d(64), nn.ReLU(), nn.Dropout(0.3), nn.Linear(64, 1),
+        )
+
+    def forward(self, x):
+        return self.classifier(self.backbone(x))
+
+
+def check_parity(model, input_size, batch_sizes=(1, 4, 8)):
+    with tempfile.TemporaryDirectory() as tmp:
+        session = OnnxModel(export_onnx(model, Path(tmp) / "model.onnx", input_size))
+        for batch_size in batch_sizes:
+            batch = torch.rand(batch_size, 3, input_size, input_size)
+            with torch.no_grad():
+                expected = model(batch)
+            actual = session(batch)
+            assert actual.shape == expected.shape
+            assert (actual - expected).abs().max().item() < TOLERANCE, batch_size
+
+
+def test_logit_parity_across_batch_sizes():
+    torch.manual_seed(0)
+    check_parity(SmallDetector().eval(), 64)
+
+
+def test_sota_architectures_parity():
+    try:
+        from sota_models import DeepfakeImageDetector, DeepfakeVideoDetector
+    except ImportError as e:
+        print(f"   skipped: {e}")
+        return
+    torch.manual_seed(0)
+    check_parity(DeepfakeImageDetector(pretrained=False).eval(), 380, batch_sizes=(1, 2))
+    check_parity(DeepfakeVideoDetector(pretrained=False).eval(), 299, batch_sizes=(1, 2))
+
+
+def test_cached_export_reused_and_stale_export_replaced():
+    torch.manual_seed(0)
+    model = SmallDetector().eval()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "image.onnx"
+        session, backend = onnx_or_torch(model, path, 32)
+        assert backend == "onnx" and isinstance(session, OnnxModel)
+        mtime = path.stat().st_mtime_ns
+        _, backend = onnx_or_torch(model, path, 32)
+        assert backend == "onnx" and path.stat().st_mtime_ns == mtime  # reused
+
+        # Different weights: the cached graph fails parity and is re-exported
+        retrained = SmallDetector().eval()
+        session, backend = onnx_or_torch(retrained, path, 32)
+        assert backend == "onnx"
+        batch = torch.rand(3, 3, 32, 32)
+        with torch.no_grad():
+            assert (session(batch) - retrained(batch)).abs().max().item() < TOLERANCE
+
+
+def test_falls_back_to_torch():
+    class NotExportable(nn.Module):
+        def forward(self, x):
+            return torch.tensor([[float(x.sum().item() > 0)]]).expand(x.shape[0], 1) + torch.fft.rfft2(x).abs().mean()
+
+    model = NotExportable()
+    with tempfile.TemporaryDirectory() as tmp:
+        returned, backend = onnx_or_torch(model, Path(tmp) / "broken.onnx", 16, tolerance=0.0)
+    assert backend == "torch" and returned is model
+
+
+def test_prefork_worker_rebuilds_sessions():
+    from serve_prefork import rebuild_onnx_sessions
+    from shared.inference.registry import ModelRegistry
+
+    torch.manual_seed(0)
+    model = SmallDetector().eval()
+    with tempfile.TemporaryDirectory() as tmp:
+        session = OnnxModel(export_onnx(model, Path(tmp) / "model.onnx", 32), intra_op_threads=1)  # as the master loads
+        registry = ModelRegistry(warmup=False)
+        registry.register("image", lambda: SimpleNamespace(model=session))
+        registry.register("text", lambda: SimpleNamespace(model=model))  # torch models are left alone
+        registry.get("image")
+        registry.get("text")
+        rebuild_onnx_sessions(SimpleNamespace(model_registry=registry), 3)
+        assert session.intra_op_threads == 3
+        assert session.session.get_session_options().intra_op_num_threads == 3
+        batch = torch.rand(4, 3, 32, 32)
+        with torch.no_grad():
+            assert (session(batch) - model(batch)).abs().max().item() < TOLERANCE
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("ONNX BACKEND PARITY TEST")
+    print("=" * 60)
+    if not ONNXRUNTIME_AVAILABLE:
+        print("⚠️  onnxruntime not installed - skipped")
+    else:
+        for test in (
+            test_logit_parity_across_batch_sizes,
+            test_sota_architectures_parity,
+            test_cached_export_reused_and_stale_export_replaced,
+            test_falls_back_to_torch,
+            test_prefork_worker_rebuilds_sessions,
+        ):
+            test()
+            print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
@@ -0,0 +1,126 @@
+"""
+INT8 Quantization Test (offline)
+Checks dynamic and static quantization on small stand-ins for the detector
+heads / BiGRU and the fallback from static to dynamic.
+"""
+import torch
+import torch.nn as nn
+
+from shared.inference.quantization import model_size_bytes, quantize_model
+
+
+class Head(nn.Module):
+    """Linear-heavy classifier head like DeepfakeImageDetector's"""
+    def __init__(self):
+        super().__init__()
+        self.classifier = nn.Sequential(
+            nn.Linear(256, 512), nn.BatchNorm1d(512), nn.ReLU(),
+            nn.Linear(512, 128), nn.ReLU(), nn.Linear(128, 1),
+        )
+
+    def forward(self, x):
+        return self.classifier(x)
+
+
+class RecurrentHead(nn.Module):
+    """BiGRU + Linear, like the voice detector's temporal head"""
+    def __init__(self):
+        super().__init__()
+        self.gru = nn.GRU(64, 32, num_layers=2, batch_first=True, bidirectional=True)
+        self.out = nn.Linear(64, 1)
+
+    def forward(self, x):
+        output, _ = self.gru(x)
+        return self.out(output.mean(dim=1))
+
+
+class SmallCNN(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.features = nn.Sequential(
+            nn.Conv2d(3, 16, 3, padding=1), nn.BatchNorm2d(16), nn.ReLU(),
+            nn.Conv2d(16, 32, 3, stride=2, padding=1), nn.BatchNorm2d(32), nn.ReLU(),
+            nn.AdaptiveAvgPool2d(1),
+        )
+        self.fc = nn.Linear(32, 1)
+
+    def forward(self, x):
+        return self.fc(torch.flatten(self.features(x), 1))
+
+
+class Untraceable(SmallCNN):
+    def forward(self, x):
+        if x.sum() > 0:  # data-dependent control flow defeats FX tracing
+            x = x * 2
+        return super().forward(x)
+
+
+def test_dynamic_quantizes_linear_layers():
+    torch.manual_seed(0)
+    model = Head().eval()
+    x = torch.randn(8, 256)
+    quantized, mode = quantize_model(model, "dynamic")
+    assert mode == "dynamic"
+    assert isinstance(quantized.classifier[0], torch.ao.nn.quantized.dynamic.Linear)
+    assert isinstance(model.classifier[0], nn.Linear)  # original untouched
+    with torch.no_grad():
+        assert (model(x) - quantized(x)).abs().max().item() < 0.05
+    assert model_size_bytes(quantized) < model_size_bytes(model) / 2.5
+
+
+def test_dynamic_quantizes_gru():
+    torch.manual_seed(0)
+    model = RecurrentHead().eval()
+    x = torch.randn(2, 20, 64)
+    quantized, _ = quantize_model(model, "dynamic")
+    assert isinstance(quantized.gru, torch.ao.nn.quantized.dynamic.GRU)
+    with torch.no_grad():
+        assert (model(x) - quantized(x)).abs().max().item() < 0.05
+
+
+def test_static_quantizes_cnn_with_calibration():
+    torch.manual_seed(0)
+    model = SmallCNN().eval()
+    calibration = [torch.rand(4, 3, 32, 32) for _ in range(8)]
+    quantized, mode = quantize_model(model, "static", calibration)
+    assert mode == "static"
+    x = torch.rand(4, 3, 32, 32)
+    with torch.no_grad():
+        reference, output = model(x), quantized(x)
+    assert output.dtype == torch.float32
+    assert (reference - output).abs().max().item() < 0.1
+
+
+def test_static_falls_back_to_dynamic():
+    model = Untraceable().eval()
+    quantized, mode = quantize_model(model, "static", [torch.rand(2, 3, 32, 32)])
+    assert mode == "dynamic"
+    assert isinstance(quantized.fc, torch.ao.nn.quantized.dynamic.Linear)
+    _, mode = quantize_model(SmallCNN().eval(), "static", [])  # no calibration data
+    assert mode == "dynamic"
+
+
+def test_none_and_unknown_modes():
+    model = Head()
+    assert quantize_model(model, "none") == (model, "none")
+    try:
+        quantize_model(model, "int4")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("INT8 QUANTIZATION TEST")
+    print("=" * 60)
+    for test in (
+        test_dynamic_quantizes_linear_layers,
+        test_dynamic_quantizes_gru,
+        test_static_quantizes_cnn_with_calibration,
+        test_static_falls_back_to_dynamic,
+        test_none_and_unknown_modes,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
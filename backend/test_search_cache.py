@@ -0,0 +1,85 @@
+"""
+Search Cache Test (offline)
+Checks TTL/LRU caching and singleflight coalescing with a fake search call.
+"""
+import asyncio
+
+from shared.cache import SearchCache
+
+
+class FakeSearch:
+    """Counts calls; each search takes ``delay`` seconds."""
+
+    def __init__(self, delay=0.05, fail=False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self, query, **params):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("search backend down")
+        return {"query": query, "results": [{"title": "result", "score": 0.9}]}
+
+
+def test_concurrent_identical_queries_share_one_call():
+    async def run():
+        cache = SearchCache(ttl_seconds=60)
+        fetch = FakeSearch()
+        results = await asyncio.gather(*[
+            cache.search(fetch, "verify: the moon landing was faked", max_results=5) for _ in range(10)
+        ])
+        assert fetch.calls == 1
+        assert all(result is results[0] for result in results)
+
+        # Served from cache afterwards, regardless of case/whitespace
+        await cache.search(fetch, "Verify:  the moon landing was faked ", max_results=5)
+        assert fetch.calls == 1
+        # Different parameters are a different search
+        await cache.search(fetch, "verify: the moon landing was faked", max_results=3)
+        assert fetch.calls == 2
+    asyncio.run(run())
+
+
+def test_failures_propagate_and_are_not_cached():
+    async def run():
+        cache = SearchCache(ttl_seconds=60)
+        fetch = FakeSearch(fail=True)
+        results = await asyncio.gather(
+            *[cache.search(fetch, "query") for _ in range(3)], return_exceptions=True
+        )
+        assert fetch.calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        fetch.fail = False
+        assert (await cache.search(fetch, "query"))["results"]
+        assert fetch.calls == 2
+    asyncio.run(run())
+
+
+def test_cancelled_caller_does_not_cancel_shared_search():
+    async def run():
+        cache = SearchCache(ttl_seconds=60)
+        fetch = FakeSearch(delay=0.1)
+        first = asyncio.ensure_future(cache.search(fetch, "query"))
+        second = asyncio.ensure_future(cache.search(fetch, "query"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert (await second)["query"] == "query"
+        assert fetch.calls == 1
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("SEARCH CACHE TEST")
+    print("=" * 60)
+    for test in (
+        test_concurrent_identical_queries_share_one_call,
+        test_failures_propagate_and_are_not_cached,
+        test_cancelled_caller_does_not_cancel_shared_search,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
@@ -0,0 +1,82 @@
+"""
+Text Pipeline Caching Test (offline)
+Runs /api/v1/check-text with a stub RoBERTa model and a Tavily client whose
+backend is down, then recovers: the RoBERTa-only verdict produced during the
+outage must not be cached, so the next identical claim retries the web stage,
+while a web-backed verdict is cached.
+"""
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("MODEL_BACKGROUND_LOADING", "true")  # don't load the real detectors on import
+
+import httpx
+from fastapi.testclient import TestClient
+
+import ai_server_sota as server
+from shared.clients import TavilySearchClient
+
+CLAIM = "The regional council approved the harbour bridge budget at its Tuesday session"
+
+
+class FlakyTavily:
+    """Tavily backend answering 503 while `down`, then one confirming source"""
+    def __init__(self):
+        self.down = True
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        if self.down:
+            return httpx.Response(503, text="service unavailable")
+        return httpx.Response(200, json={"query": CLAIM, "answer": None, "results": [{
+            "title": "Council confirms harbour bridge budget",
+            "url": "https://www.reuters.com/world/harbour-bridge-budget",
+            "content": "Officials confirmed the council approved the budget, according to official records.",
+            "score": 0.93,
+        }]})
+
+
+def test_roberta_fallback_not_cached():
+    backend = FlakyTavily()
+    client = TavilySearchClient("test-key", base_url="http://stub", transport=httpx.MockTransport(backend))
+    server.model_registry.register(
+        "text", lambda: SimpleNamespace(model=lambda text: [{"label": "FAKE", "score": 0.9}])
+    )
+    server.model_registry.get("text")
+
+    originals = (server.tavily, server.gemini_model, server.settings.claim_cache_enabled)
+    server.tavily, server.gemini_model, server.settings.claim_cache_enabled = client, None, True
+    try:
+        api = TestClient(server.app)
+        check = lambda: api.post("/api/v1/check-text", json={"text": CLAIM})
+
+        first = check()
+        assert first.status_code == 200, first.text
+        assert abs(first.json()["confidence"] - 0.72) < 1e-9  # RoBERTa only: max(0.55, 0.9 * 0.8)
+        assert backend.calls == 1
+
+        # Still down: not served from the cache, the web stage is tried again
+        assert check().status_code == 200
+        assert backend.calls == 2
+
+        # Back up: a web-backed verdict, which is cached
+        backend.down = False
+        recovered = check().json()
+        assert backend.calls == 3 and abs(recovered["confidence"] - 0.72) > 1e-3
+        assert check().json() == recovered
+        assert backend.calls == 3
+    finally:
+        server.tavily, server.gemini_model, server.settings.claim_cache_enabled = originals
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("TEXT PIPELINE CACHING TEST")
+    print("=" * 60)
+    for test in (
+        test_roberta_fallback_not_cached,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
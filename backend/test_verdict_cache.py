@@ -0,0 +1,139 @@
+"""
+Verdict Cache Test (offline)
+Exercises the two-tier content-hash and claim caches against the in-memory
+FakeRedis, and checks that the server tags cached verdicts with the backend and
+quantization a detector actually loaded with.
+"""
+import asyncio
+import os
+from types import SimpleNamespace
+
+from shared.cache import ClaimCache, FakeRedis, VerdictCache, classify_claim, content_digest, normalize_claim
+
+VERDICT = {"is_fake": True, "confidence": 0.91, "analysis": "FAKE", "verdict": "FAKE", "details": None}
+
+
+def make_cache(redis, version="v1", max_entries=100):
+    return VerdictCache(model_versions={"image": version}, redis=redis, ttl_seconds=60, max_entries=max_entries)
+
+
+def test_local_and_redis_tiers():
+    async def run():
+        redis = FakeRedis()
+        digest = content_digest(b"viral image bytes")
+
+        writer = make_cache(redis)
+        assert await writer.get("image", digest) is None
+        await writer.set("image", digest, VERDICT)
+        assert await writer.get("image", digest) == VERDICT
+
+        # A second worker with a cold local tier is served from Redis
+        reader = make_cache(redis)
+        assert await reader.get("image", digest) == VERDICT
+        assert len(reader.local) == 1
+    asyncio.run(run())
+
+
+def test_variant_and_version_are_part_of_the_key():
+    async def run():
+        redis = FakeRedis()
+        digest = content_digest(b"video bytes")
+        cache = make_cache(redis)
+        await cache.set("image", digest, VERDICT, variant="frames=10")
+        assert await cache.get("image", digest, variant="frames=20") is None
+        assert await make_cache(redis, version="v2").get("image", digest, variant="frames=10") is None
+    asyncio.run(run())
+
+
+def test_model_upgrade_invalidates_old_entries():
+    async def run():
+        redis = FakeRedis()
+        digest = content_digest(b"image")
+        old = make_cache(redis, version="v1")
+        assert await old.sync_model_version("image") is False
+        await old.set("image", digest, VERDICT)
+
+        upgraded = make_cache(redis, version="v2")
+        assert await upgraded.sync_model_version("image") is True
+        assert [key async for key in redis.scan_iter(match="verdict:image:*")] == []
+        assert await upgraded.sync_model_version("image") is False
+    asyncio.run(run())
+
+
+def test_local_tier_is_bounded():
+    async def run():
+        cache = make_cache(None, max_entries=2)
+        for i in range(3):
+            await cache.set("image", content_digest(bytes([i])), VERDICT)
+        assert len(cache.local) == 2
+        assert await cache.get("image", content_digest(bytes([0]))) is None
+    asyncio.run(run())
+
+
+def test_claim_normalization_and_classes():
+    assert normalize_claim("Vaccines cause autism") == normalize_claim("  vaccines   CAUSE autism.")
+    assert normalize_claim("Café ﬁrst!") == "cafe first"
+    assert classify_claim("Biden is the current president") == "current"
+    assert classify_claim("5G spreads covid") == "stable"
+    assert classify_claim("Paris is the capital of France") == "general"
+
+
+def test_claim_cache_shares_verdicts_across_spellings():
+    async def run():
+        ttls = {"current": 5, "stable": 500, "general": 50}
+        verdicts = VerdictCache(model_versions={"text": "v1"}, redis=FakeRedis(), namespace="claim")
+        cache = ClaimCache(verdicts, ttl_by_class=ttls)
+        await cache.set("Vaccines cause autism", VERDICT)
+        assert await cache.get("vaccines cause autism.") == VERDICT
+        assert await cache.get("vaccines cause asthma") is None
+
+        await cache.set("Who is the current president?", VERDICT)
+        [key] = [key async for key in verdicts.redis.scan_iter(match="claim:text:*:current")]
+        assert verdicts.redis._data[key.decode()][0] is not None
+        assert await cache.invalidate() == 4  # both tiers, two claims
+    asyncio.run(run())
+
+
+def test_version_tag_follows_applied_configuration():
+    os.environ.setdefault("MODEL_BACKGROUND_LOADING", "true")  # don't load the real detectors on import
+    import ai_server_sota as server
+
+    applied = {}
+    original_loader, original_versions = server.load_sota_models, dict(server.model_versions)
+    server.load_sota_models = lambda: SimpleNamespace(
+        load_detector=lambda kind: SimpleNamespace(model=None, **applied[kind])
+    )
+    digest = content_digest(b"same upload")
+    try:
+        keys = set()
+        for backend, quantization, suffix in (
+            ("torch", "none", ""),
+            ("torch", "dynamic", "+int8-dynamic"),  # e.g. MODEL_QUANTIZATION=static fell back to dynamic
+            ("onnx", "none", "+onnx"),  # ONNX-served: quantization skipped whatever was requested
+        ):
+            applied["voice"] = {"backend": backend, "quantization": quantization}
+            server.load_detector("voice")
+            assert server.model_versions["voice"] == server.settings.model_versions["voice"] + suffix
+            keys.add(server.verdict_cache.key("voice", digest))
+        assert len(keys) == 3  # a backend or quantization change never reuses a verdict
+    finally:
+        server.load_sota_models = original_loader
+        server.model_versions.update(original_versions)
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("VERDICT CACHE TEST")
+    print("=" * 60)
+    for test in (
+        test_local_and_redis_tiers,
+        test_variant_and_version_are_part_of_the_key,
+        test_model_upgrade_invalidates_old_entries,
+        test_local_tier_is_bounded,
+        test_claim_normalization_and_classes,
+        test_claim_cache_shares_verdicts_across_spellings,
+        test_version_tag_follows_applied_configuration,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
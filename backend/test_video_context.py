@@ -0,0 +1,135 @@
+"""
+Video Context Test (offline)
+Posts a synthetic clip to /api/v1/check-video with a stub frame model and a
+recording Gemini client, and checks that the upload's metadata is probed once,
+that it is decoded in a single pass and that the SOTA scorer and the Gemini
+verifier both read their frames from that pass.
+"""
+import base64
+import json
+import os
+import tempfile
+from io import BytesIO
+from types import SimpleNamespace
+
+os.environ.setdefault("MODEL_BACKGROUND_LOADING", "true")  # don't load the real detectors on import
+
+import cv2
+import numpy as np
+import torch
+from fastapi.testclient import TestClient
+from PIL import Image
+
+import ai_server_sota as server
+
+FRAME_COUNT = 47
+WIDTH, HEIGHT = 96, 64
+
+
+def clip_bytes():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clip.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25.0, (WIDTH, HEIGHT))
+        for index in range(FRAME_COUNT):
+            writer.write(np.full((HEIGHT, WIDTH, 3), (index * 5, 100, 255 - index * 5), dtype=np.uint8))
+        writer.release()
+        with open(path, "rb") as f:
+            return f.read()
+
+
+class AlwaysFake(torch.nn.Module):
+    def forward(self, batch):
+        return torch.full((len(batch), 1), 3.0)  # P(fake) ~0.95, so Gemini is consulted
+
+
+class RecordingGemini:
+    def __init__(self):
+        self.calls = []
+
+    async def generate(self, parts):
+        self.calls.append(parts)
+        return json.dumps({"is_fake": True, "confidence": 0.9, "reasoning": "stub"})
+
+
+class Recorder:
+    """Counts calls to `fn` and keeps its results"""
+    def __init__(self, fn):
+        self.fn = fn
+        self.results = []
+
+    def __call__(self, *args, **kwargs):
+        result = self.fn(*args, **kwargs)
+        self.results.append(result)
+        return result
+
+
+def test_decoded_once_and_shared_with_gemini():
+    scored = []
+
+    def preprocess(image):
+        scored.append(np.asarray(image).copy())
+        return torch.zeros(3, 8, 8)
+
+    server.model_registry.register(
+        "video", lambda: SimpleNamespace(model=AlwaysFake(), preprocess=preprocess, input_size=32)
+    )
+    server.model_registry.get("video")
+
+    gemini = RecordingGemini()
+    opened = []
+    video_capture = cv2.VideoCapture
+
+    def counting_capture(*args, **kwargs):
+        opened.append(args)
+        return video_capture(*args, **kwargs)
+
+    originals = (server.gemini_model, server.probe_video, server.decode_video_context)
+    settings = (server.settings.verdict_cache_enabled, server.settings.video_audio_analysis)
+    probe = Recorder(server.probe_video)
+    decode = Recorder(server.decode_video_context)
+    server.gemini_model, server.probe_video, server.decode_video_context = gemini, probe, decode
+    server.settings.verdict_cache_enabled = server.settings.video_audio_analysis = False
+    cv2.VideoCapture = counting_capture
+    try:
+        response = TestClient(server.app).post(
+            "/api/v1/check-video", files={"file": ("clip.avi", clip_bytes(), "video/x-msvideo")}
+        )
+    finally:
+        cv2.VideoCapture = video_capture
+        server.gemini_model, server.probe_video, server.decode_video_context = originals
+        server.settings.verdict_cache_enabled, server.settings.video_audio_analysis = settings
+
+    assert response.status_code == 200, response.text
+    assert response.json()["verdict"] == "FAKE"
+
+    # Metadata probed once, frames decoded in one more pass: nothing else opened the upload
+    assert len(probe.results) == 1 and probe.results[0].frame_count == FRAME_COUNT
+    assert len(opened) == 2
+
+    context, scorer_indices = decode.results[0]
+    gemini_indices = server.gemini_frame_indices(FRAME_COUNT)
+    assert set(context.decoded_indices) == set(scorer_indices) | set(gemini_indices)
+
+    # The scorer got the context's frames...
+    assert len(scored) == len(scorer_indices)
+    for pixels, (_, frame) in zip(scored, context.frames(scorer_indices)):
+        assert np.array_equal(pixels, frame)
+
+    # ...and so did Gemini: its JPEG is the context's first frame
+    assert len(gemini.calls) == 1
+    jpeg = base64.b64decode(gemini.calls[0][1]["inline_data"]["data"])
+    sent = np.asarray(Image.open(BytesIO(jpeg)).convert("RGB"), dtype=int)
+    first, middle = context.frames([0])[0][1], context.frames([FRAME_COUNT // 2])[0][1]
+    assert np.abs(sent - first).mean() < 3 < np.abs(sent - middle).mean()
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("VIDEO CONTEXT TEST")
+    print("=" * 60)
+    for test in (
+        test_decoded_once_and_shared_with_gemini,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
@@ -0,0 +1,101 @@
+"""
+Video Frame Sampling Test (offline)
+Writes small synthetic videos with OpenCV and checks that the single-pass
+read_frames_sequential returns the same frame indices and pixels as the
+seek-per-frame read_frames_seek for the sample_frame_indices the detector
+uses, including frame counts the sample count doesn't divide evenly.
+"""
+import tempfile
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from shared.media import read_frames_seek, read_frames_sequential, sample_frame_indices
+
+WIDTH, HEIGHT = 96, 64
+
+
+def synthetic_frame(index):
+    """A frame that differs from every other one: moving gradient plus the index encoded in a bar"""
+    x = np.arange(WIDTH)[None, :, None]
+    y = np.arange(HEIGHT)[:, None, None]
+    frame = ((x * 2 + y * 3 + index * 7 + np.array([0, 60, 120])) % 256).astype(np.uint8)
+    frame[:8, : (index % WIDTH) + 1] = 255
+    return np.ascontiguousarray(frame)
+
+
+def write_video(path, frame_count, codec="mp4v", fps=25.0):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*codec), fps, (WIDTH, HEIGHT))
+    if not writer.isOpened():
+        return False
+    for index in range(frame_count):
+        writer.write(synthetic_frame(index))
+    writer.release()
+    return True
+
+
+def read(reader, path, indices, target_size=None):
+    cap = cv2.VideoCapture(str(path))
+    try:
+        return reader(cap, indices, target_size=target_size)
+    finally:
+        cap.release()
+
+
+def test_sequential_matches_seek():
+    with tempfile.TemporaryDirectory() as tmp:
+        for frame_count, codec, suffix in ((47, "mp4v", ".mp4"), (53, "MJPG", ".avi")):
+            path = Path(tmp) / f"clip{suffix}"
+            if not write_video(path, frame_count, codec):
+                print(f"   skipped {codec}: no encoder")
+                continue
+            for count in (1, 8, 10, 16, frame_count + 5):  # 47 and 53 frames split unevenly
+                indices = sample_frame_indices(frame_count, count)
+                for target_size in (32, None):  # full size last: checked against the written frames below
+                    sequential = read(read_frames_sequential, path, indices, target_size)
+                    seek = read(read_frames_seek, path, indices, target_size)
+                    assert sorted(sequential) == sorted(seek) == sorted(set(indices)), (codec, count)
+                    for index in indices:
+                        assert np.array_equal(sequential[index], seek[index]), (codec, count, index)
+                for index in indices:
+                    # ...and it is the frame that was written at that index, not a neighbour
+                    errors = {
+                        written: np.abs(sequential[index].astype(int) - synthetic_frame(written)[..., ::-1]).mean()
+                        for written in range(max(0, index - 1), min(frame_count, index + 2))
+                    }
+                    assert min(errors, key=errors.get) == index, (codec, index, errors)
+
+
+def test_uneven_sampling_covers_clip():
+    for frame_count, count in ((47, 10), (53, 16), (7, 10), (100, 3)):
+        indices = sample_frame_indices(frame_count, count)
+        assert len(indices) == min(count, frame_count)
+        assert indices[0] == 0 and indices[-1] == frame_count - 1
+        assert indices == sorted(set(indices))
+    assert sample_frame_indices(0, 10) == [] and sample_frame_indices(10, 0) == []
+
+
+def test_indices_past_the_end_skipped():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "clip.mp4"
+        if not write_video(path, 12):
+            print("   skipped: no mp4v encoder")
+            return
+        frames = read(read_frames_sequential, path, [11, 3, 3, 40])  # unsorted, duplicate, out of range
+        assert sorted(frames) == [3, 11]
+        assert frames[3].shape == (HEIGHT, WIDTH, 3)
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("VIDEO FRAME SAMPLING TEST")
+    print("=" * 60)
+    for test in (
+        test_sequential_matches_seek,
+        test_uneven_sampling_covers_clip,
+        test_indices_past_the_end_skipped,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
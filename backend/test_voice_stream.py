@@ -0,0 +1,130 @@
+"""
+Streaming Voice Test (offline)
+Checks the pieces behind /api/v1/stream-voice: the ring buffer, that a
+stream cut into arbitrary chunks yields exactly the windows sliding_windows
+produces for the whole clip, PCM chunk reassembly, the rolling aggregate and
+(when ffmpeg is installed) incremental Opus decoding.
+"""
+import asyncio
+import shutil
+import subprocess
+
+import numpy as np
+
+from shared.media.audio import aggregate_window_scores, sliding_windows
+from shared.media.stream import (
+    AudioRingBuffer,
+    FfmpegStreamDecoder,
+    PcmStreamDecoder,
+    RollingWindowScores,
+    StreamWindower,
+)
+
+SR = 16000
+WINDOW = 4 * SR
+HOP = WINDOW // 2
+
+
+def chunks(data, sizes):
+    """Split `data` into consecutive pieces cycling through `sizes`"""
+    offset, i = 0, 0
+    while offset < len(data):
+        yield data[offset:offset + sizes[i % len(sizes)]]
+        offset += sizes[i % len(sizes)]
+        i += 1
+
+
+def test_ring_buffer():
+    ring = AudioRingBuffer(10)
+    ring.write(np.arange(7))
+    ring.write(np.arange(7, 16))  # wraps around
+    assert ring.total == 16
+    assert ring.read(6, 10).tolist() == list(range(6, 16))
+    ring.write(np.arange(16, 40))  # longer than the buffer
+    assert ring.read(30, 10).tolist() == list(range(30, 40))
+    try:
+        ring.read(29, 5)  # already overwritten
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_stream_windows_match_upload():
+    rng = np.random.default_rng(0)
+    for seconds in (2.5, 4, 10, 31.3):
+        waveform = rng.standard_normal(int(seconds * SR)).astype(np.float32)
+        starts, windows = sliding_windows(waveform, WINDOW, HOP)
+        for sizes in ([320], [4096, 17, 100000], [len(waveform)]):  # 20 ms frames .. one message
+            windower = StreamWindower(WINDOW, HOP)
+            emitted = [w for piece in chunks(waveform, sizes) for w in windower.push(piece)]
+            tail = windower.flush()
+            emitted += [tail] if tail else []
+            assert [start for start, _ in emitted] == starts, (seconds, sizes)
+            assert all(np.array_equal(a, b) for (_, a), b in zip(emitted, windows))
+            assert windower.buffer.capacity == WINDOW + HOP  # bounded regardless of stream length
+
+
+def test_pcm_chunk_reassembly():
+    stereo = (np.random.default_rng(1).uniform(-1, 1, (SR, 2)) * 32767).astype("<i2")
+    data = stereo.tobytes()
+    decoder = PcmStreamDecoder("pcm_s16le", channels=2)
+    decoded = np.concatenate([asyncio.run(decoder.feed(piece)) for piece in chunks(data, [333, 1001, 7])])
+    assert np.allclose(decoded, stereo.astype(np.float32).mean(axis=1) / 32768, atol=1e-6)
+    floats = np.linspace(-1, 1, 1000, dtype="<f4")
+    decoder = PcmStreamDecoder("pcm_f32le")
+    decoded = np.concatenate([asyncio.run(decoder.feed(piece)) for piece in chunks(floats.tobytes(), [6, 10])])
+    assert np.array_equal(decoded, floats)
+
+
+def test_rolling_scores_match_aggregate():
+    probs = list(np.random.default_rng(2).random(50))
+    for top_windows in (0, 1, 2, 5):
+        rolling = RollingWindowScores(top_windows)
+        assert rolling.value() is None
+        for i, prob in enumerate(probs):
+            rolling.add(prob)
+            assert abs(rolling.value() - aggregate_window_scores(probs[:i + 1], top_windows)) < 1e-9
+        assert len(rolling._top) <= top_windows
+
+
+def test_ffmpeg_opus_stream():
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        print("   skipped: ffmpeg not installed")
+        return
+    t = np.arange(6 * 48000) / 48000
+    pcm = (0.3 * np.sin(2 * np.pi * 220 * t) * 32767).astype("<i2").tobytes()
+    opus = subprocess.run(
+        [ffmpeg, "-v", "error", "-f", "s16le", "-ar", "48000", "-ac", "1", "-i", "pipe:0",
+         "-c:a", "libopus", "-b:a", "32k", "-f", "ogg", "pipe:1"],
+        input=pcm, capture_output=True, check=True,
+    ).stdout
+
+    async def decode():
+        decoder = await FfmpegStreamDecoder((), SR, ffmpeg).start()
+        try:
+            pieces = [await decoder.feed(piece) for piece in chunks(opus, [2000])]
+            pieces.append(await decoder.finish())
+        finally:
+            await decoder.close()
+        return np.concatenate(pieces)
+
+    decoded = asyncio.run(decode())
+    assert abs(len(decoded) - 6 * SR) < SR // 10
+    assert abs(np.sqrt(np.mean(decoded[SR:-SR] ** 2)) - 0.3 / np.sqrt(2)) < 0.02  # level preserved
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("STREAMING VOICE TEST")
+    print("=" * 60)
+    for test in (
+        test_ring_buffer,
+        test_stream_windows_match_upload,
+        test_pcm_chunk_reassembly,
+        test_rolling_scores_match_aggregate,
+        test_ffmpeg_opus_stream,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
@@ -0,0 +1,99 @@
+"""
+Voice-Activity Gating Test (offline)
+Checks that the energy / zero-crossing VAD keeps every window of speech-only
+clips (so their verdict is unchanged), drops silent and noise-only windows,
+and always leaves at least one window to score.
+"""
+import numpy as np
+
+from shared.media.audio import aggregate_window_scores, sliding_windows
+from shared.media.vad import frame_features, speech_frames, speech_windows, window_speech_ratios
+
+SR = 16000
+WINDOW = 4 * SR
+HOP = WINDOW // 2
+
+
+def synthetic_speech(duration, level_db=-20.0, seed=0):
+    """Voiced syllables (harmonic stack) with short pauses and fricative bursts, at ~level_db dBFS"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * SR)) / SR
+    pitch = 120 + 40 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SR
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 15))
+    syllables = np.clip(np.sin(2 * np.pi * 3.5 * t), 0, None)  # ~140 ms gaps between syllables
+    fricatives = np.diff(rng.standard_normal(len(t) + 1)) * (np.sin(2 * np.pi * 0.7 * t) > 0.95)
+    speech = voiced * syllables + 0.5 * fricatives
+    speech *= 10 ** (level_db / 20) / np.sqrt(np.mean(speech ** 2))
+    return speech.astype(np.float32)
+
+
+def noise(duration, level_db, seed=1):
+    return (10 ** (level_db / 20) * np.random.default_rng(seed).standard_normal(int(duration * SR))).astype(np.float32)
+
+
+def kept_windows(waveform):
+    starts, _ = sliding_windows(waveform, WINDOW, HOP)
+    ratios, speech_seconds = window_speech_ratios(waveform, starts, WINDOW, SR)
+    return starts, speech_windows(ratios), speech_seconds
+
+
+def test_frame_features():
+    frame = 480
+    waveform = np.concatenate([np.zeros(frame), 0.5 * np.ones(frame), np.tile([0.1, -0.1], frame // 2), [0.3] * 7])
+    energy_db, zcr = frame_features(waveform.astype(np.float32), frame)
+    assert len(energy_db) == 3  # trailing partial frame ignored
+    assert energy_db[0] < -100 and abs(energy_db[1] - 20 * np.log10(0.5)) < 1e-3 and abs(energy_db[2] + 20) < 1e-3
+    assert zcr[0] == 0 and zcr[1] == 0 and zcr[2] == 1.0
+
+
+def test_speech_only_clip_unchanged():
+    for level_db in (-15.0, -30.0, -40.0):  # loud to quiet recordings
+        waveform = synthetic_speech(30, level_db) + noise(30, level_db - 30)
+        starts, keep, speech_seconds = kept_windows(waveform)
+        assert keep.all(), level_db
+        assert speech_seconds > 25
+        scores = np.random.default_rng(2).random(len(starts))
+        assert aggregate_window_scores(list(scores[keep]), 2) == aggregate_window_scores(list(scores), 2)
+
+
+def test_silence_and_noise_skipped():
+    waveform = np.concatenate([
+        synthetic_speech(6),
+        np.zeros(10 * SR, dtype=np.float32),  # digital silence
+        noise(10, -60),  # room tone
+        noise(8, -25, seed=3),  # loud hiss: loud enough, but noise-like
+        synthetic_speech(5, seed=4),
+    ])
+    starts, keep, speech_seconds = kept_windows(waveform)
+    for start, kept in zip(starts, keep):
+        overlaps_speech = start < 6 * SR or start + WINDOW > 34 * SR
+        assert kept == overlaps_speech, start / SR
+    assert keep.sum() < len(keep) / 2
+    assert 10 < speech_seconds < 13
+
+
+def test_always_scores_one_window():
+    assert speech_windows(np.array([0.0, 0.05, 0.02])).tolist() == [False, True, False]
+    assert speech_windows(np.array([])).tolist() == []
+    starts, keep, speech_seconds = kept_windows(np.zeros(12 * SR, dtype=np.float32))
+    assert keep.sum() == 1 and speech_seconds == 0
+    mask, _ = speech_frames(np.zeros(100, dtype=np.float32), SR)  # shorter than one frame
+    assert len(mask) == 0
+    ratios, _ = window_speech_ratios(np.zeros(100, dtype=np.float32), [0], WINDOW, SR)
+    assert ratios.tolist() == [1.0]  # nothing to judge: keep
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("VOICE-ACTIVITY GATING TEST")
+    print("=" * 60)
+    for test in (
+        test_frame_features,
+        test_speech_only_clip_unchanged,
+        test_silence_and_noise_skipped,
+        test_always_scores_one_window,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
@@ -0,0 +1,79 @@
+"""
+Voice Sliding-Window Test (offline)
+Checks window placement over long clips, the per-request window budget,
+short-clip padding and score aggregation used by check_voice.
+"""
+import numpy as np
+
+from shared.media.audio import aggregate_window_scores, sliding_windows, window_starts
+
+SR = 16000
+WINDOW = 4 * SR
+HOP = WINDOW // 2
+
+
+def test_windows_cover_whole_clip():
+    num_samples = 30 * SR + 1234
+    starts = window_starts(num_samples, WINDOW, HOP)
+    assert starts[0] == 0
+    assert starts[-1] == num_samples - WINDOW  # tail covered, flush with the end
+    assert all(b - a <= HOP for a, b in zip(starts, starts[1:]))
+    assert len(set(starts)) == len(starts)
+    covered = np.zeros(num_samples, dtype=bool)
+    for start in starts:
+        covered[start:start + WINDOW] = True
+    assert covered.all()
+
+
+def test_window_budget_spreads_windows():
+    num_samples = 10 * 60 * SR  # 10 minutes
+    starts = window_starts(num_samples, WINDOW, HOP, max_windows=16)
+    assert len(starts) == 16
+    assert starts[0] == 0 and starts[-1] == num_samples - WINDOW
+    assert window_starts(num_samples, WINDOW, HOP, max_windows=1) == [0]
+    assert len(window_starts(6 * SR, WINDOW, HOP, max_windows=16)) == 2  # under budget: unchanged
+
+
+def test_short_clip_padded_to_one_window():
+    waveform = np.ones(SR, dtype=np.float32)
+    starts, windows = sliding_windows(waveform, WINDOW, HOP)
+    assert starts == [0] and windows.shape == (1, WINDOW)
+    assert windows[0, :SR].sum() == SR and not windows[0, SR:].any()
+
+
+def test_windows_match_slices():
+    waveform = np.random.default_rng(0).standard_normal(9 * SR).astype(np.float32)
+    starts, windows = sliding_windows(waveform, WINDOW, HOP)
+    assert windows.dtype == np.float32 and windows.shape == (len(starts), WINDOW)
+    for start, window in zip(starts, windows):
+        assert np.array_equal(window, waveform[start:start + WINDOW])
+
+
+def test_aggregation():
+    probs = [0.1] * 14 + [0.9, 0.95]  # a short spliced-in clone in a long real clip
+    assert abs(aggregate_window_scores(probs) - np.mean(probs)) < 1e-9
+    assert aggregate_window_scores(probs) < 0.5
+    assert abs(aggregate_window_scores(probs, top_windows=2) - 0.925) < 1e-9
+    assert aggregate_window_scores(probs, top_windows=1) == 0.95  # max
+    assert aggregate_window_scores([0.3], top_windows=2) == 0.3  # fewer windows than top_windows
+    try:
+        aggregate_window_scores([])
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("VOICE SLIDING-WINDOW TEST")
+    print("=" * 60)
+    for test in (
+        test_windows_cover_whole_clip,
+        test_window_budget_spreads_windows,
+        test_short_clip_padded_to_one_window,
+        test_windows_match_slices,
+        test_aggregation,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
+    print("=" * 60 + "\n")
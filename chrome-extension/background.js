@@ -1,5 +1,7 @@
 // Background service worker
 
+importScripts('utils/domain-checker.js');
+
 console.log('VeriFy Deepfake Detector: Background service worker initialized');
 
 // Listen for extension icon click
@@ -423,11 +425,27 @@ async function handleBackgroundAnalysis(data, tabId) {
   console.log('Background analysis requested:', data);
 }
 
+// Sync the domain reputation snapshot (only changes since the stored version)
+async function syncDomainReputation() {
+  try {
+    const version = await DOMAIN_CHECKER.sync(await getApiUrl());
+    console.log(`Domain reputation synced (v${version})`);
+  } catch (error) {
+    console.warn('Domain reputation sync failed:', error);
+  }
+}
+
+chrome.runtime.onInstalled.addListener(syncDomainReputation);
+chrome.runtime.onStartup.addListener(syncDomainReputation);
+chrome.alarms.create('syncDomainReputation', { periodInMinutes: 360 });
+
 // Periodic cleanup of storage
 chrome.alarms.create('cleanupStorage', { periodInMinutes: 60 });
 
 chrome.alarms.onAlarm.addListener((alarm) => {
-  if (alarm.name === 'cleanupStorage') {
+  if (alarm.name === 'syncDomainReputation') {
+    syncDomainReputation();
+  } else if (alarm.name === 'cleanupStorage') {
     // Clean up old scan results
     chrome.storage.local.get(['lastScanResults', 'scanHistory'], (result) => {
       // Keep only last 10 scan results
@@ -1,40 +1,15 @@
 // Domain Warning System - Enhanced Content Script Features
 // This extends content.js with domain reputation checking
 
-// Known fake domains (from backend reputation system)
-const FAKE_DOMAINS = [
-  'naturalnews.com', 'infowars.com', 'beforeitsnews.com',
-  'worldtruth.tv', 'yournewswire.com', 'neonnettle.com',
-  'realfarmacy.com', 'thelastamericanvagabond.com',
-  'collective-evolution.com', 'activistpost.com',
-  'themindunleashed.com', 'davidicke.com', 'newspunch.com',
-  'bigleaguepolitics.com', 'thegatewaypundit.com'
-];
-
-// Trusted domains (from backend reputation system)
-const TRUSTED_DOMAINS = [
-  'cdc.gov', 'nih.gov', 'who.int', 'fda.gov', 'nasa.gov',
-  'bbc.com', 'bbc.co.uk', 'reuters.com', 'apnews.com',
-  'nytimes.com', 'washingtonpost.com', 'theguardian.com',
-  'cnn.com', 'npr.org', 'pbs.org', 'wikipedia.org',
-  'snopes.com', 'factcheck.org', 'politifact.com'
-];
+// Domain lists come from the backend reputation index, synced by the
+// background worker (see utils/domain-checker.js)
 
 /**
  * Check if current domain is known fake/trusted
  */
-function checkDomainReputation() {
-  const domain = window.location.hostname.toLowerCase();
-  
-  // Check if it's a known fake domain
-  const isFake = FAKE_DOMAINS.some(fakeDomain => 
-    domain.includes(fakeDomain) || fakeDomain.includes(domain)
-  );
-  
-  // Check if it's a trusted domain
-  const isTrusted = TRUSTED_DOMAINS.some(trustedDomain => 
-    domain.includes(trustedDomain) || trustedDomain.includes(domain)
-  );
+async function checkDomainReputation() {
+  await DOMAIN_CHECKER.load();
+  const { domain, isFake, isTrusted } = DOMAIN_CHECKER.checkDomain(window.location.href);
   
   if (isFake) {
     showDomainWarning({
@@ -154,6 +129,5 @@ window.VERIFY_DOMAIN = {
   checkDomainReputation,
   showDomainWarning,
   extractUrlsFromPage,
-  FAKE_DOMAINS,
-  TRUSTED_DOMAINS
+  lookup: (url) => DOMAIN_CHECKER.lookup(url)
 };
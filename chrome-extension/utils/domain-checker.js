@@ -1,59 +1,152 @@
 // Domain Reputation Checker
-// Uses the same 45+ domain database as backend
+// Client copy of the backend's domain reputation index (backend/shared/reputation).
+// The background worker syncs versioned snapshots from /api/v1/domains/snapshot
+// (deltas after the first sync) into chrome.storage.local; content scripts load
+// them from there. Lookups walk the host's label suffixes (www.cdc.gov ->
+// cdc.gov -> gov) with one Map probe each.
 
 const DOMAIN_CHECKER = {
-  // Known fake/misinformation domains (from backend)
-  FAKE_DOMAINS: [
-    'naturalnews.com',
-    'infowars.com',
-    'beforeitsnews.com',
-    'worldtruth.tv',
-    'yournewswire.com',
-    'neonnettle.com',
-    'realfarmacy.com',
-    'thelastamericanvagabond.com',
-    'collective-evolution.com',
-    'activistpost.com',
-    'themindunleashed.com',
-    'davidicke.com',
-    'newspunch.com',
-    'bigleaguepolitics.com',
-    'thegatewaypundit.com',
-    'breitbart.com',
-    'dailycaller.com',
-    'conservativetribune.com',
-    'thefederalistpapers.org',
-    'dcclothesline.com'
-  ],
-
-  // Trusted domains (from backend)
-  TRUSTED_DOMAINS: [
-    'cdc.gov',
-    'nih.gov',
-    'who.int',
-    'fda.gov',
-    'nasa.gov',
-    'bbc.com',
-    'bbc.co.uk',
-    'reuters.com',
-    'apnews.com',
-    'nytimes.com',
-    'washingtonpost.com',
-    'theguardian.com',
-    'cnn.com',
-    'npr.org',
-    'pbs.org',
-    'economist.com',
-    'nature.com',
-    'science.org',
-    'sciencemag.org',
-    'wikipedia.org',
-    'snopes.com',
-    'factcheck.org',
-    'politifact.com',
-    'fullfact.org',
-    'mediabiasfactcheck.com'
-  ],
+  STORAGE_KEY: 'domainReputation',
+
+  // Used only until the first sync (version 0 always triggers a full snapshot)
+  SEED: {
+    version: 0,
+    full: true,
+    labels: {
+      fake: [
+      'activistpost.com', 'americannews.com', 'awarenessact.com',
+      'beforeitsnews.com', 'bigleaguepolitics.com', 'breitbart.com',
+      'collective-evolution.com', 'conservativetribune.com', 'dailycaller.com',
+      'davidicke.com', 'dcclothesline.com', 'infowars.com', 'naturalnews.com',
+      'neonnettle.com', 'newsbreak.com', 'newspunch.com', 'realfarmacy.com',
+      'rumormillnews.com', 'stateofthenation.co', 'thefederalistpapers.org',
+      'thegatewaypundit.com', 'thelastamericanvagabond.com', 'themindunleashed.com',
+      'trueactivist.com', 'undergroundhealth.com', 'usapoliticstoday.com',
+      'worldtruth.tv', 'yournewswire.com'
+      ],
+      trusted: [
+      'apnews.com', 'bbc.co.uk', 'bbc.com', 'britannica.com', 'cdc.gov', 'cell.com',
+      'cnn.com', 'economist.com', 'example.com', 'factcheck.org', 'fda.gov',
+      'fullfact.org', 'mediabiasfactcheck.com', 'nasa.gov', 'nature.com', 'nejm.org',
+      'nih.gov', 'noaa.gov', 'npr.org', 'nytimes.com', 'pbs.org', 'plos.org',
+      'politifact.com', 'pubmed.ncbi.nlm.nih.gov', 'reuters.com', 'science.org',
+      'sciencemag.org', 'snopes.com', 'theguardian.com', 'thelancet.com', 'usgs.gov',
+      'washingtonpost.com', 'who.int', 'wikipedia.org', 'wsj.com'
+      ]
+    }
+  },
+
+  version: 0,
+  entries: new Map(), // entry -> labels (what gets persisted)
+  hosts: new Map(),   // host -> Set(labels)
+  paths: new Map(),   // host -> [[pathPrefix, Set(labels)]]
+
+  /**
+   * Apply a full or delta snapshot from the backend
+   * @param {Object} snapshot - { version, full, labels: {label: [domains]}, removed? }
+   */
+  applySnapshot(snapshot) {
+    const changed = new Map();
+    Object.entries(snapshot.labels || {}).forEach(([label, domains]) => {
+      domains.forEach(domain => {
+        if (!changed.has(domain)) changed.set(domain, []);
+        changed.get(domain).push(label);
+      });
+    });
+
+    if (snapshot.full) {
+      this.entries = new Map();
+    } else {
+      (snapshot.removed || []).forEach(domain => this.entries.delete(domain));
+    }
+    changed.forEach((labels, domain) => this.entries.set(domain, labels));
+
+    this.version = snapshot.version;
+    this.rebuild();
+  },
+
+  rebuild() {
+    this.hosts = new Map();
+    this.paths = new Map();
+    this.entries.forEach((labels, entry) => {
+      const slash = entry.indexOf('/');
+      if (slash === -1) {
+        this.hosts.set(entry, new Set(labels));
+        return;
+      }
+      const host = entry.slice(0, slash);
+      if (!this.paths.has(host)) this.paths.set(host, []);
+      this.paths.get(host).push([entry.slice(slash), new Set(labels)]);
+    });
+  },
+
+  /**
+   * Current state as a full snapshot (for chrome.storage.local)
+   */
+  toSnapshot() {
+    const labels = {};
+    this.entries.forEach((entryLabels, domain) => {
+      entryLabels.forEach(label => {
+        (labels[label] = labels[label] || []).push(domain);
+      });
+    });
+    return { version: this.version, full: true, labels };
+  },
+
+  /**
+   * Load the last synced snapshot from storage (falls back to the seed)
+   */
+  async load() {
+    try {
+      const stored = await chrome.storage.local.get([this.STORAGE_KEY]);
+      if (stored[this.STORAGE_KEY]) {
+        this.applySnapshot(stored[this.STORAGE_KEY]);
+      }
+    } catch (error) {
+      console.error('Domain reputation load error:', error);
+    }
+    return this.version;
+  },
+
+  /**
+   * Fetch changes since the stored version and persist the result
+   * @param {string} apiUrl - Backend API base URL (…/api/v1)
+   */
+  async sync(apiUrl) {
+    await this.load();
+    const response = await fetch(`${apiUrl}/domains/snapshot?since=${this.version}`);
+    if (!response.ok) {
+      throw new Error(`Snapshot request failed: ${response.status}`);
+    }
+    const snapshot = await response.json();
+    if (snapshot.full || snapshot.version !== this.version) {
+      this.applySnapshot(snapshot);
+      await chrome.storage.local.set({ [this.STORAGE_KEY]: this.toSnapshot() });
+    }
+    return this.version;
+  },
+
+  /**
+   * Labels of every entry covering a URL or host
+   * @param {string} url - Full URL or domain
+   * @returns {Set<string>} - e.g. Set {'trusted', 'fact_checker'}
+   */
+  lookup(url) {
+    const labels = new Set();
+    const domain = this.extractDomain(url);
+    const path = this.extractPath(url);
+    let suffix = domain;
+    while (suffix) {
+      const found = this.hosts.get(suffix);
+      if (found) found.forEach(label => labels.add(label));
+      (this.paths.get(suffix) || []).forEach(([prefix, pathLabels]) => {
+        if (path.startsWith(prefix)) pathLabels.forEach(label => labels.add(label));
+      });
+      const dot = suffix.indexOf('.');
+      suffix = dot === -1 ? '' : suffix.slice(dot + 1);
+    }
+    return labels;
+  },
 
   /**
    * Check if a domain is known to be fake/misinformation
@@ -63,23 +156,17 @@ const DOMAIN_CHECKER = {
   checkDomain(url) {
     try {
       const domain = this.extractDomain(url);
-      
-      // Check if it's a known fake domain
-      const isFake = this.FAKE_DOMAINS.some(fakeDomain => 
-        domain.includes(fakeDomain) || fakeDomain.includes(domain)
-      );
-      
-      // Check if it's a trusted domain
-      const isTrusted = this.TRUSTED_DOMAINS.some(trustedDomain => 
-        domain.includes(trustedDomain) || trustedDomain.includes(domain)
-      );
+      const labels = this.lookup(url);
+      const isFake = labels.has('fake');
+      const isTrusted = !isFake && labels.has('trusted');
       
       return {
         domain: domain,
         isFake: isFake,
         isTrusted: isTrusted,
         confidence: isFake ? 0.92 : (isTrusted ? 0.93 : 0.5),
-        source: isFake ? 'blacklist' : (isTrusted ? 'whitelist' : 'unknown')
+        source: isFake ? 'blacklist' : (isTrusted ? 'whitelist' : 'unknown'),
+        version: this.version
       };
     } catch (error) {
       console.error('Domain check error:', error);
@@ -102,12 +189,12 @@ const DOMAIN_CHECKER = {
     try {
       // If it's already just a domain, return it
       if (!url.includes('/') && !url.includes(':')) {
-        return url.toLowerCase();
+        return url.toLowerCase().replace(/\.$/, '');
       }
       
       // Parse as URL
       const urlObj = new URL(url.startsWith('http') ? url : `https://${url}`);
-      return urlObj.hostname.toLowerCase();
+      return urlObj.hostname.toLowerCase().replace(/\.$/, '');
     } catch (error) {
       // Fallback: extract domain manually
       return url.replace(/^https?:\/\//, '')
@@ -117,6 +204,20 @@ const DOMAIN_CHECKER = {
     }
   },
 
+  /**
+   * Extract lowercased path from URL ('/' for bare domains)
+   * @param {string} url - Full URL
+   * @returns {string} - Path
+   */
+  extractPath(url) {
+    try {
+      const urlObj = new URL(url.startsWith('http') ? url : `https://${url}`);
+      return urlObj.pathname.toLowerCase() || '/';
+    } catch (error) {
+      return '/';
+    }
+  },
+
   /**
    * Get warning message for a domain
    * @param {string} url - URL to check
@@ -178,6 +279,8 @@ const DOMAIN_CHECKER = {
   }
 };
 
+DOMAIN_CHECKER.applySnapshot(DOMAIN_CHECKER.SEED);
+
 // Export for use in other scripts
 if (typeof module !== 'undefined' && module.exports) {
   module.exports = DOMAIN_CHECKER;